@@ -1,21 +1,26 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.security import decode_token
+from database.async_db import run_db
 from database.connection import get_db_connection
+from database.queries import fetch_one
 
 security = HTTPBearer()
 
+
+def _load_user(user_id: int):
+    with get_db_connection() as conn:
+        return fetch_one(conn, "users.by_id", id=user_id)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from JWT token."""
     token = credentials.credentials
     # decode_token gives 401 if invalid
     payload = decode_token(token)
     
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (int(payload["sub"]),))
-        user = cursor.fetchone()
-    
+    user = await run_db(_load_user, int(payload["sub"]))
+
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
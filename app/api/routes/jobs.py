@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends
 from app.api.deps import get_current_user
 from app.services.job_service import JobService
 from app.schemas.job import JobOut
+from database.async_db import run_db
 
 router = APIRouter()
 
@@ -15,12 +16,12 @@ async def get_job_feed(current_user: dict = Depends(get_current_user)):
 @router.get("/saved", response_model=Dict[str, List[JobOut]])
 async def get_saved_jobs(current_user: dict = Depends(get_current_user)):
     """Get user's saved jobs."""
-    return {"jobs": JobService.get_saved_jobs(current_user["id"])}
+    return {"jobs": await run_db(JobService.get_saved_jobs, current_user["id"])}
 
 @router.get("/applied", response_model=Dict[str, List[JobOut]])
 async def get_applied_jobs(current_user: dict = Depends(get_current_user)):
     """Get user's applied jobs."""
-    return {"jobs": JobService.get_applied_jobs(current_user["id"])}
+    return {"jobs": await run_db(JobService.get_applied_jobs, current_user["id"])}
 
 @router.get("/{job_id}/explanation")
 async def get_job_explanation(job_id: int, current_user: dict = Depends(get_current_user)):
@@ -13,3 +13,11 @@ async def retrain(background_tasks: BackgroundTasks):
     """
     background_tasks.add_task(MLService.run_retraining)
     return {"message": "Retraining started in background."}
+
+@router.post("/online-update")
+async def online_update(background_tasks: BackgroundTasks):
+    """
+    Fold swipes since the last online checkpoint into the model, in the background.
+    """
+    background_tasks.add_task(MLService.run_online_update)
+    return {"message": "Online update started in background."}
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends
-from app.schemas.job import SwipeAction
+from app.schemas.job import SwipeAction, SwipeBatch
 from app.api.deps import get_current_user
 from app.services.swipe_service import SwipeService
+from database.async_db import run_db
 
 router = APIRouter()
 
 @router.post("")
 async def record_swipe(swipe: SwipeAction, current_user: dict = Depends(get_current_user)):
     """Record a user's swipe action on a job."""
-    return SwipeService.record_swipe(current_user["id"], swipe)
+    return await run_db(SwipeService.record_swipe, current_user["id"], swipe)
+
+@router.post("/batch")
+async def record_swipes(batch: SwipeBatch, current_user: dict = Depends(get_current_user)):
+    """Record several swipes at once (offline or fast-swiping clients)."""
+    return await run_db(SwipeService.record_swipes, current_user["id"], batch.swipes)
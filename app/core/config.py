@@ -20,6 +20,73 @@ else:
     # Local development
     DB_PATH = os.getenv("DB_PATH", "jobswipe.db")
 
+# Connections per pool (see database/connection.py) and how long to wait for one
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Jobs per feed request, newest first. With the swipe bitmap on, candidates
+# are read FEED_SIZE at a time until that many unswiped jobs are found.
+FEED_SIZE = int(os.getenv("FEED_SIZE", "200"))
+
+# Per-process swiped-job bitmaps for the feed (database/swipe_bitmap.py).
+# Each worker keeps its own, so with several workers a swipe made elsewhere
+# is only seen once the bitmap is older than SWIPE_BITMAP_TTL and reloads.
+SWIPE_BITMAP_CACHE = os.getenv("SWIPE_BITMAP_CACHE", "0") == "1"
+SWIPE_BITMAP_TTL = float(os.getenv("SWIPE_BITMAP_TTL", "300"))
+SWIPE_BITMAP_MAX_USERS = int(os.getenv("SWIPE_BITMAP_MAX_USERS", "10000"))
+
+# Write-behind swipe buffer (database/swipe_buffer.py): swipes are journaled
+# under SWIPE_BUFFER_DIR and upserted in one transaction per flush.
+SWIPE_BUFFER = os.getenv("SWIPE_BUFFER", "0") == "1"
+SWIPE_BUFFER_DIR = os.getenv("SWIPE_BUFFER_DIR", DB_PATH + ".swipes")
+SWIPE_BUFFER_FLUSH_ROWS = int(os.getenv("SWIPE_BUFFER_FLUSH_ROWS", "500"))
+SWIPE_BUFFER_FLUSH_SECONDS = float(os.getenv("SWIPE_BUFFER_FLUSH_SECONDS", "1"))
+SWIPE_BUFFER_FSYNC = os.getenv("SWIPE_BUFFER_FSYNC", "0") == "1"
+# Most swipes accepted by one POST /api/swipe/batch
+SWIPE_BATCH_MAX = int(os.getenv("SWIPE_BATCH_MAX", "500"))
+
+# Online learning (ml/online.py). ML_ONLINE_LEARNING serves the latest online
+# checkpoint; ML_ONLINE_TRAINER folds new swipes into it every
+# ML_ONLINE_INTERVAL seconds and must be set on one process only.
+ML_ONLINE_LEARNING = os.getenv("ML_ONLINE_LEARNING", "0") == "1"
+ML_ONLINE_TRAINER = os.getenv("ML_ONLINE_TRAINER", "0") == "1"
+ML_ONLINE_INTERVAL = float(os.getenv("ML_ONLINE_INTERVAL", "120"))
+ML_ONLINE_BATCH_SIZE = int(os.getenv("ML_ONLINE_BATCH_SIZE", "256"))
+# Swipes younger than this are left for the next online update, so a write
+# still in flight cannot land behind the trainer's cursor. Buffered swipes
+# are stored with the time they were made, up to a flush interval later.
+ML_ONLINE_SETTLE_SECONDS = float(os.getenv(
+    "ML_ONLINE_SETTLE_SECONDS", str(2 + (2 * SWIPE_BUFFER_FLUSH_SECONDS if SWIPE_BUFFER else 0))
+))
+# How often ml.model checks the model registry pointer (ml/registry.py) for a
+# version published by another process
+ML_MODEL_POLL_SECONDS = float(os.getenv("ML_MODEL_POLL_SECONDS", "5"))
+
+# Shadow scoring (ml/shadow.py): this match-registry version also scores every
+# feed batch; its scores go only to ML_SHADOW_LOG, never to users.
+ML_SHADOW_VERSION = int(os.getenv("ML_SHADOW_VERSION")) if os.getenv("ML_SHADOW_VERSION") else None
+ML_SHADOW_LOG = os.getenv("ML_SHADOW_LOG", "ml/models/shadow_scores.jsonl")
+
+# Columnar training store written at swipe time (ml/feature_store.py)
+FEATURE_STORE = os.getenv("FEATURE_STORE", "0") == "1"
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "ml/models/feature_store")
+FEATURE_STORE_FLUSH_ROWS = int(os.getenv("FEATURE_STORE_FLUSH_ROWS", "1000"))
+FEATURE_STORE_FLUSH_SECONDS = float(os.getenv("FEATURE_STORE_FLUSH_SECONDS", "60"))
+
+# Background swipe feature logging (ml/interaction_logger.py): features of
+# served cards are remembered per (user, job) and reused when one is swiped.
+SERVED_FEATURES_CACHE_SIZE = int(os.getenv("SERVED_FEATURES_CACHE_SIZE", "50000"))
+INTERACTION_LOG_BATCH = int(os.getenv("INTERACTION_LOG_BATCH", "100"))
+INTERACTION_LOG_LINGER = float(os.getenv("INTERACTION_LOG_LINGER", "0.5"))
+INTERACTION_LOG_QUEUE = int(os.getenv("INTERACTION_LOG_QUEUE", "10000"))
+
+# Feature providers the ranking engine computes per request (ml/ranking.py).
+# "embedding" calls the embedding API for every new user/job text.
+RANKING_PROVIDERS = [p.strip() for p in os.getenv("RANKING_PROVIDERS", "skills,location,seniority,text").split(",") if p.strip()]
+
+# Scraping
+SCRAPE_DEADLINE_SECONDS = float(os.getenv("SCRAPE_DEADLINE_SECONDS", "30"))
+
 # SMTP
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
@@ -13,8 +13,18 @@ class JobResult:
     raw_text: Optional[str] = None
     raw_data: Optional[Dict[str, Any]] = None
 
+@dataclass(frozen=True)
+class SourceCapabilities:
+    """What a job source can do natively, used to plan fetches."""
+    server_side_search: bool = False  # query is filtered by the source, not by us
+    pagination: bool = False          # source can return further pages
+    incremental: bool = False         # newest-first feed, safe to stop at the last seen job
+
 class JobSource(Protocol):
     """Interface for job scrapers."""
+    name: str
+    capabilities: SourceCapabilities
+
     def fetch_jobs(self, query: str, limit: int = 10) -> List[JobResult]:
         ...
 
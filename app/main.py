@@ -6,22 +6,45 @@ Handles user authentication and job matching API
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
+import asyncio
 import sqlite3
 import shutil
 import os
 
 
-from app.core.config import DB_PATH
+from app.core.config import DB_PATH, ML_ONLINE_INTERVAL, ML_ONLINE_TRAINER
 from app.api.routes import auth, jobs, chat, swipe, scrape, profile, resume, apply, ml
 from app.core.logging import logger
+from app.services.ml_service import MLService
+from database.async_db import shutdown_db_executor
+from database import swipe_buffer
+from database.connection import close_all_pools, pool_stats
+from database.migrations import apply_migrations
+from ml import feature_store, interaction_logger
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Initialize DB
     init_database()
+    if swipe_buffer.swipe_buffer is not None:
+        # Swipes journaled by a previous run that exited before flushing
+        swipe_buffer.swipe_buffer.recover()
+    trainer = None
+    if ML_ONLINE_TRAINER:
+        trainer = asyncio.create_task(MLService.online_learning_loop(ML_ONLINE_INTERVAL))
     yield
-    # Shutdown events if any
+    if trainer is not None:
+        trainer.cancel()
+    if swipe_buffer.swipe_buffer is not None:
+        swipe_buffer.swipe_buffer.close()
+    interaction_logger.interaction_logger.close()
+    if feature_store.feature_store is not None:
+        feature_store.feature_store.flush()
+    # Shutdown: finish in-flight DB calls, then close pooled connections
+    shutdown_db_executor()
+    close_all_pools()
 
 
 # Initialize FastAPI app
@@ -113,7 +136,11 @@ app.include_router(ml.router, prefix="/api/ml", tags=["ML"])
 @app.get("/api/health", tags=["System"])
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    status = {"status": "healthy", "timestamp": datetime.utcnow().isoformat(), "db_pools": pool_stats()}
+    buffer = swipe_buffer.swipe_buffer
+    if buffer is not None:
+        status["swipe_buffer"] = {"pending": len(buffer), **asdict(buffer.stats)}
+    return status
 
 
 # ========== Initialize Database ==========
@@ -140,6 +167,7 @@ def init_database():
             with open("database/schema.sql", "r") as f:
                 conn.executescript(f.read())
             conn.commit()
+        apply_migrations(conn)
     except Exception as e:
         logger.error(f"Database init error: {e}")
     finally:
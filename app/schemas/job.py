@@ -1,10 +1,13 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 class SwipeAction(BaseModel):
     job_id: int
     action: str  # 'apply', 'skip', 'save'
 
+class SwipeBatch(BaseModel):
+    swipes: List[SwipeAction]  # in swipe order: the last action per job wins
+
 class JobScrapeRequest(BaseModel):
     keywords: str
     location: Optional[str] = "India"
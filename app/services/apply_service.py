@@ -2,23 +2,13 @@ from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 
 from database.connection import get_db_connection
+from database.queries import execute, fetch_all, fetch_one, insert_returning_id
 from app.core.config import AUTO_APPLY_MAX_PER_HOUR
 from utils.email_client import send_email_with_attachment
 
 
 def _user_sent_last_hour(conn, user_id: int) -> int:
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT COUNT(*) as cnt
-        FROM auto_apply_queue
-        WHERE user_id = ?
-          AND status = 'sent'
-          AND sent_at >= DATETIME('now', '-1 hour')
-        """,
-        (user_id,),
-    )
-    row = cursor.fetchone()
+    row = fetch_one(conn, "auto_apply.sent_last_hour", user_id=user_id)
     return row["cnt"] if row else 0
 
 
@@ -36,27 +26,14 @@ def queue_auto_apply(
     failed = 0
 
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-
         for job_id in job_ids:
             # Avoid duplicate queue entries for same job+user in pending state
-            cursor.execute(
-                """
-                SELECT 1 FROM auto_apply_queue
-                WHERE user_id = ? AND job_id = ? AND status = 'pending'
-                """,
-                (user_id, job_id),
-            )
-            if cursor.fetchone():
+            if fetch_one(conn, "auto_apply.pending_exists", user_id=user_id, job_id=job_id):
                 already += 1
                 continue
 
             # Get job info (for subject/body)
-            cursor.execute(
-                "SELECT title, company FROM jobs WHERE id = ?",
-                (job_id,),
-            )
-            job = cursor.fetchone()
+            job = fetch_one(conn, "jobs.title_company", id=job_id)
             if not job:
                 failed += 1
                 continue
@@ -87,20 +64,15 @@ Best regards,
                 continue
 
             # Store queue row
-            cursor.execute(
-                """
-                INSERT INTO auto_apply_queue
-                    (user_id, job_id, to_email, subject, body, resume_path, status)
-                VALUES (?, ?, ?, ?, ?, ?, 'pending')
-                """,
-                (
-                    user_id,
-                    job_id,
-                    to_email,
-                    subject,
-                    body,
-                    user.get("resume_file_path"),
-                ),
+            insert_returning_id(
+                conn,
+                "auto_apply.insert",
+                user_id=user_id,
+                job_id=job_id,
+                to_email=to_email,
+                subject=subject,
+                body=body,
+                resume_path=user.get("resume_file_path"),
             )
             queued += 1
 
@@ -119,19 +91,8 @@ def process_auto_apply_batch(limit: int = 10) -> Dict:
     skipped_rate_limit = 0
 
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-
         # Fetch pending jobs ordered by created_at
-        cursor.execute(
-            """
-            SELECT * FROM auto_apply_queue
-            WHERE status = 'pending'
-            ORDER BY created_at ASC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = cursor.fetchall()
+        rows = fetch_all(conn, "auto_apply.pending_batch", limit=limit)
         
         # We must commit updates inside the loop or after processing, 
         # but to update status individually we need careful transaction mgmt.
@@ -157,30 +118,12 @@ def process_auto_apply_batch(limit: int = 10) -> Dict:
                     resume_path=row["resume_path"],
                 )
 
-                cursor.execute(
-                    """
-                    UPDATE auto_apply_queue
-                    SET status = 'sent',
-                        sent_at = CURRENT_TIMESTAMP,
-                        error = NULL
-                    WHERE id = ?
-                    """,
-                    (row["id"],),
-                )
+                execute(conn, "auto_apply.mark_sent", {"id": row["id"]})
                 sent += 1
 
             except Exception as e:
                 failed += 1
-                cursor.execute(
-                    """
-                    UPDATE auto_apply_queue
-                    SET status = 'failed',
-                        error = ?,
-                        retry_count = retry_count + 1
-                    WHERE id = ?
-                    """,
-                    (str(e), row["id"]),
-                )
+                execute(conn, "auto_apply.mark_failed", {"error": str(e), "id": row["id"]})
 
         conn.commit()
 
@@ -1,6 +1,7 @@
 from app.core.security import hash_password, verify_password, create_access_token
 from app.schemas.user import UserRegister, UserLogin
 from database.connection import get_db_connection
+from database.queries import fetch_one, insert_returning_id
 from fastapi import HTTPException
 from app.core.logging import logger
 
@@ -9,21 +10,17 @@ class AuthService:
     def register_user(user: UserRegister):
         try:
             with get_db_connection() as conn:
-                cursor = conn.cursor()
-                
                 # Check if email already exists
-                cursor.execute("SELECT id FROM users WHERE email = ?", (user.email,))
-                if cursor.fetchone():
+                if fetch_one(conn, "users.id_by_email", email=user.email):
                     raise HTTPException(status_code=400, detail="Email already registered")
                 
                 # Create user
                 password_hash = hash_password(user.password)
-                cursor.execute(
-                    "INSERT INTO users (email, password_hash, name) VALUES (?, ?, ?)",
-                    (user.email, password_hash, user.name)
+                user_id = insert_returning_id(
+                    conn, "users.insert",
+                    email=user.email, password_hash=password_hash, name=user.name,
                 )
                 conn.commit()
-                user_id = cursor.lastrowid
             
             # Generate token
             token = create_access_token(user_id, user.email)
@@ -42,9 +39,7 @@ class AuthService:
     def login_user(user: UserLogin):
         try:
             with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM users WHERE email = ?", (user.email,))
-                db_user = cursor.fetchone()
+                db_user = fetch_one(conn, "users.by_email", email=user.email)
             
             if not db_user:
                 raise HTTPException(status_code=401, detail="Invalid email or password")
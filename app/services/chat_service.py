@@ -1,29 +1,20 @@
 from app.schemas.chat import ChatMessage
 from database.connection import get_db_connection
+from database.queries import fetch_all, fetch_one, insert_returning_id
 import random
 
 class ChatService:
     @staticmethod
     def get_messages(user_id: int, job_id: int):
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM messages
-                WHERE user_id = ? AND job_id = ?
-                ORDER BY created_at ASC
-            """, (user_id, job_id))
-            return [dict(row) for row in cursor.fetchall()]
+            return [dict(row) for row in fetch_all(conn, "messages.for_job", user_id=user_id, job_id=job_id)]
 
     @staticmethod
     def send_message(user_id: int, job_id: int, msg: ChatMessage):
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
             # Insert user message
-            cursor.execute("""
-                INSERT INTO messages (user_id, job_id, sender_type, message)
-                VALUES (?, ?, 'user', ?)
-            """, (user_id, job_id, msg.message))
+            insert_returning_id(conn, "messages.insert", user_id=user_id, job_id=job_id,
+                                sender_type="user", message=msg.message)
             
             # Generate AI employer response (demo mode)
             responses = [
@@ -37,17 +28,14 @@ class ChatService:
             employer_response = random.choice(responses)
             
             # Get job info to personalize response
-            cursor.execute("SELECT skills FROM jobs WHERE id = ?", (job_id,))
-            job = cursor.fetchone()
+            job = fetch_one(conn, "jobs.skills", id=job_id)
             if job and job["skills"]:
                 skills = job["skills"].split(",")
                 employer_response = employer_response.replace("{skill}", skills[0].strip())
             
             # Insert employer response
-            cursor.execute("""
-                INSERT INTO messages (user_id, job_id, sender_type, message)
-                VALUES (?, ?, 'employer', ?)
-            """, (user_id, job_id, employer_response))
+            insert_returning_id(conn, "messages.insert", user_id=user_id, job_id=job_id,
+                                sender_type="employer", message=employer_response)
             conn.commit()
         
         return {"message": "Message sent", "employer_response": employer_response}
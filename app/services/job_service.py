@@ -1,28 +1,18 @@
 from app.schemas.job import JobScrapeRequest
 import asyncio
+from app.core.config import FEED_SIZE
 from app.core.logging import logger
-from database.db_manager import get_db_connection
+from database.async_db import run_db
+from database.connection import get_db_connection
+from database.queries import fetch_all, fetch_one
+from database import swipe_bitmap, swipe_buffer
 
 class JobService:
     @staticmethod
     async def get_feed(user: dict):
-        user_id = user["id"]
         try:
-            all_jobs = []
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get jobs not yet swiped by user
-                cursor.execute("""
-                    SELECT j.* FROM jobs j
-                    WHERE j.id NOT IN (
-                        SELECT job_id FROM user_swipes WHERE user_id = ?
-                    )
-                    ORDER BY j.created_at DESC
-                """, (user_id,))
-                
-                all_jobs = [dict(row) for row in cursor.fetchall()]
-            
+            all_jobs = await run_db(JobService._fetch_unswiped_jobs, user["id"])
+
             # Use matching logic to sort and explain
             return await JobService._process_jobs(all_jobs, user)
 
@@ -31,11 +21,47 @@ class JobService:
             logger.error(f"Error fetching job feed: {e}")
             raise e
 
+    @staticmethod
+    def _fetch_unswiped_jobs(user_id: int):
+        cache = swipe_bitmap.swipe_bitmap
+        if cache is None:
+            buffer = swipe_buffer.swipe_buffer
+            # Swiped but not yet written (the bitmap, when on, is marked already)
+            pending = buffer.pending(user_id) if buffer is not None else {}
+            with get_db_connection() as conn:
+                # Get jobs not yet swiped by user
+                rows = fetch_all(conn, "jobs.unswiped_for_user", user_id=user_id, limit=FEED_SIZE + len(pending))
+            return [dict(row) for row in rows if row["id"] not in pending][:FEED_SIZE]
+
+        # Filter against the user's cached swipe bitmap instead of user_swipes,
+        # newest jobs a page at a time until the feed is full
+        feed = []
+        with get_db_connection() as conn:
+            rows = fetch_all(conn, "jobs.recent", limit=FEED_SIZE)
+            while rows:
+                keep = cache.unswiped_mask(user_id, [row["id"] for row in rows])
+                feed.extend(dict(row) for row, unswiped in zip(rows, keep) if unswiped)
+                if len(feed) >= FEED_SIZE or len(rows) < FEED_SIZE:
+                    break
+                last = rows[-1]
+                rows = fetch_all(
+                    conn, "jobs.recent_before",
+                    before_at=last["created_at"], before_id=last["id"], limit=FEED_SIZE,
+                )
+        return feed[:FEED_SIZE]
+
+    @staticmethod
+    def _fetch_job(job_id: int):
+        with get_db_connection() as conn:
+            row = fetch_one(conn, "jobs.by_id", id=job_id)
+            return dict(row) if row else None
+
     @staticmethod
     async def _process_jobs(all_jobs, current_user):
         """Process jobs with ML scoring only. Explanations are fetched on-demand."""
         
         user_profile = {
+            "id": current_user["id"],  # keys the served features the swipe logger reuses
             "skills": current_user["skills"].split(",") if current_user["skills"] else [],
             "experience_years": current_user["experience_years"],
             "preferred_location": current_user["preferred_location"],
@@ -43,24 +69,25 @@ class JobService:
             "resume_text": current_user["resume_text"]
         }
 
-        processed_jobs = []
         for job in all_jobs:
             # Convert skills from string to array
             if job.get("skills"):
                 job["skills"] = [s.strip() for s in job["skills"].split(",")]
             else:
                 job["skills"] = []
-                
-            # === ML Scoring ===
-            # === ML Scoring ===
-            try:
-                from ml.scorer import LogisticMatchScorer
-                scorer = LogisticMatchScorer()
-                # Get probability (0.0 to 1.0)
-                prob = scorer.score(user_profile, job)
-                job["match_score"] = int(prob * 100)
-            except ImportError:
-                job["match_score"] = 0 # Default score if ML missing
+
+        # === ML Scoring ===
+        # One batched model call for the whole feed
+        try:
+            from ml.scorer import LogisticMatchScorer
+            probs = LogisticMatchScorer().score_many(user_profile, all_jobs)
+        except ImportError:
+            probs = [0.0] * len(all_jobs)  # Default score if ML missing
+
+        processed_jobs = []
+        for job, prob in zip(all_jobs, probs):
+            # Probability (0.0 to 1.0) as a percentage
+            job["match_score"] = int(prob * 100)
             
             job["logo_emoji"] = ["🚀", "💡", "📊", "🤖", "☁️", "🌱", "🏗️", "💰"][job["id"] % 8]
             
@@ -79,9 +106,9 @@ class JobService:
         """Generate explanation for a specific job on-demand."""
         import asyncio
         from matching.explanations import explanation_generator
-        from ml.features import extract_job_features
         
         user_profile = {
+            "id": user["id"],
             "skills": user["skills"].split(",") if user["skills"] else [],
             "experience_years": user["experience_years"],
             "preferred_location": user["preferred_location"],
@@ -90,13 +117,9 @@ class JobService:
         }
         
         # Fetch job from DB
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-            row = cursor.fetchone()
-            if not row:
-                return {"error": "Job not found"}
-            job = dict(row)
+        job = await run_db(JobService._fetch_job, job_id)
+        if job is None:
+            return {"error": "Job not found"}
         
         # Parse skills
         if job.get("skills"):
@@ -104,33 +127,25 @@ class JobService:
         else:
             job["skills"] = []
         
-        # Clean description
-        raw_desc = job.get("description", "") or ""
-        try:
-            from bs4 import BeautifulSoup
-            import re
-            soup = BeautifulSoup(raw_desc, "html.parser")
-            clean_desc = soup.get_text(separator=" ")
-            clean_desc = re.sub(r'\s+', ' ', clean_desc).strip()
-            job["description"] = clean_desc[:500]
-        except Exception:
-            job["description"] = raw_desc[:500]
+        # Clean description (precomputed at insert; parse only rows not yet backfilled)
+        if job.get("clean_description") is not None:
+            job["description"] = job["clean_description"][:500]
+        else:
+            raw_desc = job.get("description", "") or ""
+            try:
+                from scrapers.html_text import html_to_text
+                job["description"] = html_to_text(raw_desc, max_chars=500)
+            except Exception:
+                job["description"] = raw_desc[:500]
         
-        # ML scoring
-        # ML scoring
+        # ML scoring: probability and the features behind it, from one engine call
         try:
-            from ml.scorer import LogisticMatchScorer
-            scorer = LogisticMatchScorer()
-            prob = scorer.score(user_profile, job)
-            ml_score = int(prob * 100)
+            from ml.ranking import default_engine
+            probs, feats = default_engine().score(user_profile, [job])
+            ml_score = int(probs[0] * 100)
+            ml_features = {k: float(v) for k, v in feats.iloc[0].items()}
         except ImportError:
             ml_score = 0
-        
-        # ML features
-        try:
-            from ml.features import extract_job_features
-            ml_features = extract_job_features(user_profile, job)
-        except ImportError:
             ml_features = {}
         
         job_summary = {
@@ -155,33 +170,29 @@ class JobService:
 
 
     @staticmethod
-    def get_saved_jobs(user_id: int):
+    def _fetch_swiped_jobs(user_id: int, action: str):
+        buffer = swipe_buffer.swipe_buffer
+        if buffer is not None and buffer.pending(user_id):
+            buffer.flush()  # read your own swipes
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT j.* FROM jobs j
-                JOIN user_swipes us ON j.id = us.job_id
-                WHERE us.user_id = ? AND us.action = 'save'
-                ORDER BY us.created_at DESC
-            """, (user_id,))
-            return [dict(row) for row in cursor.fetchall()]
+            jobs = [dict(row) for row in fetch_all(conn, "jobs.swiped_with_action", user_id=user_id, action=action)]
+        for job in jobs:
+            # JobOut.skills is a list; the column stores a comma-separated string
+            job["skills"] = [s.strip() for s in job["skills"].split(",")] if job.get("skills") else []
+        return jobs
+
+    @staticmethod
+    def get_saved_jobs(user_id: int):
+        return JobService._fetch_swiped_jobs(user_id, "save")
 
     @staticmethod
     def get_applied_jobs(user_id: int):
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT j.* FROM jobs j
-                JOIN user_swipes us ON j.id = us.job_id
-                WHERE us.user_id = ? AND us.action = 'apply'
-                ORDER BY us.created_at DESC
-            """, (user_id,))
-            return [dict(row) for row in cursor.fetchall()]
+        return JobService._fetch_swiped_jobs(user_id, "apply")
 
     @staticmethod
     def scrape_jobs(request: JobScrapeRequest):
         from scrapers.runner import fetch_all_sources
-        from database.db_manager import insert_job_if_new
+        from ingestion.pipeline.job_ingestion import insert_unique_jobs
         
         # Limit per source
         max_jobs = request.max_jobs or 20
@@ -189,10 +200,8 @@ class JobService:
         
         normalized_jobs = fetch_all_sources(query=request.keywords, max_jobs_per_source=per_source)
         
-        inserted = 0
-        for job in normalized_jobs[:max_jobs + 10]: 
-            if insert_job_if_new(job):
-                inserted += 1
+        # Same posting from several boards: keep one card (MinHash/LSH, as the pipeline does)
+        inserted = len(insert_unique_jobs(normalized_jobs[:max_jobs + 10]))
         
         return {
             "message": f"Successfully scraped {len(normalized_jobs)} and inserted {inserted} new jobs.",
@@ -1,15 +1,35 @@
+import asyncio
+
+from app.core.config import ML_ONLINE_LEARNING
 from app.core.logging import logger
 
 try:
-    from ml.train_logistic import main as train_model
-    from ml.model import clear_cache
+    from ml.model import reload_model
 except ImportError:
     # Fallback for environments without ML deps
-    def train_model():
-        logger.warning("ML dependencies missing. Skipping training.")
-    def clear_cache():
+    def reload_model():
         pass
 
+
+# Training code imports sklearn; load it on first use so a serving process
+# (which scores with ml.linear) never does.
+def train_model():
+    try:
+        from ml.train_logistic import main
+    except ImportError:
+        logger.warning("ML dependencies missing. Skipping training.")
+        return
+    main()
+
+
+def online_update(**kwargs):
+    try:
+        from ml.online import update
+    except ImportError:
+        logger.warning("ML dependencies missing. Skipping online update.")
+        return {"consumed": 0}
+    return update(**kwargs)
+
 class MLService:
     @staticmethod
     def run_retraining():
@@ -19,9 +39,32 @@ class MLService:
         try:
             logger.info("[MLService] Starting retraining...")
             train_model()
-            logger.info("[MLService] Retraining complete. Clearing cache.")
-            clear_cache()
+            logger.info("[MLService] Retraining complete. Loading the new version.")
+            reload_model()
             return True
         except Exception as e:
             logger.error(f"[MLService] Retraining failed: {e}")
             raise e
+
+    @staticmethod
+    def run_online_update():
+        """
+        Fold swipes recorded since the last online checkpoint into the model.
+        """
+        try:
+            result = online_update(swap=ML_ONLINE_LEARNING)
+            logger.info(f"[MLService] Online update: {result}")
+            return result
+        except Exception as e:
+            logger.error(f"[MLService] Online update failed: {e}")
+            raise e
+
+    @staticmethod
+    async def online_learning_loop(interval: float):
+        """Run online updates every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(MLService.run_online_update)
+            except Exception:
+                pass  # logged above; try again next round
+            await asyncio.sleep(interval)
@@ -1,22 +1,54 @@
+import time
+from typing import Dict, List
+
+from app.core.config import SWIPE_BATCH_MAX
 from app.schemas.job import SwipeAction
 from database.connection import get_db_connection
+from database.queries import dialect_of, execute_many, timestamp_param
+from database import swipe_bitmap, swipe_buffer
 from fastapi import HTTPException
+from ml import feature_store, interaction_logger
 
 class SwipeService:
     @staticmethod
     def record_swipe(user_id: int, swipe: SwipeAction):
-        if swipe.action not in ("apply", "skip", "save"):
+        SwipeService._record(user_id, [swipe])
+        return {"message": f"Recorded {swipe.action} for job {swipe.job_id}"}
+
+    @staticmethod
+    def record_swipes(user_id: int, swipes: List[SwipeAction]):
+        if len(swipes) > SWIPE_BATCH_MAX:
+            raise HTTPException(status_code=400, detail=f"At most {SWIPE_BATCH_MAX} swipes per batch")
+        latest = SwipeService._record(user_id, swipes)
+        return {"message": f"Recorded {len(latest)} swipes", "recorded": len(latest)}
+
+    @staticmethod
+    def _record(user_id: int, swipes: List[SwipeAction]) -> Dict[int, str]:
+        """Store swipes (last action per job wins); buffered when SWIPE_BUFFER is on."""
+        if any(swipe.action not in ("apply", "skip", "save") for swipe in swipes):
             raise HTTPException(status_code=400, detail="Invalid action")
-        
+        latest = {swipe.job_id: swipe.action for swipe in swipes}
+
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT OR REPLACE INTO user_swipes (user_id, job_id, action) VALUES (?, ?, ?)",
-                    (user_id, swipe.job_id, swipe.action)
-                )
-                conn.commit()
+            buffer = swipe_buffer.swipe_buffer
+            if buffer is not None:
+                # Journaled now, upserted with other swipes in the next flush (database/swipe_buffer.py)
+                buffer.add(user_id, latest.items())
+            elif latest:
+                with get_db_connection() as conn:
+                    swiped_at = timestamp_param(time.time(), dialect_of(conn))
+                    execute_many(conn, "swipes.upsert", [
+                        {"user_id": user_id, "job_id": job_id, "action": action, "created_at": swiped_at}
+                        for job_id, action in latest.items()
+                    ])
+                    conn.commit()
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
-        
-        return {"message": f"Recorded {swipe.action} for job {swipe.job_id}"}
+
+        for job_id, action in latest.items():
+            if swipe_bitmap.swipe_bitmap is not None:
+                swipe_bitmap.swipe_bitmap.mark(user_id, job_id)
+            if feature_store.feature_store is not None:
+                # Features the feed served, written in the background (ml/interaction_logger.py)
+                interaction_logger.interaction_logger.submit(user_id, job_id, action, interaction=False)
+        return latest
@@ -1,43 +1,29 @@
 from app.schemas.user import UserProfile
 from database.connection import get_db_connection
+from database.queries import execute, fetch_one
 from app.core.logging import logger
 
 class UserService:
     @staticmethod
     def update_profile(user_id: int, profile: UserProfile):
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE users SET
-                    name = COALESCE(?, name),
-                    phone = COALESCE(?, phone),
-                    skills = COALESCE(?, skills),
-                    experience_years = COALESCE(?, experience_years),
-                    preferred_location = COALESCE(?, preferred_location),
-                    preferred_seniority = COALESCE(?, preferred_seniority),
-                    resume_text = COALESCE(?, resume_text),
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
-                profile.name,
-                profile.phone,
-                profile.skills,
-                profile.experience_years,
-                profile.preferred_location,
-                profile.preferred_seniority,
-                profile.resume_text,
-                user_id
-            ))
+            execute(conn, "users.update_profile", {
+                "name": profile.name,
+                "phone": profile.phone,
+                "skills": profile.skills,
+                "experience_years": profile.experience_years,
+                "preferred_location": profile.preferred_location,
+                "preferred_seniority": profile.preferred_seniority,
+                "resume_text": profile.resume_text,
+                "id": user_id,
+            })
             conn.commit()
         return {"message": "Profile updated successfully"}
 
     @staticmethod
     def get_profile(user_id: int):
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-            user = cursor.fetchone()
+            user = fetch_one(conn, "users.by_id", id=user_id)
         
         if not user:
              return None
@@ -84,34 +70,20 @@ class UserService:
             
         # Update user profile
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            
             try:
                 skills_str = ",".join(parsed_data.get("skills", []))
                 
-                cursor.execute("""
-                    UPDATE users SET
-                        name = COALESCE(?, name),
-                        phone = COALESCE(?, phone),
-                        skills = COALESCE(?, skills),
-                        experience_years = COALESCE(?, experience_years),
-                        resume_text = ?,
-                        resume_file_path = ?,
-                        preferred_location = COALESCE(?, preferred_location),
-                        preferred_seniority = COALESCE(?, preferred_seniority),
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (
-                    parsed_data.get("name"),
-                    parsed_data.get("phone"),
-                    skills_str if skills_str else None,
-                    parsed_data.get("experience_years"),
-                    text,
-                    resume_path,
-                    parsed_data.get("preferred_location"),
-                    parsed_data.get("preferred_seniority"),
-                    user_id
-                ))
+                execute(conn, "users.update_from_resume", {
+                    "name": parsed_data.get("name"),
+                    "phone": parsed_data.get("phone"),
+                    "skills": skills_str if skills_str else None,
+                    "experience_years": parsed_data.get("experience_years"),
+                    "resume_text": text,
+                    "resume_file_path": resume_path,
+                    "preferred_location": parsed_data.get("preferred_location"),
+                    "preferred_seniority": parsed_data.get("preferred_seniority"),
+                    "id": user_id,
+                })
                 conn.commit()
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
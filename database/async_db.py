@@ -0,0 +1,46 @@
+"""
+Run blocking database calls from async route handlers.
+
+sqlite3 and psycopg2 block, so calling them directly from an `async def`
+route stalls the event loop for every other request. run_db() ships the
+call to a dedicated executor sized like the connection pool: at most
+DB_POOL_SIZE queries run at once, none wait on the pool, and the event
+loop keeps serving requests meanwhile.
+
+    user = await run_db(UserService.get_profile, user_id)
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import DB_POOL_SIZE
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+    return _executor
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await `func(*args, **kwargs)` run on the database executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_db_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -1,6 +1,24 @@
+"""
+Pooled database connections.
+
+SQLite (development) connections are opened once per pool slot with their
+pragmas applied at creation, then handed out to one thread at a time.
+PostgreSQL (production) uses psycopg2's ThreadedConnectionPool behind a
+semaphore, so callers wait for a free connection instead of failing when
+the pool is exhausted. Pools are sized by DB_POOL_SIZE and record how long
+callers waited; see pool_stats().
+"""
 from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 import os
+import queue
 import sqlite3
+import threading
+import time
+from typing import Dict
+
+from app.core.config import DB_POOL_SIZE, DB_POOL_TIMEOUT
+from app.core.logging import logger
 
 # Check if we're in production (PostgreSQL) or development (SQLite)
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -9,30 +27,226 @@ USE_POSTGRES = DATABASE_URL is not None
 if USE_POSTGRES:
     import psycopg2
     from psycopg2.extras import RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became free within DB_POOL_TIMEOUT seconds."""
+
+
+@dataclass
+class PoolStats:
+    size: int
+    created: int = 0
+    acquired: int = 0
+    waited: int = 0              # acquisitions that found no idle connection
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+    discarded: int = 0           # broken connections thrown away
+
+    def record_wait(self, seconds: float) -> None:
+        self.waited += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+
+class SQLitePool:
+    """Fixed-size pool of SQLite connections to one database file."""
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT) -> None:
+        self.path = path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.stats = PoolStats(self.size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self.stats.created += 1
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._open < self.size
+                if grow:
+                    self._open += 1
+            if grow:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self.stats.timeouts += 1
+                    raise PoolTimeout(f"No SQLite connection free after {self.timeout}s (pool size {self.size})")
+                with self._lock:
+                    self.stats.record_wait(time.perf_counter() - start)
+        with self._lock:
+            self.stats.acquired += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection, broken: bool = False) -> None:
+        if not broken:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()  # never hand out a half-finished transaction
+            except sqlite3.Error:
+                broken = True
+        if broken:
+            with self._lock:
+                self.stats.discarded += 1
+                self._open -= 1
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._open = 0
+
+
+class PostgresPool:
+    """ThreadedConnectionPool that blocks (with a timeout) instead of raising when exhausted."""
+
+    def __init__(self, dsn: str, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT) -> None:
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.stats = PoolStats(self.size)
+        self._pool = ThreadedConnectionPool(1, self.size, dsn, cursor_factory=RealDictCursor)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self.stats.timeouts += 1
+                raise PoolTimeout(f"No Postgres connection free after {self.timeout}s (pool size {self.size})")
+            with self._lock:
+                self.stats.record_wait(time.perf_counter() - start)
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.stats.acquired += 1
+        return conn
+
+    def release(self, conn, broken: bool = False) -> None:
+        try:
+            if not broken and not conn.closed:
+                try:
+                    conn.rollback()  # end the implicit transaction psycopg2 opened
+                except psycopg2.Error:
+                    broken = True
+            broken = broken or bool(conn.closed)
+            if broken:
+                with self._lock:
+                    self.stats.discarded += 1
+            self._pool.putconn(conn, close=broken)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+_POOLS: Dict[tuple, object] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(key: str):
+    # Keyed by pid too: a forked worker must not reuse its parent's connections
+    pool_key = (os.getpid(), key)
+    pool = _POOLS.get(pool_key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(pool_key)
+            if pool is None:
+                pool = PostgresPool(DATABASE_URL) if key == DATABASE_URL and USE_POSTGRES else SQLitePool(key)
+                _POOLS[pool_key] = pool
+    return pool
+
+
+@contextmanager
+def pooled_connection(key: str):
+    """Borrow a connection from the pool for `key` (a SQLite path or DATABASE_URL)."""
+    pool = _get_pool(key)
+    conn = pool.acquire()
+    broken = False
+    try:
+        yield conn
+    except Exception as e:
+        # SQLite connections are checked on release instead
+        if USE_POSTGRES and key == DATABASE_URL:
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+        raise
+    finally:
+        pool.release(conn, broken=broken)
+
 
 @contextmanager
 def get_db_connection():
     """Context manager for safe database connections.
     Supports both SQLite (development) and PostgreSQL (production).
     """
-    conn = None
+    if USE_POSTGRES:
+        key = DATABASE_URL
+    else:
+        from app.core.config import DB_PATH
+        key = DB_PATH
     try:
-        if USE_POSTGRES:
-            # PostgreSQL connection for production
-            conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
-            yield conn
-        else:
-            # SQLite connection for development
-            from app.core.config import DB_PATH
-            conn = sqlite3.connect(DB_PATH)
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL;")
+        with pooled_connection(key) as conn:
             yield conn
     except Exception as e:
-        print(f"Database error: {e}")
-        if conn and USE_POSTGRES:
-            conn.rollback()
-        raise e
-    finally:
-        if conn:
-            conn.close()
+        logger.error(f"Database error: {e}")
+        raise
+
+
+def pool_stats() -> Dict[str, Dict]:
+    """Per-pool counters: connections created, acquisitions, waits and wait time."""
+    pid = os.getpid()
+    return {
+        ("postgres" if key == DATABASE_URL else key): asdict(pool.stats)
+        for (owner, key), pool in list(_POOLS.items())
+        if owner == pid
+    }
+
+
+def close_all_pools() -> None:
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
@@ -1,5 +1,6 @@
-import sqlite3
+import hashlib
 import json
+import unicodedata
 try:
     import chromadb
     from chromadb.utils import embedding_functions
@@ -10,18 +11,16 @@ import os
 from contextlib import contextmanager
 from typing import Dict, Any, List
 from app.core.config import DB_PATH
+from database.connection import pooled_connection
+from ml.features import JOB_STATIC_COLUMNS, job_static_columns
 
 # --- Database Connection Management ---
 
 @contextmanager
 def get_db_connection():
-    """Context manager for SQLite database connections."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Access columns by name
-    try:
+    """Context manager for SQLite database connections (pooled per DB_PATH)."""
+    with pooled_connection(DB_PATH) as conn:
         yield conn
-    finally:
-        conn.close()
 
 # --- Vector Store (ChromaDB) Configuration ---
 CHROMA_DB_PATH = "./chroma_db"
@@ -68,61 +67,112 @@ def get_candidate_matches(job_id: int):
 # Job Insertion Helper
 # ==========================================
 
+def _clean(s):
+    if isinstance(s, str):
+        return s.replace('\x00', '')
+    return s
+
+
+def job_dedup_key(title, company, location) -> str:
+    """
+    Hash of the canonical title/company/location (NFKC, case-folded,
+    whitespace collapsed). Stored in jobs.dedup_key under a unique index.
+    """
+    parts = []
+    for value in (title, company, location):
+        text = unicodedata.normalize("NFKC", str(_clean(value) or ""))
+        parts.append(" ".join(text.casefold().split()))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 def job_exists(conn, title: str, company: str, location: str) -> bool:
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT 1 FROM jobs
-        WHERE LOWER(title) = LOWER(?)
-          AND LOWER(company) = LOWER(?)
-          AND LOWER(location) = LOWER(?)
-        LIMIT 1
-        """,
-        (title, company, location),
+        "SELECT 1 FROM jobs WHERE dedup_key = ? LIMIT 1",
+        (job_dedup_key(title, company, location),),
     )
     return cursor.fetchone() is not None
 
 
+def insert_jobs_bulk(jobs: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert many normalized jobs in a single transaction.
+
+    Duplicates (same dedup key or source URL) are skipped by the unique
+    indexes, whether they are already stored or repeated within `jobs`.
+    Inserted jobs get their new id set as job["id"]; the ids are returned
+    in input order.
+    """
+    rows = []
+    keyed = []
+    seen_keys = set()
+    seen_urls = set()
+    for job in jobs:
+        key = job_dedup_key(job["title"], job["company"], job["location"])
+        url = _clean(job.get("source_url") or job.get("url") or "").strip() or None
+        if key in seen_keys or (url and url in seen_urls):
+            continue
+        seen_keys.add(key)
+        if url:
+            seen_urls.add(url)
+        keyed.append((key, job))
+        title = _clean(job["title"])
+        location = _clean(job["location"])
+        description = _clean(job.get("description") or job.get("summary") or "")
+        static = job_static_columns({"title": title, "location": location, "description": description})
+        rows.append((
+            title,
+            _clean(job["company"]),
+            location,
+            _clean(",".join(job.get("skills") or [])),
+            description,
+            url,
+            _clean(job.get("source") or "Unknown"),
+            key,
+            job.get("minhash"),
+            *(static[c] for c in JOB_STATIC_COLUMNS),
+        ))
+    if not rows:
+        return []
+
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM jobs")
+            last_id = cursor.fetchone()[0]
+            cursor.executemany(
+                """
+                INSERT INTO jobs (title, company, location, skills, description, source_url, source, dedup_key, minhash,
+                                  clean_description, title_norm, location_norm, description_length, title_length,
+                                  created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT DO NOTHING
+                """,
+                rows,
+            )
+            cursor.execute("SELECT id, dedup_key FROM jobs WHERE id > ?", (last_id,))
+            new_ids = {r["dedup_key"]: r["id"] for r in cursor.fetchall()}
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    inserted = []
+    for key, job in keyed:
+        job_id = new_ids.get(key)
+        if job_id is not None:
+            job["id"] = job_id
+            inserted.append(job_id)
+    return inserted
+
+
 def insert_job_if_new(job: Dict[str, Any]) -> bool:
     """
     job: normalized dict from scrapers.normalizer.normalize_raw_job
     Returns True if inserted, False if duplicate.
     """
-    with get_db_connection() as conn:
-        if job_exists(conn, job["title"], job["company"], job["location"]):
-            return False
-            
-        if job.get("url"):
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM jobs WHERE source_url = ?", (job["url"],))
-            if cursor.fetchone():
-                return False
-
-        cursor = conn.cursor()
-        
-        def clean(s):
-            if isinstance(s, str):
-                return s.replace('\x00', '')
-            return s
-            
-        cursor.execute(
-            """
-            INSERT INTO jobs (title, company, location, skills, description, source_url, source, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """,
-            (
-                clean(job["title"]),
-                clean(job["company"]),
-                clean(job["location"]),
-                clean(",".join(job.get("skills") or [])),
-                clean(job.get("description") or job.get("summary") or ""),
-                clean(job.get("source_url") or job.get("url") or ""),
-                clean(job.get("source") or "Unknown"),
-            ),
-        )
-        conn.commit()
-
-    return True
+    return bool(insert_jobs_bulk([job]))
 
 def insert_job(job_data: Dict[str, Any], summary_text: str = "") -> int:
     """Wrapper for backward compatibility"""
@@ -0,0 +1,335 @@
+"""
+Versioned SQLite migrations, tracked with PRAGMA user_version.
+
+database/schema.sql creates tables for a fresh database; the steps here
+bring existing databases up to date (new columns, backfills, indexes that
+depend on them). Each step runs once, in its own transaction.
+
+Run by app.main.init_database at startup, or manually:
+    python -m database.migrations [path/to/jobswipe.db]
+
+Postgres schema changes live in database/schema_postgres.sql; the data
+steps that go with them (backfill_dedup_keys, compact_duplicate_jobs)
+also accept a psycopg2 connection, see scripts/compact_jobs.py.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, Dict, List
+
+from app.core.logging import logger
+from database.db_manager import job_dedup_key
+from database.queries import SQLITE, dialect_of
+from ml.features import JOB_STATIC_COLUMNS, job_static_columns
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _placeholder(conn) -> str:
+    return "?" if dialect_of(conn) == SQLITE else "%s"
+
+
+def backfill_dedup_keys(conn) -> Dict[str, int]:
+    """
+    Key every job with dedup_key NULL, in id order, unless its key or URL
+    is already taken. SQLite or psycopg2 (tuple rows); the caller commits.
+
+    Legacy duplicates (a later row with the same key or URL as an earlier
+    one) are left with dedup_key NULL so the unique indexes hold; they are
+    excluded from dedup until compacted.
+    """
+    p = _placeholder(conn)
+    cur = conn.cursor()
+    cur.execute("UPDATE jobs SET source_url = NULL WHERE TRIM(source_url) = ''")
+    cur.execute("SELECT id, dedup_key, title, company, location, source_url FROM jobs ORDER BY id")
+    rows = cur.fetchall()
+
+    seen_keys = {key for _, key, _, _, _, _ in rows if key is not None}
+    seen_urls = {url for _, key, _, _, _, url in rows if key is not None and url is not None}
+    updates = []
+    legacy = 0
+    for job_id, key, title, company, location, url in rows:
+        if key is not None:
+            continue
+        key = job_dedup_key(title, company, location)
+        if key in seen_keys or (url is not None and url in seen_urls):
+            legacy += 1
+            continue
+        seen_keys.add(key)
+        if url is not None:
+            seen_urls.add(url)
+        updates.append((key, job_id))
+    cur.executemany(f"UPDATE jobs SET dedup_key = {p} WHERE id = {p}", updates)
+    logger.info(f"[migrations] Backfilled dedup keys for {len(updates)} jobs ({legacy} legacy duplicates)")
+    return {"keyed": len(updates), "legacy": legacy}
+
+
+def _add_job_dedup_keys(conn: sqlite3.Connection) -> None:
+    """
+    Store a hashed canonical title/company/location key on every job and
+    make it, and source_url, unique (see backfill_dedup_keys).
+    """
+    if "dedup_key" not in _columns(conn, "jobs"):
+        conn.execute("ALTER TABLE jobs ADD COLUMN dedup_key TEXT")
+    backfill_dedup_keys(conn)
+
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedup_key ON jobs(dedup_key)")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_source_url ON jobs(source_url) "
+        "WHERE source_url IS NOT NULL AND dedup_key IS NOT NULL"
+    )
+
+
+def _drop_cleanup_trigger(conn: sqlite3.Connection) -> None:
+    """trg_cleanup_jobs rescanned the whole table after every insert; the unique indexes replace it."""
+    conn.execute("DROP TRIGGER IF EXISTS trg_cleanup_jobs")
+
+
+def _add_job_minhash(conn: sqlite3.Connection) -> None:
+    """Near-duplicate signatures; filled in at ingest, or lazily by the ingestion pipeline."""
+    if "minhash" not in _columns(conn, "jobs"):
+        conn.execute("ALTER TABLE jobs ADD COLUMN minhash BLOB")
+
+
+def _add_auto_apply_queue(conn: sqlite3.Connection) -> None:
+    """Tables the auto-apply service needs; previously only created by scripts/migrate_auto_apply.py."""
+    users = _columns(conn, "users")
+    if users and "resume_file_path" not in users:
+        conn.execute("ALTER TABLE users ADD COLUMN resume_file_path TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS auto_apply_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            to_email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            resume_path TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            error TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            scheduled_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sent_at DATETIME,
+            retry_count INTEGER DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        )
+    """)
+
+
+# One per hot predicate in database/queries.py; keep in step with
+# schema_postgres.sql and tests/test_query_plans.py.
+HOT_QUERY_INDEXES = {
+    "idx_jobs_created_at": "jobs(created_at)",
+    "idx_user_swipes_user_action": "user_swipes(user_id, action, created_at, job_id)",
+    "idx_messages_user_job": "messages(user_id, job_id, created_at)",
+    "idx_auto_apply_status": "auto_apply_queue(status, created_at)",
+    "idx_auto_apply_user_status": "auto_apply_queue(user_id, status, sent_at)",
+}
+
+
+def _add_hot_query_indexes(conn: sqlite3.Connection) -> None:
+    # schema.sql runs before migrations; missing tables or columns only happen on partial test databases
+    for name, target in HOT_QUERY_INDEXES.items():
+        table, columns = target.rstrip(")").split("(")
+        if set(c.strip() for c in columns.split(",")) <= set(_columns(conn, table)):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _add_job_static_columns(conn: sqlite3.Connection) -> None:
+    """User-independent scoring inputs (ml.features.JOB_STATIC_COLUMNS); fill with backfill_job_columns()."""
+    existing = _columns(conn, "jobs")
+    for column, sql_type in (
+        ("clean_description", "TEXT"),
+        ("title_norm", "TEXT"),
+        ("location_norm", "TEXT"),
+        ("description_length", "INTEGER"),
+        ("title_length", "INTEGER"),
+    ):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+
+
+def _add_swipe_cursor_index(conn: sqlite3.Connection) -> None:
+    """Online learner cursor (swipes.since); keep in step with schema_postgres.sql."""
+    if {"created_at", "id"} <= set(_columns(conn, "user_swipes")):
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_swipes_created_at ON user_swipes(created_at, id)")
+
+
+# Append only: position in this list is the schema version.
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _add_job_dedup_keys,
+    _drop_cleanup_trigger,
+    _add_job_minhash,
+    _add_auto_apply_queue,
+    _add_hot_query_indexes,
+    _add_job_static_columns,
+    _add_swipe_cursor_index,
+]
+
+
+def _plan_compaction(cur):
+    """Map each legacy duplicate to the job it duplicates; re-key those with no match left."""
+    by_key: Dict[str, int] = {}
+    by_url: Dict[str, int] = {}
+    orphans = []
+    cur.execute("SELECT id, dedup_key, title, company, location, source_url FROM jobs ORDER BY id")
+    for job_id, key, title, company, location, url in cur.fetchall():
+        if key is not None:
+            by_key[key] = job_id
+            if url is not None:
+                by_url[url] = job_id
+        else:
+            orphans.append((job_id, job_dedup_key(title, company, location), url))
+
+    remap = []
+    rekeyed = []
+    for job_id, key, url in orphans:
+        target = by_key.get(key) or (by_url.get(url) if url is not None else None)
+        if target is None:
+            # The row it duplicated is gone; it becomes the canonical copy
+            by_key[key] = job_id
+            if url is not None:
+                by_url[url] = job_id
+            rekeyed.append((key, job_id))
+        else:
+            remap.append((job_id, target))
+    return remap, rekeyed
+
+
+def _job_id_tables(conn, cur) -> List[str]:
+    if dialect_of(conn) == SQLITE:
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+        return [name for (name,) in cur.fetchall() if name != "jobs" and "job_id" in _columns(conn, name)]
+    cur.execute(
+        "SELECT DISTINCT table_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND column_name = 'job_id' AND table_name <> 'jobs'"
+    )
+    return sorted(name for (name,) in cur.fetchall())
+
+
+def _repoint_postgres(cur, table: str) -> None:
+    """UPDATE OR IGNORE for Postgres: one savepoint per row, so a row hitting a unique constraint is skipped."""
+    from psycopg2 import IntegrityError
+
+    cur.execute(f"SELECT t.id, r.new_id FROM {table} t JOIN _job_remap r ON t.job_id = r.old_id")
+    for row_id, new_id in cur.fetchall():
+        cur.execute("SAVEPOINT repoint")
+        try:
+            cur.execute(f"UPDATE {table} SET job_id = %s WHERE id = %s", (new_id, row_id))
+            cur.execute("RELEASE SAVEPOINT repoint")
+        except IntegrityError:
+            cur.execute("ROLLBACK TO SAVEPOINT repoint")
+
+
+def compact_duplicate_jobs(conn) -> Dict[str, int]:
+    """
+    Merge legacy duplicate jobs (dedup_key NULL) into the row they duplicate.
+
+    References in every table with a job_id column are repointed to the
+    surviving job first; where that would violate a unique constraint (a
+    user who swiped both copies), the duplicate's row is dropped. Runs in
+    one transaction, on SQLite or psycopg2 (tuple rows). Returns counts of
+    merged and re-keyed jobs.
+    """
+    sqlite = dialect_of(conn) == SQLITE
+    p = _placeholder(conn)
+    cur = conn.cursor()
+    if sqlite:
+        cur.execute("BEGIN IMMEDIATE")
+    else:
+        # psycopg2 opens the transaction; block concurrent job inserts until commit
+        cur.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    try:
+        remap, rekeyed = _plan_compaction(cur)
+        tables = _job_id_tables(conn, cur)
+
+        cur.executemany(f"UPDATE jobs SET dedup_key = {p} WHERE id = {p}", rekeyed)
+        cur.execute("CREATE TEMP TABLE _job_remap (old_id INTEGER PRIMARY KEY, new_id INTEGER NOT NULL)")
+        cur.executemany(f"INSERT INTO _job_remap (old_id, new_id) VALUES ({p}, {p})", remap)
+        for table in tables:
+            if sqlite:
+                cur.execute(
+                    f"UPDATE OR IGNORE {table} "
+                    f"SET job_id = (SELECT new_id FROM _job_remap WHERE old_id = {table}.job_id) "
+                    f"WHERE job_id IN (SELECT old_id FROM _job_remap)"
+                )
+            else:
+                _repoint_postgres(cur, table)
+            cur.execute(f"DELETE FROM {table} WHERE job_id IN (SELECT old_id FROM _job_remap)")
+        cur.execute("DELETE FROM jobs WHERE id IN (SELECT old_id FROM _job_remap)")
+        cur.execute("DROP TABLE _job_remap")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    logger.info(f"[migrations] Compacted {len(remap)} duplicate jobs, re-keyed {len(rekeyed)}")
+    return {"merged": len(remap), "rekeyed": len(rekeyed)}
+
+
+def backfill_job_columns(conn: sqlite3.Connection, batch_size: int = 500) -> int:
+    """
+    Compute the precomputed scoring columns for jobs stored before they
+    existed (title_norm IS NULL). Commits per batch so it can be stopped
+    and resumed. Returns the number of jobs filled in.
+    """
+    filled = 0
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            "SELECT id, title, location, description FROM jobs "
+            "WHERE id > ? AND title_norm IS NULL ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not batch:
+            break
+        updates = []
+        for job_id, title, location, description in batch:
+            static = job_static_columns({"title": title, "location": location, "description": description})
+            updates.append((*(static[c] for c in JOB_STATIC_COLUMNS), job_id))
+        conn.executemany(
+            f"UPDATE jobs SET {', '.join(f'{c} = ?' for c in JOB_STATIC_COLUMNS)} WHERE id = ?",
+            updates,
+        )
+        conn.commit()
+        filled += len(batch)
+        last_id = batch[-1][0]
+    logger.info(f"[migrations] Backfilled precomputed columns for {filled} jobs")
+    return filled
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations to an open connection. Returns the new version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        logger.info(f"[migrations] Applying {target}: {migration.__name__}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    return version
+
+
+def migrate(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return apply_migrations(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.core.config import DB_PATH
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DB_PATH
+    print(f"{path}: schema version {migrate(path)}")
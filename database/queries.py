@@ -0,0 +1,309 @@
+"""
+Named, dialect-aware SQL.
+
+Service queries are written once, with :name parameters and {macro}
+placeholders for the few constructs SQLite and Postgres spell differently,
+and compiled per dialect on first use:
+
+    SQLite    :name kept as-is (sqlite3 binds dicts natively)
+    Postgres  :name -> %(name)s, or $n inside a server-side PREPAREd
+              statement (prepared once per pooled connection)
+
+    row = fetch_one(conn, "users.by_id", id=user_id)
+    job_id = insert_returning_id(conn, "messages.insert", user_id=1, ...)
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import weakref
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import ML_ONLINE_SETTLE_SECONDS
+
+SQLITE = "sqlite"
+POSTGRES = "postgres"
+
+MACROS: Dict[str, Dict[str, str]] = {
+    SQLITE: {
+        "one_hour_ago": "DATETIME('now', '-1 hour')",
+        "settled_cutoff": f"DATETIME('now', '-{ML_ONLINE_SETTLE_SECONDS:g} seconds')",
+        "returning_id": "",
+    },
+    POSTGRES: {
+        "one_hour_ago": "NOW() - INTERVAL '1 hour'",
+        "settled_cutoff": f"NOW() - INTERVAL '{ML_ONLINE_SETTLE_SECONDS:g} seconds'",
+        "returning_id": "RETURNING id",
+    },
+}
+
+QUERIES: Dict[str, str] = {
+    # --- users ---
+    "users.by_id": "SELECT * FROM users WHERE id = :id",
+    "users.by_email": "SELECT * FROM users WHERE email = :email",
+    "users.id_by_email": "SELECT id FROM users WHERE email = :email",
+    "users.insert": """
+        INSERT INTO users (email, password_hash, name)
+        VALUES (:email, :password_hash, :name)
+        {returning_id}
+    """,
+    "users.update_profile": """
+        UPDATE users SET
+            name = COALESCE(:name, name),
+            phone = COALESCE(:phone, phone),
+            skills = COALESCE(:skills, skills),
+            experience_years = COALESCE(:experience_years, experience_years),
+            preferred_location = COALESCE(:preferred_location, preferred_location),
+            preferred_seniority = COALESCE(:preferred_seniority, preferred_seniority),
+            resume_text = COALESCE(:resume_text, resume_text),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = :id
+    """,
+    "users.update_from_resume": """
+        UPDATE users SET
+            name = COALESCE(:name, name),
+            phone = COALESCE(:phone, phone),
+            skills = COALESCE(:skills, skills),
+            experience_years = COALESCE(:experience_years, experience_years),
+            resume_text = :resume_text,
+            resume_file_path = :resume_file_path,
+            preferred_location = COALESCE(:preferred_location, preferred_location),
+            preferred_seniority = COALESCE(:preferred_seniority, preferred_seniority),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = :id
+    """,
+
+    # --- jobs ---
+    "jobs.by_id": "SELECT * FROM jobs WHERE id = :id",
+    "jobs.title_company": "SELECT title, company FROM jobs WHERE id = :id",
+    "jobs.skills": "SELECT skills FROM jobs WHERE id = :id",
+    # Anti-join probes UNIQUE(user_id, job_id) per job instead of materialising
+    # the user's whole swipe list (and, unlike NOT IN, is NULL-safe)
+    "jobs.unswiped_for_user": """
+        SELECT j.* FROM jobs j
+        WHERE NOT EXISTS (
+            SELECT 1 FROM user_swipes us
+            WHERE us.user_id = :user_id AND us.job_id = j.id
+        )
+        ORDER BY j.created_at DESC, j.id DESC
+        LIMIT :limit
+    """,
+    # Feed candidates when swipes come from the bitmap, paged by keyset
+    "jobs.recent": "SELECT * FROM jobs ORDER BY created_at DESC, id DESC LIMIT :limit",
+    "jobs.recent_before": """
+        SELECT * FROM jobs
+        WHERE (created_at, id) < (:before_at, :before_id)
+        ORDER BY created_at DESC, id DESC
+        LIMIT :limit
+    """,
+    "jobs.swiped_with_action": """
+        SELECT j.* FROM jobs j
+        JOIN user_swipes us ON j.id = us.job_id
+        WHERE us.user_id = :user_id AND us.action = :action
+        ORDER BY us.created_at DESC
+    """,
+
+    # --- swipes ---
+    "swipes.job_ids_for_user": "SELECT job_id FROM user_swipes WHERE user_id = :user_id",
+    # :created_at is when the swipe was made (timestamp_param()), so a late
+    # write (another worker's buffer, a replayed journal) never overrides a
+    # newer swipe or moves it forward past the online learner's cursor
+    "swipes.upsert": """
+        INSERT INTO user_swipes (user_id, job_id, action, created_at)
+        VALUES (:user_id, :job_id, :action, :created_at)
+        ON CONFLICT (user_id, job_id) DO UPDATE SET
+            action = excluded.action,
+            created_at = excluded.created_at
+        WHERE excluded.created_at >= user_swipes.created_at
+    """,
+
+    # --- interactions ---
+    "interactions.insert": """
+        INSERT INTO interactions (user_id, job_id, semantic_sim, skill_overlap, exp_gap, location_match, label)
+        VALUES (:user_id, :job_id, :semantic_sim, :skill_overlap, :exp_gap, :location_match, :label)
+    """,
+
+    # --- ml ---
+    # Labelled swipes after the online learner's (created_at, id) cursor.
+    # Upserts bump created_at, so a re-labelled swipe is seen again; rows
+    # from the last ML_ONLINE_SETTLE_SECONDS wait until no write still in
+    # flight can land behind the cursor.
+    "ml.swipes_since": """
+        SELECT
+            us.id                 AS swipe_id,
+            us.created_at         AS swiped_at,
+            us.action,
+            u.skills              AS user_skills,
+            u.preferred_location  AS user_preferred_location,
+            u.preferred_seniority AS user_preferred_seniority,
+            j.title               AS job_title,
+            j.location            AS job_location,
+            j.skills              AS job_skills,
+            j.title_norm          AS job_title_norm,
+            j.location_norm       AS job_location_norm,
+            j.description_length  AS job_description_length,
+            CASE WHEN j.description_length IS NULL THEN j.description END AS job_description,
+            j.title_length        AS job_title_length
+        FROM user_swipes us
+        JOIN users u ON us.user_id = u.id
+        JOIN jobs j  ON us.job_id = j.id
+        WHERE (us.created_at, us.id) > (:after_at, :after_id)
+          AND us.created_at <= {settled_cutoff}
+          AND us.action IN ('apply', 'save', 'skip')
+        ORDER BY us.created_at, us.id
+        LIMIT :limit
+    """,
+
+    # --- messages ---
+    "messages.for_job": """
+        SELECT * FROM messages
+        WHERE user_id = :user_id AND job_id = :job_id
+        ORDER BY created_at ASC
+    """,
+    "messages.insert": """
+        INSERT INTO messages (user_id, job_id, sender_type, message)
+        VALUES (:user_id, :job_id, :sender_type, :message)
+        {returning_id}
+    """,
+
+    # --- auto apply ---
+    "auto_apply.sent_last_hour": """
+        SELECT COUNT(*) AS cnt
+        FROM auto_apply_queue
+        WHERE user_id = :user_id
+          AND status = 'sent'
+          AND sent_at >= {one_hour_ago}
+    """,
+    "auto_apply.pending_exists": """
+        SELECT 1 FROM auto_apply_queue
+        WHERE user_id = :user_id AND job_id = :job_id AND status = 'pending'
+    """,
+    "auto_apply.insert": """
+        INSERT INTO auto_apply_queue
+            (user_id, job_id, to_email, subject, body, resume_path, status)
+        VALUES (:user_id, :job_id, :to_email, :subject, :body, :resume_path, 'pending')
+        {returning_id}
+    """,
+    "auto_apply.pending_batch": """
+        SELECT * FROM auto_apply_queue
+        WHERE status = 'pending'
+        ORDER BY created_at ASC
+        LIMIT :limit
+    """,
+    "auto_apply.mark_sent": """
+        UPDATE auto_apply_queue
+        SET status = 'sent',
+            sent_at = CURRENT_TIMESTAMP,
+            error = NULL
+        WHERE id = :id
+    """,
+    "auto_apply.mark_failed": """
+        UPDATE auto_apply_queue
+        SET status = 'failed',
+            error = :error,
+            retry_count = retry_count + 1
+        WHERE id = :id
+    """,
+}
+
+# :name, but not the second colon of a ::cast
+_PARAM_RE = re.compile(r"(?<!:):([A-Za-z_]\w*)")
+
+
+def dialect_of(conn) -> str:
+    return SQLITE if isinstance(conn, sqlite3.Connection) else POSTGRES
+
+
+def timestamp_param(ts: float, dialect: str):
+    """
+    A unix time as a created_at parameter: UTC text for SQLite, spelled like
+    CURRENT_TIMESTAMP (plus microseconds) so the two compare as text; an
+    aware datetime for Postgres, converted to the session time zone like NOW().
+    """
+    moment = datetime.fromtimestamp(ts, timezone.utc)
+    if dialect == SQLITE:
+        return moment.strftime("%Y-%m-%d %H:%M:%S.%f")
+    return moment
+
+
+@lru_cache(maxsize=None)
+def compile_query(name: str, dialect: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Render a named query for `dialect`. Returns the SQL and the parameter
+    names in order of first appearance (used for positional PREPARE).
+    """
+    try:
+        template = QUERIES[name]
+    except KeyError:
+        raise KeyError(f"Unknown query '{name}'") from None
+    text = " ".join(template.format(**MACROS[dialect]).split())
+    order: List[str] = []
+    for param in _PARAM_RE.findall(text):
+        if param not in order:
+            order.append(param)
+    if dialect == POSTGRES:
+        text = _PARAM_RE.sub(lambda m: f"%({m.group(1)})s", text.replace("%", "%%"))
+    return text, tuple(order)
+
+
+@lru_cache(maxsize=None)
+def _prepare_statement(name: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """PREPARE text ($1, $2...), statement name and parameter order for Postgres."""
+    text, order = compile_query(name, POSTGRES)
+    positional = re.sub(r"%\((\w+)\)s", lambda m: f"${order.index(m.group(1)) + 1}", text).replace("%%", "%")
+    statement = "q_" + re.sub(r"\W", "_", name)
+    return f"PREPARE {statement} AS {positional}", statement, order
+
+
+# Statements already prepared, per Postgres connection (pooled connections keep them)
+_prepared: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
+
+
+def execute(conn, name: str, params: Optional[Dict[str, Any]] = None, cursor=None):
+    """Run a named query on `conn` and return the cursor."""
+    params = params or {}
+    cursor = cursor or conn.cursor()
+    dialect = dialect_of(conn)
+    if dialect == SQLITE:
+        text, _ = compile_query(name, SQLITE)
+        cursor.execute(text, params)
+        return cursor
+
+    prepare, statement, order = _prepare_statement(name)
+    done = _prepared.setdefault(conn, set())
+    if statement not in done:
+        cursor.execute(prepare)
+        done.add(statement)
+    args = ", ".join(f"%({p})s" for p in order)
+    cursor.execute(f"EXECUTE {statement} ({args})" if order else f"EXECUTE {statement}", params)
+    return cursor
+
+
+def execute_many(conn, name: str, rows: List[Dict[str, Any]], cursor=None):
+    """Run a named query once per parameter dict in `rows` (one round of executemany)."""
+    cursor = cursor or conn.cursor()
+    if rows:
+        text, _ = compile_query(name, dialect_of(conn))
+        cursor.executemany(text, rows)
+    return cursor
+
+
+# conn and name are positional-only so queries can take a :name parameter
+
+
+def fetch_one(conn, name: str, /, **params):
+    return execute(conn, name, params).fetchone()
+
+
+def fetch_all(conn, name: str, /, **params) -> list:
+    return execute(conn, name, params).fetchall()
+
+
+def insert_returning_id(conn, name: str, /, **params) -> int:
+    """Run a named INSERT ... {returning_id} and return the new row id."""
+    cursor = execute(conn, name, params)
+    if dialect_of(conn) == SQLITE:
+        return cursor.lastrowid
+    return cursor.fetchone()["id"]
@@ -15,6 +15,7 @@ CREATE TABLE IF NOT EXISTS users (
     preferred_location TEXT,
     preferred_seniority TEXT,
     resume_text TEXT,
+    resume_file_path TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -35,6 +36,35 @@ CREATE TABLE IF NOT EXISTS candidates (
 
 -- Jobs table
 CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT,
+    description TEXT,
+    skills TEXT,          -- comma-separated
+    source_url TEXT,
+    source TEXT,
+    salary_range TEXT,
+    job_type TEXT,
+    seniority_level TEXT,
+    posted_date DATE,
+    dedup_key TEXT,       -- hash of canonical title/company/location (db_manager.job_dedup_key)
+    minhash BLOB,         -- near-duplicate signature (ingestion/cleaners/near_duplicates.py)
+    -- Precomputed at insert for scoring and explanations (ml.features.job_static_columns)
+    clean_description TEXT,
+    title_norm TEXT,
+    location_norm TEXT,
+    description_length INTEGER,
+    title_length INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+-- Unique indexes on dedup_key and source_url are created by database/migrations.py
+
+-- Matches table
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
     score REAL NOT NULL,
     explanation TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -66,6 +96,25 @@ CREATE TABLE IF NOT EXISTS messages (
     FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
 );
 
+-- Outgoing auto-apply emails (app/services/apply_service.py)
+CREATE TABLE IF NOT EXISTS auto_apply_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    resume_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',  -- 'pending', 'sent', 'failed'
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    scheduled_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME,
+    retry_count INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (job_id) REFERENCES jobs(id)
+);
+
 -- Tracks how users interact with jobs (for ML training)
 CREATE TABLE IF NOT EXISTS interactions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -79,15 +128,5 @@ CREATE TABLE IF NOT EXISTS interactions (
     created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Auto-cleanup Trigger: Remove duplicates if they sneak in
-CREATE TRIGGER IF NOT EXISTS trg_cleanup_jobs
-AFTER INSERT ON jobs
-BEGIN
-    DELETE FROM jobs 
-    WHERE id NOT IN (
-        SELECT MIN(id) 
-        FROM jobs 
-        GROUP BY title, company
-    );
-END;
-
+-- Indexes for the service queries (database/queries.py) are created by
+-- database/migrations.py; tests/test_query_plans.py checks they are used.
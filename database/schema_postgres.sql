@@ -39,16 +39,45 @@ CREATE TABLE IF NOT EXISTS jobs (
     company VARCHAR(255) NOT NULL,
     location VARCHAR(255),
     description TEXT,
-    url VARCHAR(1000),
+    source_url VARCHAR(1000),
     skills TEXT,
     salary_range VARCHAR(255),
     job_type VARCHAR(100),
     seniority_level VARCHAR(100),
     posted_date DATE,
     source VARCHAR(100),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(title, company)
+    dedup_key CHAR(40),   -- hash of canonical title/company/location (db_manager.job_dedup_key)
+    minhash BYTEA,        -- near-duplicate signature (ingestion/cleaners/near_duplicates.py)
+    clean_description TEXT,       -- precomputed at insert (ml.features.job_static_columns)
+    title_norm VARCHAR(500),
+    location_norm VARCHAR(255),
+    description_length INTEGER,
+    title_length INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+-- Dedup is by dedup_key (title/company/location) and source_url; the old
+-- constraint dropped the same role posted in another location
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_title_company_key;
+-- Older deployments named the column "url"; the services read source_url
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'jobs' AND column_name = 'url') THEN
+        ALTER TABLE jobs RENAME COLUMN url TO source_url;
+    END IF;
+END $$;
+DROP INDEX IF EXISTS idx_jobs_url;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS dedup_key CHAR(40);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS minhash BYTEA;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS clean_description TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS title_norm VARCHAR(500);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS location_norm VARCHAR(255);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS description_length INTEGER;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS title_length INTEGER;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedup_key ON jobs(dedup_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_source_url ON jobs(source_url) WHERE source_url IS NOT NULL AND dedup_key IS NOT NULL;
+-- Jobs stored before dedup_key existed: key and merge them with
+--   DATABASE_URL=... python scripts/compact_jobs.py --postgres
 
 -- Matches table
 CREATE TABLE IF NOT EXISTS matches (
@@ -86,6 +115,25 @@ CREATE TABLE IF NOT EXISTS messages (
     FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
 );
 
+-- Outgoing auto-apply emails (app/services/apply_service.py)
+CREATE TABLE IF NOT EXISTS auto_apply_queue (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    to_email VARCHAR(255) NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    resume_path VARCHAR(500),
+    status VARCHAR(50) NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    scheduled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    retry_count INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+);
+
 -- Interactions for ML training
 CREATE TABLE IF NOT EXISTS interactions (
     id SERIAL PRIMARY KEY,
@@ -107,3 +155,16 @@ CREATE INDEX IF NOT EXISTS idx_user_swipes_user_id ON user_swipes(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_swipes_job_id ON user_swipes(job_id);
 CREATE INDEX IF NOT EXISTS idx_interactions_user_id ON interactions(user_id);
 CREATE INDEX IF NOT EXISTS idx_interactions_job_id ON interactions(job_id);
+
+-- Hot service queries (database/queries.py); mirrors HOT_QUERY_INDEXES in database/migrations.py
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+CREATE INDEX IF NOT EXISTS idx_user_swipes_user_action ON user_swipes(user_id, action, created_at, job_id);
+CREATE INDEX IF NOT EXISTS idx_messages_user_job ON messages(user_id, job_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_auto_apply_status ON auto_apply_queue(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_auto_apply_user_status ON auto_apply_queue(user_id, status, sent_at);
+
+-- Feed keyset (jobs.recent_before); SQLite's idx_jobs_created_at already ends in the rowid
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at_id ON jobs(created_at, id);
+
+-- Online learner cursor (swipes.since); SQLite gets it from migration _add_swipe_cursor_index
+CREATE INDEX IF NOT EXISTS idx_user_swipes_created_at ON user_swipes(created_at, id);
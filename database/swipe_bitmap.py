@@ -0,0 +1,130 @@
+"""
+Per-user swiped-job bitmaps.
+
+A NumPy bool array indexed by job id marks the jobs a user has already
+swiped, so feed candidates can be filtered with one vectorised lookup
+instead of querying user_swipes on every request. A user's bitmap is
+loaded from the database on first use (and again once older than the
+TTL) and updated in place whenever the user swipes.
+
+Swipes are only ever added or re-labelled, never removed, so bits are
+only ever set: a reload is ORed into the bitmap it replaces, which keeps
+swipes recorded while the load was running. Job ids are never reused
+(AUTOINCREMENT / SERIAL), so a bit left behind by a deleted or compacted
+job can never hide a new one.
+
+    keep = swipe_bitmap.unswiped_mask(user_id, job_ids)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import SWIPE_BITMAP_CACHE, SWIPE_BITMAP_MAX_USERS, SWIPE_BITMAP_TTL
+
+Loader = Callable[[int], Iterable[int]]
+
+
+def load_swiped_job_ids(user_id: int) -> List[int]:
+    from database.connection import get_db_connection
+    from database.queries import fetch_all
+
+    with get_db_connection() as conn:
+        return [row["job_id"] for row in fetch_all(conn, "swipes.job_ids_for_user", user_id=user_id)]
+
+
+def _bits_for(job_ids: Iterable[int], size: int = 0) -> np.ndarray:
+    ids = np.fromiter(job_ids, dtype=np.int64)
+    bits = np.zeros(max(size, int(ids.max()) + 1 if ids.size else 0, 64), dtype=bool)
+    bits[ids] = True
+    return bits
+
+
+def _union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if a.size < b.size:
+        a, b = b, a
+    a = a.copy()
+    a[: b.size] |= b
+    return a
+
+
+class SwipedJobCache:
+    """LRU of per-user swiped-job bitmaps, bounded by user count and age."""
+
+    def __init__(
+        self,
+        loader: Loader = load_swiped_job_ids,
+        ttl: float = SWIPE_BITMAP_TTL,
+        max_users: int = SWIPE_BITMAP_MAX_USERS,
+    ) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.max_users = max(1, max_users)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()   # user_id -> (bits, loaded_at)
+        self._loading: Dict[int, List[int]] = {}                    # swipes seen while a load is in flight
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _get(self, user_id: int) -> np.ndarray:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+            self._loading.setdefault(user_id, [])
+
+        bits = _bits_for(self.loader(user_id))
+
+        with self._lock:
+            self.loads += 1
+            pending = self._loading.pop(user_id, [])
+            if pending:
+                bits = _union(bits, _bits_for(pending))
+            current = self._entries.get(user_id)
+            if current is not None:
+                bits = _union(bits, current[0])   # keeps swipes a racing load or mark() added
+            self._entries[user_id] = (bits, now)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return bits
+
+    def unswiped_mask(self, user_id: int, job_ids: np.ndarray) -> np.ndarray:
+        """Bool mask over `job_ids`: True where the user has not swiped the job."""
+        bits = self._get(user_id)
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        swiped = np.zeros(job_ids.shape, dtype=bool)
+        in_range = job_ids < bits.size
+        swiped[in_range] = bits[job_ids[in_range]]
+        return ~swiped
+
+    def mark(self, user_id: int, job_id: int) -> None:
+        """Record a swipe (call after it is committed). Users not cached are left to load lazily."""
+        with self._lock:
+            if user_id in self._loading:
+                self._loading[user_id].append(job_id)
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            bits, loaded_at = entry
+            if job_id >= bits.size:
+                grown = np.zeros(max(job_id + 1, bits.size * 2), dtype=bool)
+                grown[: bits.size] = bits
+                bits = grown
+            bits[job_id] = True
+            self._entries[user_id] = (bits, loaded_at)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+swipe_bitmap: Optional[SwipedJobCache] = SwipedJobCache() if SWIPE_BITMAP_CACHE else None
@@ -0,0 +1,337 @@
+"""
+Write-behind buffer for swipes.
+
+Rapid swiping would otherwise commit one tiny transaction per swipe. With
+SWIPE_BUFFER on, a swipe is appended to a per-process journal file and
+kept in memory, coalesced per (user, job) with the last action winning,
+as the swipes.upsert it stands for would. Each swipe keeps the time it was
+made, which becomes its created_at: the upsert only replaces an older
+swipe, so the order in which workers flush (or recover() replays) does
+not decide which action wins. A background thread upserts
+everything pending in one transaction every SWIPE_BUFFER_FLUSH_SECONDS,
+or sooner once SWIPE_BUFFER_FLUSH_ROWS swipes are pending.
+
+Journal, under SWIPE_BUFFER_DIR:
+
+    swipes-<pid>.log                 swipes since the last flush began
+    swipes-<pid>.<seq>.flushing      swipes being (or failing to be) flushed
+
+    <unix_ts>\\t<user_id>\\t<job_id>\\t<action>   one line per swipe, in arrival order
+
+A flush renames the active journal before writing and deletes it once
+committed; if the write fails, its swipes go back to pending (newer ones
+win) and the file is kept until a later flush succeeds. Lines are
+flushed to the OS on every swipe, so they survive a crash of the process
+(with SWIPE_BUFFER_FSYNC, of the machine too). recover() replays files
+left by processes that are no longer running; call it at startup. Within
+one process the later line wins; between processes, the later timestamp.
+
+Rows the database rejects (an unknown job or user) are dropped with a
+warning so they cannot block a batch; any other error retries the batch.
+
+Readers in this process see buffered swipes through pending(); the feed
+filters them out (app/services/job_service.py).
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import (
+    SWIPE_BUFFER,
+    SWIPE_BUFFER_DIR,
+    SWIPE_BUFFER_FLUSH_ROWS,
+    SWIPE_BUFFER_FLUSH_SECONDS,
+    SWIPE_BUFFER_FSYNC,
+)
+from app.core.logging import logger
+
+ACTIONS = ("apply", "skip", "save")
+
+Row = Dict[str, object]
+Swiped = Tuple[str, float]
+Writer = Callable[[List[Row]], int]
+
+_JOURNAL_RE = re.compile(r"swipes-(\d+)(?:\.(\d+)\.flushing|\.log)$")
+
+
+def _is_integrity_error(e: Exception) -> bool:
+    # sqlite3.IntegrityError and psycopg2's IntegrityError subclasses
+    return any(cls.__name__ == "IntegrityError" for cls in type(e).__mro__)
+
+
+def upsert_swipes(rows: List[Row]) -> int:
+    """
+    swipes.upsert every row (user_id, job_id, action, swiped_at as unix
+    time) in one transaction. Returns the rows written.
+    """
+    from database.connection import get_db_connection
+    from database.queries import dialect_of, execute, execute_many, timestamp_param
+
+    with get_db_connection() as conn:
+        dialect = dialect_of(conn)
+        rows = [
+            {"user_id": r["user_id"], "job_id": r["job_id"], "action": r["action"],
+             "created_at": timestamp_param(r["swiped_at"], dialect)}
+            for r in rows
+        ]
+        try:
+            execute_many(conn, "swipes.upsert", rows)
+            conn.commit()
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            if not _is_integrity_error(e):
+                raise
+        # A rejected row fails the whole batch: write row by row, dropping rejects
+        written = 0
+        for row in rows:
+            try:
+                execute(conn, "swipes.upsert", row)
+                conn.commit()
+                written += 1
+            except Exception as e:
+                conn.rollback()
+                if not _is_integrity_error(e):
+                    raise
+                logger.warning(f"[Swipes] Dropped buffered swipe {row['user_id']}/{row['job_id']}: {e}")
+        return written
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return False  # our own files at startup are a previous run's (e.g. pid 1 in a container)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class BufferStats:
+    flushes: int = 0
+    rows_flushed: int = 0
+    failed_flushes: int = 0
+    last_flush_seconds: float = 0.0
+
+
+class SwipeBuffer:
+    """Journaled, coalescing swipe buffer flushed in batched transactions."""
+
+    def __init__(
+        self,
+        journal_dir: Path,
+        flush_rows: int = SWIPE_BUFFER_FLUSH_ROWS,
+        flush_seconds: float = SWIPE_BUFFER_FLUSH_SECONDS,
+        fsync: bool = SWIPE_BUFFER_FSYNC,
+        writer: Writer = upsert_swipes,
+    ) -> None:
+        self.journal_dir = Path(journal_dir)
+        self.flush_rows = max(1, flush_rows)
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.writer = writer
+        self.stats = BufferStats()
+        # user_id -> job_id -> (action, unix time swiped)
+        self._pending: Dict[int, Dict[int, Swiped]] = {}
+        self._flushing: Dict[int, Dict[int, Swiped]] = {}  # taken by the flush in progress
+        self._count = 0
+        self._journal = None
+        self._seq = count(1)
+        self._retry: List[Path] = []  # rotated journals whose swipes are pending again
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time keeps batches in order
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active_path(self) -> Path:
+        return self.journal_dir / f"swipes-{os.getpid()}.log"
+
+    # -----------------------------------------------------
+    # Writing
+    # -----------------------------------------------------
+
+    def add(self, user_id: int, swipes: Iterable[Tuple[int, str]]) -> None:
+        """Journal and buffer (job_id, action) swipes for one user. Raises if the journal write fails."""
+        swipes = list(swipes)
+        if not swipes:
+            return
+        with self._lock:
+            now = time.time()
+            lines = "".join(f"{now:.6f}\t{user_id}\t{job_id}\t{action}\n" for job_id, action in swipes)
+            if self._journal is None:
+                self.journal_dir.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self.active_path, "a")
+            self._journal.write(lines)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            pending = self._pending.setdefault(user_id, {})
+            for job_id, action in swipes:
+                if job_id not in pending:
+                    self._count += 1
+                pending[job_id] = (action, now)
+            due = self._count >= self.flush_rows
+        self._ensure_started()
+        if due:
+            self._wake.set()
+
+    def pending(self, user_id: int) -> Dict[int, str]:
+        """job_id -> action for the user's swipes not yet written to the database."""
+        with self._lock:
+            merged = {**self._flushing.get(user_id, {}), **self._pending.get(user_id, {})}
+        return {job_id: action for job_id, (action, _) in merged.items()}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def flush(self) -> int:
+        """Write everything pending now. Returns the swipes written (0 if the write failed)."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._count = self._pending, {}, 0
+                self._flushing = pending
+                rotated = self._rotate()
+            files = self._retry + ([rotated] if rotated is not None else [])
+            rows = [
+                {"user_id": user_id, "job_id": job_id, "action": action, "swiped_at": ts}
+                for user_id, jobs in pending.items()
+                for job_id, (action, ts) in jobs.items()
+            ]
+            written = 0
+            if rows:
+                start = time.perf_counter()
+                try:
+                    written = self.writer(rows)
+                except Exception as e:
+                    logger.error(f"[Swipes] Flush of {len(rows)} buffered swipes failed, will retry: {e}")
+                    self._requeue(pending)
+                    self._retry = files
+                    self.stats.failed_flushes += 1
+                    return 0
+                self.stats.flushes += 1
+                self.stats.rows_flushed += written
+                self.stats.last_flush_seconds = time.perf_counter() - start
+            with self._lock:
+                self._flushing = {}
+            for path in files:
+                path.unlink(missing_ok=True)
+            self._retry = []
+            return written
+
+    def _rotate(self) -> Optional[Path]:
+        """Close the active journal and rename it for flushing (caller holds _lock)."""
+        if self._journal is None:
+            return None
+        self._journal.close()
+        self._journal = None
+        path = self.journal_dir / f"swipes-{os.getpid()}.{next(self._seq):06d}.flushing"
+        os.replace(self.active_path, path)
+        return path
+
+    def _requeue(self, pending: Dict[int, Dict[int, Swiped]]) -> None:
+        with self._lock:
+            self._flushing = {}
+            for user_id, jobs in pending.items():
+                current = self._pending.setdefault(user_id, {})
+                for job_id, swiped in jobs.items():
+                    if job_id not in current:  # swiped again meanwhile: the newer action wins
+                        current[job_id] = swiped
+                        self._count += 1
+
+    # -----------------------------------------------------
+    # Background flushing
+    # -----------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._stop:
+                self._thread = threading.Thread(target=self._run, name="swipe-buffer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            if len(self):
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"[Swipes] Buffer flush error: {e}")
+
+    def close(self) -> None:
+        """Stop the flusher and write what is pending."""
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    # -----------------------------------------------------
+    # Recovery
+    # -----------------------------------------------------
+
+    def recover(self) -> int:
+        """
+        Write the swipes journaled by processes that exited without
+        flushing them (last action per (user, job) wins, by timestamp
+        across processes). Returns the swipes written; on failure the
+        journals are kept for next time.
+        """
+        if not self.journal_dir.exists():
+            return 0
+        mine = set(self._retry) | ({self.active_path} if self._journal is not None else set())
+        found = []
+        for path in self.journal_dir.iterdir():
+            match = _JOURNAL_RE.match(path.name)
+            if match is None or path in mine or _pid_alive(int(match.group(1))):
+                continue
+            # Flushing files before the active journal they were rotated from
+            seq = int(match.group(2)) if match.group(2) else float("inf")
+            found.append((int(match.group(1)), seq, path))
+        if not found:
+            return 0
+
+        # Per process, file and line order decide; between processes, the timestamp
+        by_pid: Dict[int, Dict[Tuple[int, int], Tuple[float, str]]] = {}
+        for pid, _, path in sorted(found):
+            last = by_pid.setdefault(pid, {})
+            for line in path.read_text().splitlines():
+                parts = line.split("\t")
+                # A crash can leave the last line half-written
+                if len(parts) != 4 or not parts[1].isdigit() or not parts[2].isdigit() or parts[3] not in ACTIONS:
+                    continue
+                try:
+                    ts = float(parts[0])
+                except ValueError:
+                    continue
+                last[(int(parts[1]), int(parts[2]))] = (ts, parts[3])
+        latest: Dict[Tuple[int, int], Tuple[float, str]] = {}
+        for last in by_pid.values():
+            for key, swipe in last.items():
+                if key not in latest or swipe[0] > latest[key][0]:
+                    latest[key] = swipe
+
+        rows = [{"user_id": u, "job_id": j, "action": a, "swiped_at": ts} for (u, j), (ts, a) in latest.items()]
+        written = self.writer(rows) if rows else 0
+        for _, _, path in found:
+            path.unlink(missing_ok=True)
+        logger.info(f"[Swipes] Recovered {written} journaled swipes from {len(found)} files")
+        return written
+
+
+swipe_buffer: Optional[SwipeBuffer] = SwipeBuffer(Path(SWIPE_BUFFER_DIR)) if SWIPE_BUFFER else None
@@ -0,0 +1,54 @@
+"""
+Cleaning steps applied to normalized jobs during ingestion.
+
+Functions here take and return lists so they can run in a process pool
+with one pickling round-trip per batch instead of per job.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from database.db_manager import job_dedup_key
+from ingestion.cleaners.near_duplicates import minhash_signature, signature_to_bytes, split_company_title
+from scrapers.html_text import html_to_text
+from scrapers.normalizer import extract_skills_from_text
+
+
+def _strip_nul(value):
+    if isinstance(value, str):
+        return value.replace("\x00", "")
+    return value
+
+
+def clean_job(job: Dict) -> Dict:
+    """
+    Strip HTML and NUL bytes from a normalized job, split "Company: Role"
+    titles and compute the MinHash signature used for near-duplicate
+    detection (CPU bound).
+    """
+    job = {k: _strip_nul(v) for k, v in job.items()}
+    job["description"] = html_to_text(job.get("description"))
+    if job.get("title"):
+        job["title"], job["company"] = split_company_title(job["title"], job.get("company"))
+    job["minhash"] = signature_to_bytes(minhash_signature(job))
+    return job
+
+
+def clean_jobs(jobs: List[Dict]) -> List[Dict]:
+    return [clean_job(job) for job in jobs]
+
+
+def enrich_skills(job: Dict) -> Dict:
+    """Add skills found in the cleaned description/title to the source-provided ones."""
+    found = extract_skills_from_text(f"{job.get('description') or ''} {job.get('title') or ''}")
+    job["skills"] = sorted(set(job.get("skills") or []) | set(found))
+    return job
+
+
+def enrich_skills_batch(jobs: List[Dict]) -> List[Dict]:
+    return [enrich_skills(job) for job in jobs]
+
+
+def dedup_key(job: Dict) -> str:
+    """Exact-duplicate key, the same one stored in jobs.dedup_key."""
+    return job_dedup_key(job.get("title"), job.get("company"), job.get("location"))
@@ -0,0 +1,194 @@
+"""
+Near-duplicate job detection with MinHash signatures and an LSH index.
+
+The same posting shows up on several boards with small differences in
+title, company or description, which the exact dedup key misses. Each job
+gets a MinHash signature over word shingles of its title, company and
+description; the LSH index splits signatures into bands so a lookup only
+compares against jobs that share at least one band, instead of all jobs.
+
+    index = LSHIndex()
+    sig = minhash_signature(job)
+    if index.query(sig):
+        ...  # near duplicate of an indexed job
+    index.add(job_id, sig)
+"""
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+SHINGLE_SIZE = 2
+DEFAULT_THRESHOLD = 0.6  # reposted copies score ~0.7+, same role at another company ~0.25
+MAX_TEXT_CHARS = 2000
+
+# Company values some sources use when they don't know the employer
+PLACEHOLDER_COMPANIES = {"", "unknown", "see link", "n/a", "na", "none", "confidential"}
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"\w+")
+
+
+def is_placeholder_company(company: Optional[str]) -> bool:
+    return (company or "").strip().lower() in PLACEHOLDER_COMPANIES
+
+
+def split_company_title(title: str, company: Optional[str]) -> Tuple[str, str]:
+    """
+    Undo the "Company: Role" title form (WeWorkRemotely). The prefix is
+    stripped when it matches the company, or used as the company when the
+    source only gave a placeholder.
+    """
+    title = (title or "").strip()
+    company = (company or "").strip()
+    prefix, sep, role = title.partition(": ")
+    if not sep or not role.strip():
+        return title, company
+    if prefix.strip().lower() == company.lower():
+        return role.strip(), company
+    if is_placeholder_company(company):
+        return role.strip(), prefix.strip()
+    return title, company
+
+
+def _permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, np.iinfo(np.int32).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+    b = rng.randint(0, np.iinfo(np.int32).max, size=num_perm, dtype=np.int64).astype(np.uint64)
+    return a, b
+
+
+_PERMS: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def signature_text(job: Dict) -> str:
+    title, company = split_company_title(job.get("title") or "", job.get("company"))
+    if is_placeholder_company(company):
+        company = ""
+    return f"{title} {company} {(job.get('description') or '')[:MAX_TEXT_CHARS]}"
+
+
+def minhash(text: str, num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """MinHash signature (uint32[num_perm]) of the word shingles of `text`."""
+    if (num_perm, seed) not in _PERMS:
+        _PERMS[(num_perm, seed)] = _permutations(num_perm, seed)
+    a, b = _PERMS[(num_perm, seed)]
+
+    grams = shingles(text)
+    if not grams:
+        return np.full(num_perm, _MAX_HASH, dtype=np.uint32)
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    # a < 2^31 and hashes < 2^32, so a * h fits in uint64
+    permuted = (np.outer(a, hashes) + b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def minhash_signature(job: Dict, num_perm: int = NUM_PERM) -> np.ndarray:
+    return minhash(signature_text(job), num_perm)
+
+
+def signature_to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def signature_from_bytes(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> int:
+    """Band count whose S-curve midpoint (1/b)^(1/r) is closest to `threshold`."""
+    best, best_err = 1, float("inf")
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if err < best_err:
+            best, best_err = bands, err
+    return best
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures. Candidates sharing a band are
+    verified against `threshold` with the full signature.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM, bands: Optional[int] = None) -> None:
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands or _optimal_bands(threshold, num_perm)
+        self.rows = num_perm // self.bands
+        self._tables: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _matches(self, sig: np.ndarray, bands: List[bytes]) -> List[Tuple[Hashable, float]]:
+        candidates = set()
+        for table, band in zip(self._tables, bands):
+            candidates.update(table.get(band, ()))
+        matches = []
+        for key in candidates:
+            sim = estimate_similarity(sig, self._signatures[key])
+            if sim >= self.threshold:
+                matches.append((key, sim))
+        return sorted(matches, key=lambda m: -m[1])
+
+    def _insert(self, key: Hashable, sig: np.ndarray, bands: List[bytes]) -> None:
+        self._signatures[key] = sig
+        for table, band in zip(self._tables, bands):
+            table.setdefault(band, []).append(key)
+
+    def add(self, key: Hashable, sig: np.ndarray) -> None:
+        with self._lock:
+            self._insert(key, sig, self._band_keys(sig))
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            sig = self._signatures.pop(key, None)
+            if sig is None:
+                return
+            for table, band in zip(self._tables, self._band_keys(sig)):
+                keys = table[band]
+                keys.remove(key)
+                if not keys:
+                    del table[band]
+
+    def query(self, sig: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """Indexed keys whose estimated similarity to `sig` is >= threshold, best first."""
+        with self._lock:
+            return self._matches(sig, self._band_keys(sig))
+
+    def add_if_new(self, key: Hashable, sig: np.ndarray) -> Optional[Hashable]:
+        """Index `sig` unless it near-duplicates an indexed one; return that one's key if so."""
+        bands = self._band_keys(sig)
+        with self._lock:
+            matches = self._matches(sig, bands)
+            if matches:
+                return matches[0][0]
+            self._insert(key, sig, bands)
+        return None
@@ -0,0 +1,515 @@
+"""
+Staged streaming ingestion pipeline.
+
+    fetch -> normalize -> clean (HTML) -> skills -> dedup -> near-dup -> insert -> embed -> index
+
+Stages are connected by bounded queues and each runs its own pool of
+worker threads, so fetching, cleaning and writing overlap instead of
+running one job at a time. CPU-heavy HTML cleaning is shipped to a
+process pool in batches. Every stage keeps throughput counters.
+
+Usage:
+    python -m ingestion.pipeline.job_ingestion --query python --limit 200
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logging import logger
+from ingestion.cleaners.job_normalizer import clean_jobs, dedup_key, enrich_skills_batch
+from ingestion.cleaners.near_duplicates import (
+    DEFAULT_THRESHOLD,
+    LSHIndex,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from scrapers.normalizer import normalize_raw_job
+
+_DONE = object()
+
+BatchFunc = Callable[[List], List]
+Producer = Callable[[], Iterable]
+
+NEAR_DUP_WINDOW = 50000  # most recent stored jobs to check against
+
+
+@dataclass
+class IngestionConfig:
+    queue_size: int = 1000
+    fetch_workers: int = 8            # threads, I/O bound
+    normalize_workers: int = 2
+    clean_workers: int = os.cpu_count() or 2  # processes, CPU bound
+    clean_batch_size: int = 50
+    use_process_pool: bool = True
+    insert_batch_size: int = 200
+    near_dup_threshold: Optional[float] = DEFAULT_THRESHOLD  # None disables near-dup filtering
+    near_dup_window: int = NEAR_DUP_WINDOW
+    embed: bool = False               # needs an embedding provider
+    embed_workers: int = 4
+    embed_batch_size: int = 16
+    index: bool = False               # needs chromadb
+    batch_linger: float = 0.05        # seconds to wait while filling a batch
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per wall-clock second."""
+        wall = self.wall_seconds
+        return self.items_in / wall if wall > 0 else 0.0
+
+
+@dataclass
+class IngestionReport:
+    stages: List[StageStats] = field(default_factory=list)
+    elapsed: float = 0.0
+    inserted_ids: List[int] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [f"Ingestion finished in {self.elapsed:.2f}s, {len(self.inserted_ids)} new jobs"]
+        for s in self.stages:
+            lines.append(
+                f"  {s.name:<10} x{s.workers:<3} in={s.items_in:<7} out={s.items_out:<7} "
+                f"errors={s.errors:<4} {s.throughput:10.1f} jobs/sec  busy={s.busy_seconds:.2f}s"
+            )
+        return "\n".join(lines)
+
+
+class Stage:
+    """A batch function run by `workers` threads between two bounded queues."""
+
+    def __init__(
+        self,
+        name: str,
+        func: BatchFunc,
+        workers: int = 1,
+        batch_size: int = 1,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.executor = executor
+        self.stats = StageStats(name, workers=self.workers)
+        self.inbox: Optional[queue.Queue] = None
+        self.outbox: Optional[queue.Queue] = None
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._linger = 0.0
+
+    def _next_batch(self) -> Optional[List]:
+        item = self.inbox.get()
+        if item is _DONE:
+            self.inbox.put(_DONE)  # let sibling workers see it too
+            return None
+        batch = [item]
+        deadline = time.perf_counter() + self._linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.inbox.get(timeout=max(remaining, 0)) if remaining > 0 else self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self.inbox.put(_DONE)
+                break
+            batch.append(item)
+        return batch
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            start = time.perf_counter()
+            with self._lock:
+                if self.stats.started_at is None:
+                    self.stats.started_at = start
+                self.stats.items_in += len(batch)
+            try:
+                if self.executor is not None:
+                    out = self.executor.submit(self.func, batch).result()
+                else:
+                    out = self.func(batch)
+            except Exception as e:
+                out = []
+                with self._lock:
+                    self.stats.errors += len(batch)
+                logger.error(f"[Ingestion] {self.name} failed on batch of {len(batch)}: {e}")
+            with self._lock:
+                self.stats.busy_seconds += time.perf_counter() - start
+                self.stats.items_out += len(out)
+            if self.outbox is not None:
+                for item in out:
+                    self.outbox.put(item)
+
+        with self._lock:
+            self._alive -= 1
+            last = self._alive == 0
+            if last:
+                self.stats.finished_at = time.perf_counter()
+        if last and self.outbox is not None:
+            self.outbox.put(_DONE)
+
+    def start(self, linger: float) -> List[threading.Thread]:
+        self._linger = linger
+        self._alive = self.workers
+        threads = [
+            threading.Thread(target=self._run_worker, name=f"ingest-{self.name}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        return threads
+
+
+# ---------------------------------------------------------
+# Stage functions
+# ---------------------------------------------------------
+
+def _normalize_batch(raw_jobs: List) -> List[Dict]:
+    out = []
+    for job in raw_jobs:
+        try:
+            out.append(normalize_raw_job(job))
+        except Exception as e:
+            logger.warning(f"[Ingestion] normalize failed for {getattr(job, 'source', '?')}: {e}")
+    return out
+
+
+def _make_dedup() -> BatchFunc:
+    seen_keys = set()
+    seen_urls = set()
+    lock = threading.Lock()
+
+    def dedup(jobs: List[Dict]) -> List[Dict]:
+        out = []
+        with lock:
+            for job in jobs:
+                key = dedup_key(job)
+                url = job.get("url")
+                if key in seen_keys or (url and url in seen_urls):
+                    continue
+                seen_keys.add(key)
+                if url:
+                    seen_urls.add(url)
+                out.append(job)
+        return out
+
+    return dedup
+
+
+def load_near_dup_index(threshold: float, window: int) -> LSHIndex:
+    """
+    LSH index over the `window` most recent stored jobs, keyed by row id,
+    from their stored signatures. Rows stored before signatures existed are
+    hashed and saved once; only those rows' descriptions are read.
+    """
+    from database.connection import get_db_connection
+    from database.queries import SQLITE, dialect_of
+
+    index = LSHIndex(threshold)
+    with get_db_connection() as conn:
+        p = "?" if dialect_of(conn) == SQLITE else "%s"
+        cur = conn.cursor()
+        cur.execute(f"SELECT id, minhash FROM jobs ORDER BY id DESC LIMIT {p}", (window,))
+        newest = cur.fetchall()
+        missing = [row["id"] for row in newest if not row["minhash"]]
+        for row in newest:
+            if row["minhash"]:
+                index.add(row["id"], signature_from_bytes(bytes(row["minhash"])))
+        if missing:
+            placeholders = ",".join([p] * len(missing))
+            cur.execute(f"SELECT id, title, company, description FROM jobs WHERE id IN ({placeholders})", missing)
+            backfill = []
+            for row in cur.fetchall():
+                sig = minhash_signature(dict(row))
+                index.add(row["id"], sig)
+                backfill.append((signature_to_bytes(sig), row["id"]))
+            cur.executemany(f"UPDATE jobs SET minhash = {p} WHERE id = {p}", backfill)
+            conn.commit()
+    return index
+
+
+class NearDupFilter:
+    """
+    Near-duplicate check against the stored-job index plus the jobs already
+    let through but not yet inserted. A job enters the stored index (by row
+    id, like the loaded rows) only once its insert has returned an id.
+    """
+
+    def __init__(self, index: LSHIndex) -> None:
+        self.index = index
+        # In-flight jobs, keyed by id() of the job dict until settled
+        self.pending = LSHIndex(index.threshold, index.num_perm, index.bands)
+
+    def admit(self, jobs: List[Dict]) -> List[Dict]:
+        """Drop jobs that near-duplicate a stored or in-flight job; the rest get job["minhash"]."""
+        out = []
+        for job in jobs:
+            if job.get("minhash"):
+                sig = signature_from_bytes(job["minhash"])
+            else:
+                sig = minhash_signature(job)
+                job["minhash"] = signature_to_bytes(sig)
+            if self.index.query(sig):
+                continue
+            if self.pending.add_if_new(id(job), sig) is None:
+                out.append(job)
+        return out
+
+    def settle(self, jobs: List[Dict]) -> None:
+        """After an insert attempt: index the jobs that got an id, release all of them."""
+        for job in jobs:
+            if job.get("id") is not None:
+                self.index.add(job["id"], signature_from_bytes(job["minhash"]))
+            self.pending.remove(id(job))
+
+
+# One filter per (database, threshold, window), loaded on first use and then
+# kept current by the jobs this process inserts
+_NEAR_DUP_FILTERS: Dict[Tuple, NearDupFilter] = {}
+_NEAR_DUP_LOCK = threading.Lock()
+
+
+def _database_key() -> str:
+    from app.core import config
+    from database.connection import DATABASE_URL, USE_POSTGRES
+
+    return DATABASE_URL if USE_POSTGRES else config.DB_PATH
+
+
+def near_dup_filter(threshold: float = DEFAULT_THRESHOLD, window: int = NEAR_DUP_WINDOW) -> NearDupFilter:
+    key = (_database_key(), threshold, window)
+    with _NEAR_DUP_LOCK:
+        near_dups = _NEAR_DUP_FILTERS.get(key)
+        if near_dups is None:
+            near_dups = _NEAR_DUP_FILTERS[key] = NearDupFilter(load_near_dup_index(threshold, window))
+    return near_dups
+
+
+def insert_unique_jobs(
+    jobs: List[Dict], threshold: float = DEFAULT_THRESHOLD, window: int = NEAR_DUP_WINDOW
+) -> List[Dict]:
+    """Insert the jobs that are not near-duplicates of a stored (or earlier) job; return the inserted ones."""
+    near_dups = near_dup_filter(threshold, window)
+    return _make_insert(near_dups)(near_dups.admit(jobs))
+
+
+def _make_insert(near_dups: Optional[NearDupFilter] = None) -> BatchFunc:
+    def insert(jobs: List[Dict]) -> List[Dict]:
+        from database.db_manager import insert_jobs_bulk
+
+        try:
+            insert_jobs_bulk(jobs)  # sets job["id"] on inserted jobs
+        finally:
+            if near_dups is not None:
+                near_dups.settle(jobs)
+        return [job for job in jobs if job.get("id") is not None]
+
+    return insert
+
+
+def _embed_batch(jobs: List[Dict]) -> List[Dict]:
+    from core.llm_client import JobPosting
+    from matching.embeddings import embed_job
+
+    for job in jobs:
+        job["embedding"] = embed_job(
+            JobPosting(
+                title=job["title"],
+                company=job["company"],
+                location=job["location"],
+                seniority=job.get("seniority") or "",
+                skills=job.get("skills") or [],
+                description=job.get("description") or "",
+            )
+        )
+    return jobs
+
+
+def _make_index() -> BatchFunc:
+    store = {}
+
+    def index(jobs: List[Dict]) -> List[Dict]:
+        if "vs" not in store:
+            from database.vector_store import VectorStore
+            store["vs"] = VectorStore()
+        jobs = [j for j in jobs if j.get("embedding")]
+        if jobs:
+            store["vs"].add_jobs(
+                ids=[str(j["id"]) for j in jobs],
+                embeddings=[j["embedding"] for j in jobs],
+                metadatas=[{"title": j["title"], "company": j["company"], "source": j.get("source") or ""} for j in jobs],
+            )
+        return jobs
+
+    return index
+
+
+# ---------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------
+
+class IngestionPipeline:
+    def __init__(self, config: Optional[IngestionConfig] = None) -> None:
+        self.config = config or IngestionConfig()
+
+    def _build_stages(self, executor: Optional[Executor]) -> List[Stage]:
+        cfg = self.config
+        stages = [
+            Stage("normalize", _normalize_batch, workers=cfg.normalize_workers, batch_size=cfg.clean_batch_size),
+            Stage("clean", clean_jobs, workers=cfg.clean_workers, batch_size=cfg.clean_batch_size, executor=executor),
+            Stage("skills", enrich_skills_batch, workers=1, batch_size=cfg.clean_batch_size),
+            Stage("dedup", _make_dedup(), workers=1, batch_size=cfg.insert_batch_size),
+        ]
+        near_dups = None
+        if cfg.near_dup_threshold is not None:
+            near_dups = near_dup_filter(cfg.near_dup_threshold, cfg.near_dup_window)
+            stages.append(Stage("near-dup", near_dups.admit, workers=1, batch_size=cfg.insert_batch_size))
+        # SQLite has a single writer; batching, not parallelism, is what helps here
+        stages.append(Stage("insert", _make_insert(near_dups), workers=1, batch_size=cfg.insert_batch_size))
+        if cfg.embed:
+            stages.append(Stage("embed", _embed_batch, workers=cfg.embed_workers, batch_size=cfg.embed_batch_size))
+            if cfg.index:
+                stages.append(Stage("index", _make_index(), workers=1, batch_size=cfg.insert_batch_size))
+        return stages
+
+    def run(self, producers: Iterable[Producer]) -> IngestionReport:
+        """
+        producers: callables returning an iterable of RawJob (e.g. a scraper
+        generator). Each producer runs on its own fetch thread.
+        """
+        cfg = self.config
+        producers = list(producers)
+        started = time.perf_counter()
+
+        executor = ProcessPoolExecutor(max_workers=cfg.clean_workers) if cfg.use_process_pool else None
+        try:
+            stages = self._build_stages(executor)
+            queues = [queue.Queue(maxsize=cfg.queue_size) for _ in stages]
+            for i, stage in enumerate(stages):
+                stage.inbox = queues[i]
+                stage.outbox = queues[i + 1] if i + 1 < len(queues) else None
+
+            results: List[Dict] = []
+            last = stages[-1]
+            last_func = last.func
+
+            def collect(batch: List) -> List:
+                out = last_func(batch)
+                results.extend(out)
+                return out
+
+            last.func = collect
+
+            fetch_stats = StageStats("fetch", workers=min(cfg.fetch_workers, max(len(producers), 1)))
+            fetch_stats.started_at = time.perf_counter()
+            fetch_lock = threading.Lock()
+            pending = queue.Queue()
+            for p in producers:
+                pending.put(p)
+
+            def fetch_worker() -> None:
+                while True:
+                    try:
+                        producer = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        for raw in producer():
+                            queues[0].put(raw)
+                            with fetch_lock:
+                                fetch_stats.items_in += 1
+                                fetch_stats.items_out += 1
+                    except Exception as e:
+                        with fetch_lock:
+                            fetch_stats.errors += 1
+                        logger.error(f"[Ingestion] fetch failed: {e}")
+
+            threads: List[threading.Thread] = []
+            for stage in stages:
+                threads.extend(stage.start(cfg.batch_linger))
+
+            fetchers = [
+                threading.Thread(target=fetch_worker, name=f"ingest-fetch-{i}", daemon=True)
+                for i in range(fetch_stats.workers)
+            ]
+            for t in fetchers:
+                t.start()
+            for t in fetchers:
+                t.join()
+            fetch_stats.finished_at = time.perf_counter()
+            queues[0].put(_DONE)
+
+            for t in threads:
+                t.join()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        report = IngestionReport(
+            stages=[fetch_stats] + [s.stats for s in stages],
+            elapsed=time.perf_counter() - started,
+            inserted_ids=[j["id"] for j in results if j.get("id") is not None],
+        )
+        logger.info(f"[Ingestion] {report.summary()}")
+        return report
+
+
+def registry_producers(query: str, limit: int = 50, names: Optional[Iterable[str]] = None) -> List[Producer]:
+    """One producer per job source (default: scrapers.registry.default_sources())."""
+    from scrapers.registry import default_sources, get_source
+
+    sources = [get_source(n) for n in names] if names is not None else default_sources()
+    return [lambda s=s: s.fetch_jobs(query, limit) for s in sources]
+
+
+def ingest(
+    query: str,
+    limit: int = 50,
+    sources: Optional[Iterable[str]] = None,
+    config: Optional[IngestionConfig] = None,
+) -> IngestionReport:
+    """Fetch `query` from the registered sources and run the full pipeline."""
+    return IngestionPipeline(config).run(registry_producers(query, limit, sources))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the job ingestion pipeline.")
+    parser.add_argument("--query", default="python")
+    parser.add_argument("--limit", type=int, default=50, help="max jobs per source")
+    parser.add_argument("--sources", nargs="*", default=None)
+    parser.add_argument("--embed", action="store_true")
+    parser.add_argument("--index", action="store_true")
+    parser.add_argument("--no-process-pool", action="store_true")
+    args = parser.parse_args()
+
+    cfg = IngestionConfig(embed=args.embed, index=args.index, use_process_pool=not args.no_process_pool)
+    print(ingest(args.query, args.limit, args.sources, cfg).summary())
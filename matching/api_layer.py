@@ -4,10 +4,10 @@ import sqlite3
 from typing import Dict, List
 
 from app.main import DB_PATH  # reuse your existing DB path
-from core.llm_client import CandidateProfile, JobPosting
-from matching.embeddings import embed_candidate, embed_job
-from matching.scorer import (build_features,  # we already defined these
-                             score_job)
+from database import swipe_bitmap
+from matching.scorer import classify_match
+from ml import interaction_logger
+from ml.ranking import default_engine
 
 
 class MatchingAPI:
@@ -16,8 +16,7 @@ class MatchingAPI:
 
     FastAPI routes should call this instead of doing:
     - raw sqlite
-    - embeddings
-    - manual feature logic
+    - manual feature logic (features and scores come from ml/ranking.py)
     directly in the route handler.
     """
 
@@ -29,31 +28,6 @@ class MatchingAPI:
         conn.row_factory = sqlite3.Row
         return conn
 
-    # --------- Helpers to build models ---------
-
-    def _build_candidate_from_user(self, user: Dict) -> CandidateProfile:
-        return CandidateProfile(
-            name=user.get("name") or "",
-            email=user["email"],
-            phone=user.get("phone") or "",
-            summary=user.get("resume_text") or "",
-            skills=[s.strip() for s in (user.get("skills") or "").split(",")] if user.get("skills") else [],
-            experience=str(user.get("experience_years") or ""),
-            education="",
-            raw_text=user.get("resume_text") or "",
-            location=user.get("preferred_location") or "",
-        )
-
-    def _build_job_from_row(self, row: Dict) -> JobPosting:
-        return JobPosting(
-            title=row.get("title") or "",
-            company=row.get("company") or "",
-            location=row.get("location") or "",
-            seniority=row.get("seniority") or "",
-            skills=[s.strip() for s in (row.get("skills") or "").split(",")] if row.get("skills") else [],
-            description=row.get("description") or "",
-        )
-
     # --------- Public API: Job Feed ---------
 
     def get_job_feed_for_user(self, user: Dict, limit: int = 20) -> List[Dict]:
@@ -72,8 +46,9 @@ class MatchingAPI:
             """
             SELECT j.*
             FROM jobs j
-            WHERE j.id NOT IN (
-                SELECT job_id FROM user_swipes WHERE user_id = ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_swipes us
+                WHERE us.user_id = ? AND us.job_id = j.id
             )
             ORDER BY j.created_at DESC
             LIMIT ?
@@ -86,52 +61,11 @@ class MatchingAPI:
         if not job_rows:
             return []
 
-        # 2) Build candidate + embedding once
-        candidate = self._build_candidate_from_user(user)
-        cand_vec = embed_candidate(candidate)
-
-        enriched: List[Dict] = []
-
-        for jr in job_rows:
-            job = self._build_job_from_row(jr)
-            job_vec = embed_job(job)
-
-            cand_dict: Dict[str, object] = {
-                "skills": candidate.skills,
-                "experience_years": user.get("experience_years") or 0,
-                "location": candidate.location,
-            }
-            job_dict: Dict[str, object] = {
-                "skills": job.skills,
-                "min_experience": 0,  # TODO: use real field when you add it
-                "location": job.location,
-            }
-
-            features = build_features(
-                candidate=cand_dict,
-                job=job_dict,
-                cand_vec=cand_vec,
-                job_vec=job_vec,
-            )
-            scored = score_job(
-                candidate=cand_dict,
-                job=job_dict,
-                cand_vec=cand_vec,
-                job_vec=job_vec,
-            )
-
-            enriched.append(
-                {
-                    **jr,
-                    "skills": job.skills,
-                    "match_probability": scored["probability"],
-                    "match_label": scored["label"],
-                    "match_features": scored["features"],
-                }
-            )
-
-        # 3) Sort by ML probability (best first)
-        enriched.sort(key=lambda x: x["match_probability"], reverse=True)
+        # 2) Features for all jobs in one batch, scored by the served model
+        enriched = default_engine().rank(user, job_rows)
+        for job in enriched:
+            job["skills"] = [s.strip() for s in (job.get("skills") or "").split(",")] if job.get("skills") else []
+            job["match_label"] = classify_match(job["match_probability"])
 
         return enriched
 
@@ -140,7 +74,9 @@ class MatchingAPI:
     def record_swipe_and_log_interaction(self, user: Dict, job_id: int, action: str) -> None:
         """
         - Stores swipe in user_swipes
-        - Logs ML features in interactions table
+        - Queues ML feature logging (interactions table, feature store);
+          features are the ones the feed served when cached
+          (ml/interaction_logger.py), so no embedding call happens here
         """
         if action not in ("apply", "save", "skip"):
             raise ValueError("Invalid action")
@@ -160,61 +96,13 @@ class MatchingAPI:
         # 2) Fetch job row
         cur.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
         row = cur.fetchone()
+        conn.commit()
+        conn.close()
         if not row:
-            conn.commit()
-            conn.close()
             raise ValueError("Job not found")
 
-        job_row = dict(row)
-        candidate = self._build_candidate_from_user(user)
-        job = self._build_job_from_row(job_row)
-
-        cand_vec = embed_candidate(candidate)
-        job_vec = embed_job(job)
-
-        cand_dict: Dict[str, object] = {
-            "skills": candidate.skills,
-            "experience_years": user.get("experience_years") or 0,
-            "location": candidate.location,
-        }
-        job_dict: Dict[str, object] = {
-            "skills": job.skills,
-            "min_experience": 0,
-            "location": job.location,
-        }
-
-        features = build_features(
-            candidate=cand_dict,
-            job=job_dict,
-            cand_vec=cand_vec,
-            job_vec=job_vec,
-        )
-
-        label = 1 if action in ("apply", "save") else 0
-
-        # 3) Insert into interactions
-        cur.execute(
-            """
-            INSERT INTO interactions (
-                user_id,
-                job_id,
-                semantic_sim,
-                skill_overlap,
-                exp_gap,
-                location_match,
-                label
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user["id"],
-                job_id,
-                float(features.get("semantic_sim", 0.0)),
-                float(features.get("skill_overlap", 0.0)),
-                float(features.get("exp_gap", 0.0)),
-                float(features.get("location_match", 0.0)),
-                int(label),
-            ),
-        )
+        # 3) Features -> interactions, in the background
+        interaction_logger.interaction_logger.submit(user["id"], job_id, action, user=user, job=dict(row))
 
-        conn.commit()
-        conn.close()
+        if swipe_bitmap.swipe_bitmap is not None:
+            swipe_bitmap.swipe_bitmap.mark(user["id"], job_id)
@@ -1,25 +1,15 @@
 # matching/scorer.py
+"""
+Small scoring helpers shared by the matching layer.
 
-from typing import Dict, List, Sequence, Optional , Any
-import numpy as np
-import pickle
-import os
-
-# Path where the trained ML model (e.g. LogisticRegression) will be stored.
-# For now, if the file doesn't exist, we fall back to a heuristic.
-MODEL_PATH = os.path.join("ml", "match_model.pkl")
+Match probabilities come from the ranking engine (ml/ranking.py), which
+serves the one model in the match registry; this module only keeps the
+vector/skill utilities and the label buckets shown in the UI.
+"""
 
-# Global model object (loaded once)
-MODEL: Optional[Any] = None
+from typing import List, Sequence
 
-if os.path.exists(MODEL_PATH):
-    try:
-        with open(MODEL_PATH, "rb") as f:
-            MODEL = pickle.load(f)
-    except Exception:
-        MODEL = None  # If loading fails, just fall back to heuristic
-else:
-    MODEL = None
+import numpy as np
 
 
 # ---------------------------------------------------------
@@ -51,69 +41,6 @@ def skill_overlap(candidate_skills: List[str], job_skills: List[str]) -> float:
     return len(set(candidate_skills) & set(job_skills)) / len(job_skills)
 
 
-# ---------------------------------------------------------
-# ML FEATURE BUILDER
-# ---------------------------------------------------------
-
-def build_features(
-    candidate: Dict,
-    job: Dict,
-    cand_vec: Sequence[float],
-    job_vec: Sequence[float],
-) -> Dict[str, float]:
-    """
-    Extract structured features for the ML model.
-    Expects:
-      candidate: dict with keys like "skills", "experience_years", "location"
-      job:       dict with keys like "skills", "min_experience", "location"
-      cand_vec, job_vec: embedding vectors (same dimension)
-    """
-    features: Dict[str, float] = {}
-
-    features["semantic_sim"] = cosine_similarity(cand_vec, job_vec)
-    features["skill_overlap"] = skill_overlap(
-        candidate.get("skills", []),
-        job.get("skills", []),
-    )
-
-    cand_exp = float(candidate.get("experience_years", 0) or 0)
-    job_min_exp = float(job.get("min_experience", 0) or 0)
-    features["exp_gap"] = cand_exp - job_min_exp
-
-    features["location_match"] = float(
-        1.0 if candidate.get("location") == job.get("location") else 0.0
-    )
-
-    return features
-
-
-FEATURE_ORDER = ["semantic_sim", "skill_overlap", "exp_gap", "location_match"]
-
-
-# ---------------------------------------------------------
-# ML SCORING ENGINE
-# ---------------------------------------------------------
-
-def ml_predict_probability(features: Dict[str, float]) -> float:
-    """
-    Predict match probability using trained ML model.
-    Falls back to a simple heuristic if model isn't available.
-    """
-    # If we don't have a trained model yet, use a heuristic
-    if MODEL is None:
-        # 70% weight on semantic similarity, 30% on skill overlap
-        return (
-            features.get("semantic_sim", 0.0) * 0.7
-            + features.get("skill_overlap", 0.0) * 0.3
-        )
-
-    # Build feature vector in consistent order
-    x = [[features[f] for f in FEATURE_ORDER]]
-    # We expect model to have predict_proba
-    proba = MODEL.predict_proba(x)[0][1]
-    return float(proba)
-
-
 def classify_match(prob: float) -> str:
     """
     Convert probability in [0,1] into a human-readable label.
@@ -124,39 +51,3 @@ def classify_match(prob: float) -> str:
         return "Potential"
     else:
         return "Challenging"
-
-
-# ---------------------------------------------------------
-# FINAL SCORING PIPELINE
-# ---------------------------------------------------------
-
-def score_job(
-    candidate: Dict,
-    job: Dict,
-    cand_vec: Sequence[float],
-    job_vec: Sequence[float],
-) -> Dict[str, object]:
-    """
-    Main scoring entry point.
-
-    Returns a dict:
-        {
-            "probability": float,          # 0–1
-            "label": "Excellent|Potential|Challenging",
-            "features": {
-                "semantic_sim": float,
-                "skill_overlap": float,
-                "exp_gap": float,
-                "location_match": float
-            }
-        }
-    """
-    features = build_features(candidate, job, cand_vec, job_vec)
-    prob = ml_predict_probability(features)
-    label = classify_match(prob)
-
-    return {
-        "probability": prob,
-        "label": label,
-        "features": features,
-    }
\ No newline at end of file
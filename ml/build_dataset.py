@@ -1,33 +1,203 @@
 # ml/build_dataset.py
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from database.connection import get_db_connection
-from ml.features import extract_job_features
+from ml.features import FEATURE_KEYS, _norm, _parse_skills
 
+# Rows featurized at a time; bounds memory when retraining on millions of swipes
+CHUNK_SIZE = 200_000
 
-def _row_to_user(row) -> dict:
-    return {
-        "skills": row["user_skills"],
-        "preferred_location": row["user_preferred_location"],
-        "preferred_seniority": row["user_preferred_seniority"],
-    }
+# Featurized dataset cache for repeated training runs (cached_dataset)
+DATASET_CACHE_DIR = Path("ml/models/dataset_cache")
+
+DATASET_QUERY = """
+    SELECT
+        us.user_id,
+        us.job_id,
+        us.action,
+        u.skills              AS user_skills,
+        u.preferred_location  AS user_preferred_location,
+        u.preferred_seniority AS user_preferred_seniority,
+        j.title               AS job_title,
+        j.location            AS job_location,
+        j.skills              AS job_skills,
+        j.title_norm          AS job_title_norm,
+        j.location_norm       AS job_location_norm,
+        j.description_length  AS job_description_length,
+        CASE WHEN j.description_length IS NULL THEN j.description END AS job_description,
+        j.title_length        AS job_title_length
+    FROM user_swipes us
+    JOIN users u ON us.user_id = u.id
+    JOIN jobs j  ON us.job_id = j.id
+    WHERE us.action IN ('apply', 'save', 'skip')
+"""
+
+
+# ---------------------------------------------------------
+# Column-wise featurizer (same values as ml.features.extract_job_features)
+#
+# Swipe rows repeat the same few users and jobs many times, so every
+# string is normalised / parsed once per distinct value (pd.factorize)
+# with the scalar helpers from ml.features, and substring tests run once
+# per distinct (needle, haystack) pair. Everything per-row is NumPy.
+# ---------------------------------------------------------
+
+def _factorize(values: pd.Series) -> Tuple[np.ndarray, list]:
+    """Row -> distinct-value codes; missing values become None."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False, sort=False)
+    return codes, [u if isinstance(u, str) or not (u is None or u != u) else None for u in uniques]
+
+
+def _normalized(df: pd.DataFrame, raw: str, stored: str = "") -> Tuple[np.ndarray, list]:
+    """Codes and distinct values of _norm(df[raw]), preferring the precomputed column."""
+    if stored and stored in df:
+        filled = df[stored].astype(object).where(df[stored].notna(), None)
+        missing = filled.isna().to_numpy()
+        if missing.any():
+            codes, uniques = _factorize(df.loc[missing, raw])
+            norm = [_norm(u) for u in uniques]
+            filled[missing] = np.asarray(norm, dtype=object)[codes]
+        codes, uniques = _factorize(filled)
+        return codes, [u or "" for u in uniques]
+    codes, uniques = _factorize(df[raw])
+    return codes, [_norm(u) for u in uniques]
+
+
+def _skill_matrix(values: pd.Series, vocab: Dict[str, int]) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """
+    Parse each distinct skills string once. Returns the row -> distinct
+    code mapping and a binary (distinct x vocab) CSR matrix.
+    """
+    codes, uniques = _factorize(values)
+    token_ids = [[vocab.setdefault(t, len(vocab)) for t in _parse_skills(u)] for u in uniques]
+    indptr = np.zeros(len(token_ids) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(t) for t in token_ids])
+    indices = np.fromiter((i for t in token_ids for i in t), dtype=np.int64, count=int(indptr[-1]))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), indices, indptr),
+        shape=(len(token_ids), max(len(vocab), 1)),
+    )
+    return codes, matrix
+
+
+def _contains(needle_codes: np.ndarray, needles: list, hay_codes: np.ndarray, hays: list) -> np.ndarray:
+    """needles[i] in hays[i] per row (False for empty needles), tested once per distinct pair."""
+    if len(needle_codes) == 0:
+        return np.zeros(0, dtype=bool)
+    pairs, distinct = pd.factorize(needle_codes.astype(np.int64) * len(hays) + hay_codes)
+    needle_of = np.asarray(needles, dtype=object)[distinct // len(hays)]
+    hay_of = np.asarray(hays, dtype=object)[distinct % len(hays)]
+    hits = np.fromiter((n in h for n, h in zip(needle_of, hay_of)), dtype=bool, count=len(distinct))
+    hits &= np.fromiter((bool(n) for n in needles), dtype=bool, count=len(needles))[distinct // len(hays)]
+    return hits[pairs]
+
+
+def _length(df: pd.DataFrame, raw: str, stored: str) -> np.ndarray:
+    if stored in df:
+        lengths = df[stored].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    else:
+        lengths = np.full(len(df), np.nan)
+    missing = np.isnan(lengths)
+    if missing.any():
+        lengths[missing] = df.loc[missing, raw].fillna("").astype(str).str.len().to_numpy(dtype=np.float64)
+    return lengths
+
+
+def _skill_tokens(u_matrix: sparse.csr_matrix, u_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Explode each row's user skills into (row, vocab id) pairs."""
+    sizes = np.diff(u_matrix.indptr)[u_codes]
+    pair_rows = np.repeat(np.arange(len(u_codes)), sizes)
+    offsets = np.arange(len(pair_rows)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return pair_rows, u_matrix.indices[np.repeat(u_matrix.indptr[u_codes], sizes) + offsets]
+
+
+# Feature groups: each takes a user/job pair frame (see featurize_frame)
+# and returns some of FEATURE_KEYS. ml/ranking.py registers them as
+# feature providers, so training and serving share this code.
+
+def skill_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """skill_overlap, skill_jaccard and title_keyword_match."""
+    n = len(df)
+    vocab: Dict[str, int] = {}
+    u_codes, u_matrix = _skill_matrix(df["user_skills"], vocab)
+    j_codes, j_matrix = _skill_matrix(df["job_skills"], vocab)
+    u_matrix.resize((u_matrix.shape[0], max(len(vocab), 1)))
+    j_matrix.resize((j_matrix.shape[0], max(len(vocab), 1)))
+
+    # Overlap / Jaccard through the shared vocabulary
+    overlap = np.asarray(u_matrix[u_codes].multiply(j_matrix[j_codes]).sum(axis=1), dtype=np.float64).ravel()
+    union = np.diff(u_matrix.indptr)[u_codes] + np.diff(j_matrix.indptr)[j_codes] - overlap
+    jaccard = np.divide(overlap, union, out=np.zeros(n), where=overlap > 0)
+
+    # Any user skill inside the normalised title
+    title_codes, titles = _normalized(df, "job_title", "job_title_norm")
+    pair_rows, pair_tokens = _skill_tokens(u_matrix, u_codes)
+    tokens = [""] * len(vocab)
+    for token, i in vocab.items():
+        tokens[i] = token
+    hits = _contains(pair_tokens, tokens, title_codes[pair_rows], titles)
+    title_keyword_match = np.zeros(n)
+    title_keyword_match[pair_rows[hits]] = 1.0
+
+    return {"skill_overlap": overlap, "skill_jaccard": jaccard, "title_keyword_match": title_keyword_match}
+
+
+def location_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    loc_codes, locs = _normalized(df, "job_location", "job_location_norm")
+    match = _contains(*_normalized(df, "user_preferred_location"), loc_codes, locs)
+    return {"location_match": match.astype(np.float64)}
 
 
-def _row_to_job(row) -> dict:
+def seniority_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    title_codes, titles = _normalized(df, "job_title", "job_title_norm")
+    match = _contains(*_normalized(df, "user_preferred_seniority"), title_codes, titles)
+    return {"seniority_match": match.astype(np.float64)}
+
+
+def length_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
     return {
-        "title": row["job_title"],
-        "company": row["job_company"],
-        "location": row["job_location"],
-        "skills": row["job_skills"],
-        "description": row["job_description"],
+        "description_length": np.minimum(_length(df, "job_description", "job_description_length"), 5000.0),
+        "title_length": np.minimum(_length(df, "job_title", "job_title_length"), 200.0),
     }
 
 
-def build_dataset() -> pd.DataFrame:
+FEATURE_GROUPS = (skill_features, location_features, seniority_features, length_features)
+
+
+def featurize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    FEATURE_KEYS for every row of a user/job pair frame, column-wise.
+
+    Expects user_skills, user_preferred_location, user_preferred_seniority,
+    job_title, job_location, job_skills and job_description; the
+    precomputed job_* columns of DATASET_QUERY are used where present.
+    """
+    columns: Dict[str, np.ndarray] = {}
+    for group in FEATURE_GROUPS:
+        columns.update(group(df))
+    return pd.DataFrame(columns, index=df.index)[FEATURE_KEYS]
+
+
+def _label(actions: pd.Series) -> np.ndarray:
+    return actions.isin(("apply", "save")).to_numpy(dtype=np.int64)
+
+
+def _read_chunks(chunk_size: int) -> Iterator[pd.DataFrame]:
+    with get_db_connection() as conn:
+        yield from pd.read_sql_query(DATASET_QUERY, conn, chunksize=chunk_size)
+
+
+def build_dataset(chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
     """
     Build a supervised dataset from user_swipes + users + jobs.
 
@@ -35,40 +205,75 @@ def build_dataset() -> pd.DataFrame:
         1 = positive (apply/save)
         0 = negative (skip)
     """
+    parts = []
+    for chunk in _read_chunks(chunk_size):
+        if chunk.empty:
+            continue
+        feats = featurize_frame(chunk.reset_index(drop=True))
+        feats["label"] = _label(chunk["action"])
+        parts.append(feats)
+
+    if not parts:
+        return pd.DataFrame()  # empty
+
+    return pd.concat(parts, ignore_index=True)
+
+
+# ---------------------------------------------------------
+# On-disk cache of the featurized dataset
+# ---------------------------------------------------------
+
+# Changes whenever a swipe, job or user is added or a swipe is re-labelled
+# (the upsert bumps created_at). Profile edits are not seen: pass refresh.
+FINGERPRINT_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM user_swipes)      AS swipes,
+        (SELECT MAX(id) FROM user_swipes)       AS max_swipe_id,
+        (SELECT MAX(created_at) FROM user_swipes) AS last_swipe_at,
+        (SELECT MAX(id) FROM jobs)              AS max_job_id,
+        (SELECT MAX(id) FROM users)             AS max_user_id
+"""
+
+
+def dataset_fingerprint() -> str:
     with get_db_connection() as conn:
-        df = pd.read_sql_query(
-            """
-            SELECT
-                us.user_id,
-                us.job_id,
-                us.action,
-                u.skills              AS user_skills,
-                u.preferred_location  AS user_preferred_location,
-                u.preferred_seniority AS user_preferred_seniority,
-                j.title               AS job_title,
-                j.company             AS job_company,
-                j.location            AS job_location,
-                j.skills              AS job_skills,
-                j.description         AS job_description
-            FROM user_swipes us
-            JOIN users u ON us.user_id = u.id
-            JOIN jobs j  ON us.job_id = j.id
-            WHERE us.action IN ('apply', 'save', 'skip')
-            """,
-            conn,
-        )
+        row = pd.read_sql_query(FINGERPRINT_QUERY, conn).iloc[0]
+    state = {k: None if pd.isna(v) else str(v) for k, v in row.items()}
+    state["features"] = FEATURE_KEYS
+    state["query"] = DATASET_QUERY
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
 
-    if df.empty:
-        return df  # empty
 
-    rows = []
-    for _, row in df.iterrows():
-        user = _row_to_user(row)
-        job = _row_to_job(row)
-        feats = extract_job_features(user, job)
+def _save_array(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
 
-        label = 1 if row["action"] in ("apply", "save") else 0
-        feats["label"] = label
-        rows.append(feats)
+def cached_dataset(
+    cache_dir: Optional[Path] = None, refresh: bool = False
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    (X, y) for FEATURE_KEYS, memory-mapped read-only from cache_dir
+    (default DATASET_CACHE_DIR) /X.npy and y.npy. Rebuilt (build_dataset) when the database fingerprint has
+    changed since they were written, or with `refresh`. (None, None) if
+    there is no training data.
+    """
+    cache_dir = Path(cache_dir or DATASET_CACHE_DIR)
+    meta_path = cache_dir / "meta.json"
+    fingerprint = dataset_fingerprint()
+    if not refresh and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get("fingerprint") == fingerprint:
+            return np.load(cache_dir / "X.npy", mmap_mode="r"), np.load(cache_dir / "y.npy", mmap_mode="r")
 
-    return pd.DataFrame(rows)
\ No newline at end of file
+    df = build_dataset()
+    if df.empty:
+        return None, None
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    meta_path.unlink(missing_ok=True)  # invalid until both arrays are in place
+    _save_array(cache_dir / "X.npy", df.reindex(columns=FEATURE_KEYS, fill_value=0.0).to_numpy(dtype=np.float64))
+    _save_array(cache_dir / "y.npy", df["label"].to_numpy(dtype=np.int64))
+    meta_path.write_text(json.dumps({"fingerprint": fingerprint, "rows": len(df), "features": FEATURE_KEYS}))
+    return np.load(cache_dir / "X.npy", mmap_mode="r"), np.load(cache_dir / "y.npy", mmap_mode="r")
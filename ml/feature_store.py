@@ -0,0 +1,250 @@
+# ml/feature_store.py
+"""
+Append-only columnar store of training examples, written at swipe time.
+
+Each swipe is recorded with every ranking feature as computed when it
+happened, the label, and the model version and score served, so
+training, evaluation and analytics read these files instead of
+re-joining user_swipes, users and jobs:
+
+    ml/models/feature_store/
+        dt=2026-10-19/
+            seg-1760860000123-4242-000001/
+                X.npy              float64 (rows, len(features))
+                user_id.npy        int64
+                job_id.npy         int64
+                label.npy          int8   (apply/save = 1, skip = 0)
+                ts.npy             float64 (unix seconds)
+                score.npy          float64 (NaN: no model)
+                model_version.npy  int64  (-1: none / legacy file)
+                schema.json        {"features": [...], "rows": n}
+
+Swipes reach it through the background interaction logger
+(ml/interaction_logger.py). Rows are buffered per process and flushed as a new segment every
+FEATURE_STORE_FLUSH_ROWS rows or FEATURE_STORE_FLUSH_SECONDS (checked on
+append) and at exit. A segment is written to a dot-directory and
+renamed into place, so readers never see a partial one. Segments are
+never modified; compact() merges a partition's segments into one (run
+it offline: a reader listing the partition meanwhile can see both).
+
+Readers memory-map the .npy files:
+
+    for seg in FeatureStore(root).segments(): seg["X"], seg["label"], ...
+    X, y, users = FeatureStore(root).training_arrays()   # latest label per (user, job)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import (
+    FEATURE_STORE,
+    FEATURE_STORE_DIR,
+    FEATURE_STORE_FLUSH_ROWS,
+    FEATURE_STORE_FLUSH_SECONDS,
+)
+from app.core.logging import logger
+from ml.features import FEATURE_KEYS, label_for
+
+COLUMNS = {
+    "user_id": np.int64,
+    "job_id": np.int64,
+    "label": np.int8,
+    "ts": np.float64,
+    "score": np.float64,
+    "model_version": np.int64,
+}
+
+_SEGMENT_SEQ = count(1)
+
+
+class FeatureStore:
+    """Buffered writer and memory-mapped reader for one store directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        features: Sequence[str] = FEATURE_KEYS,
+        flush_rows: int = FEATURE_STORE_FLUSH_ROWS,
+        flush_seconds: float = FEATURE_STORE_FLUSH_SECONDS,
+    ) -> None:
+        self.root = Path(root)
+        self.features = list(features)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._rows: List[Tuple] = []
+        self._first_at = 0.0
+        self._lock = threading.Lock()
+
+    # -----------------------------------------------------
+    # Writing
+    # -----------------------------------------------------
+
+    def append(
+        self,
+        user_id: int,
+        job_id: int,
+        action: str,
+        features: Dict[str, float],
+        score: Optional[float] = None,
+        model_version: Optional[int] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        """Buffer one example; features missing from `features` are stored as 0."""
+        row = (
+            [float(features.get(k, 0.0)) for k in self.features],
+            user_id,
+            job_id,
+            label_for(action),
+            time.time() if ts is None else ts,
+            np.nan if score is None else float(score),
+            -1 if model_version is None else model_version,
+        )
+        with self._lock:
+            if not self._rows:
+                self._first_at = time.monotonic()
+            self._rows.append(row)
+            due = len(self._rows) >= self.flush_rows or time.monotonic() - self._first_at >= self.flush_seconds
+            rows = self._take() if due else None
+        if rows:
+            self._write_segment(rows)
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = self._take()
+        if rows:
+            self._write_segment(rows)
+
+    def _take(self) -> List[Tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def _write_segment(self, rows: List[Tuple]) -> Optional[Path]:
+        columns = list(zip(*rows))
+        arrays = {c: np.asarray(v, dtype=dtype) for (c, dtype), v in zip(COLUMNS.items(), columns[1:])}
+        arrays["X"] = np.asarray(columns[0], dtype=np.float64).reshape(len(rows), len(self.features))
+        now = time.time()
+        return self._write_arrays(self.root / f"dt={datetime.fromtimestamp(now, timezone.utc):%Y-%m-%d}", arrays)
+
+    def _write_arrays(self, partition: Path, arrays: Dict[str, np.ndarray]) -> Optional[Path]:
+        rows = len(arrays["X"])
+        name = f"seg-{int(time.time() * 1000)}-{os.getpid()}-{next(_SEGMENT_SEQ):06d}"
+        try:
+            partition.mkdir(parents=True, exist_ok=True)
+            tmp = partition / f".{name}"
+            tmp.mkdir()
+            for column, values in arrays.items():
+                np.save(tmp / f"{column}.npy", values)
+            (tmp / "schema.json").write_text(json.dumps({"features": self.features, "rows": rows}))
+            os.replace(tmp, partition / name)
+            return partition / name
+        except OSError as e:
+            logger.error(f"[ML] Could not write feature store segment ({rows} rows lost): {e}")
+            return None
+
+    # -----------------------------------------------------
+    # Reading
+    # -----------------------------------------------------
+
+    def segment_paths(self) -> List[Path]:
+        if not self.root.exists():
+            return []
+        return sorted(
+            seg
+            for partition in self.root.glob("dt=*")
+            for seg in partition.iterdir()
+            if seg.is_dir() and not seg.name.startswith(".")
+        )
+
+    def _load_segment(self, path: Path) -> Dict:
+        schema = json.loads((path / "schema.json").read_text())
+        seg = {column: np.load(path / f"{column}.npy", mmap_mode="r") for column in COLUMNS}
+        X = np.load(path / "X.npy", mmap_mode="r")
+        if schema["features"] != self.features:
+            # Written with another feature set: realign by name (copies)
+            index = {k: i for i, k in enumerate(schema["features"])}
+            aligned = np.zeros((len(X), len(self.features)))
+            for j, key in enumerate(self.features):
+                if key in index:
+                    aligned[:, j] = X[:, index[key]]
+            X = aligned
+        seg["X"] = X
+        return seg
+
+    def segments(self) -> Iterator[Dict]:
+        """Each segment's columns, memory-mapped, in the store's feature order."""
+        for path in self.segment_paths():
+            yield {**self._load_segment(path), "path": path}
+
+    def _concat(self, parts: List[Dict]) -> Dict[str, np.ndarray]:
+        columns = {
+            column: np.concatenate([p[column] for p in parts]) if parts else np.empty(0, dtype=dtype)
+            for column, dtype in COLUMNS.items()
+        }
+        columns["X"] = np.concatenate([p["X"] for p in parts]) if parts else np.empty((0, len(self.features)))
+        return columns
+
+    def read(self, since: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """All columns over every segment (concatenated), optionally from a unix time on."""
+        columns = self._concat(list(self.segments()))
+        if since is not None:
+            keep = columns["ts"] >= since
+            columns = {k: v[keep] for k, v in columns.items()}
+        return columns
+
+    def frame(self, since: Optional[float] = None) -> pd.DataFrame:
+        """One row per stored swipe, features as columns; for analytics."""
+        columns = self.read(since)
+        df = pd.DataFrame(columns.pop("X"), columns=self.features)
+        for column, values in columns.items():
+            df[column] = values
+        return df
+
+    def training_arrays(self, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (X, y, user_id) keeping only the latest example per (user, job), as a
+        re-labelled swipe replaces the earlier one in user_swipes.
+        """
+        columns = self.read(since)
+        if not len(columns["ts"]):
+            return columns["X"], columns["label"].astype(np.int64), columns["user_id"]
+        order = np.lexsort((columns["ts"], columns["job_id"], columns["user_id"]))
+        pairs = np.stack([columns["user_id"][order], columns["job_id"][order]], axis=1)
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = (pairs[1:] != pairs[:-1]).any(axis=1)
+        keep = np.sort(order[last])
+        return columns["X"][keep], columns["label"][keep].astype(np.int64), columns["user_id"][keep]
+
+    def compact(self, partition: Optional[str] = None) -> int:
+        """
+        Merge each partition's segments (or just `partition`, e.g. "dt=2026-10-19")
+        into one. Returns the number of segments removed.
+        """
+        removed = 0
+        for part in sorted(self.root.glob(partition or "dt=*")):
+            paths = [p for p in self.segment_paths() if p.parent == part]
+            if len(paths) < 2:
+                continue
+            merged = self._write_arrays(part, self._concat([self._load_segment(p) for p in paths]))
+            if merged is None:
+                continue
+            for path in paths:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+feature_store: Optional[FeatureStore] = FeatureStore(Path(FEATURE_STORE_DIR)) if FEATURE_STORE else None
+if feature_store is not None:
+    atexit.register(feature_store.flush)
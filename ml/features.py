@@ -28,6 +28,11 @@ def _norm(s: Optional[str]) -> str:
     return " ".join(str(s or "").split()).lower()
 
 
+def label_for(action: str) -> int:
+    """Training label of a swipe action: 1 for apply/save, 0 for skip."""
+    return 1 if action in ("apply", "save") else 0
+
+
 FEATURE_KEYS: List[str] = [
     "skill_overlap",
     "skill_jaccard",
@@ -39,6 +44,37 @@ FEATURE_KEYS: List[str] = [
 ]
 
 
+# User-independent job values, stored on the jobs row at insert
+# (database/db_manager.insert_jobs_bulk) so scoring only reads them.
+JOB_STATIC_COLUMNS: List[str] = [
+    "clean_description",
+    "title_norm",
+    "location_norm",
+    "description_length",
+    "title_length",
+]
+
+
+def job_static_columns(job: Dict) -> Dict:
+    """Compute JOB_STATIC_COLUMNS for a job as it is stored."""
+    from scrapers.html_text import html_to_text
+
+    desc = job.get("description") or ""
+    title = job.get("title") or ""
+    return {
+        "clean_description": html_to_text(desc),
+        "title_norm": _norm(title),
+        "location_norm": _norm(job.get("location")),
+        "description_length": len(desc),
+        "title_length": len(title),
+    }
+
+
+def _stored(job: Dict, key: str, compute):
+    value = job.get(key)
+    return compute() if value is None else value
+
+
 def extract_job_features(user: Dict, job: Dict) -> Dict[str, float]:
     """
     Extract numeric features for (user, job) pair.
@@ -54,6 +90,9 @@ def extract_job_features(user: Dict, job: Dict) -> Dict[str, float]:
         - location
         - skills (comma string or list)
         - description
+
+    Precomputed title_norm / location_norm / description_length /
+    title_length are used when present (jobs read from the database).
     """
     user_skills = _parse_skills(user.get("skills"))
     job_skills = _parse_skills(job.get("skills"))
@@ -69,12 +108,12 @@ def extract_job_features(user: Dict, job: Dict) -> Dict[str, float]:
 
     # 2) Location match
     user_loc = _norm(user.get("preferred_location"))
-    job_loc = _norm(job.get("location"))
+    job_loc = _stored(job, "location_norm", lambda: _norm(job.get("location")))
     location_match = 1.0 if user_loc and user_loc in job_loc else 0.0
 
     # 3) Seniority match
     user_sen = _norm(user.get("preferred_seniority"))
-    title = _norm(job.get("title"))
+    title = _stored(job, "title_norm", lambda: _norm(job.get("title")))
     seniority_match = 1.0 if user_sen and user_sen in title else 0.0
 
     # 4) Title keywords vs skills
@@ -86,9 +125,8 @@ def extract_job_features(user: Dict, job: Dict) -> Dict[str, float]:
                 break
 
     # 5) Text lengths
-    desc = job.get("description") or ""
-    desc_len = len(desc)
-    title_len = len(job.get("title") or "")
+    desc_len = _stored(job, "description_length", lambda: len(job.get("description") or ""))
+    title_len = _stored(job, "title_length", lambda: len(job.get("title") or ""))
 
     features: Dict[str, float] = {
         "skill_overlap": float(overlap),
@@ -0,0 +1,305 @@
+# ml/interaction_logger.py
+"""
+Swipe feature logging off the request path.
+
+The ranking engine remembers the features, score and model version of
+every card it serves (ServedFeatures, keyed by (user, job)). A swipe only
+queues (user, job, action); InteractionLogger's worker thread then, per
+batch of up to INTERACTION_LOG_BATCH swipes:
+
+  - takes each swipe's features from the served cache, or recomputes the
+    misses in one engine batch per user (the embedding provider reuses
+    its cached embeddings),
+  - computes the INTERACTION_FEATURES columns no enabled ranking provider
+    served (semantic_sim without the embedding provider, exp_gap) with
+    ml.ranking.compute_features; a provider that fails is logged and
+    leaves its column NULL,
+  - inserts the requested `interactions` rows in one transaction,
+  - appends every swipe to the feature store, if enabled (ml/feature_store.py).
+
+So swipe latency depends on neither the embedding provider nor these
+writes. user_swipes is still written by the request itself; what is lost
+if the process dies with swipes queued is training data only. When the
+queue is full (INTERACTION_LOG_QUEUE), swipes are dropped with a warning
+rather than blocking the request.
+
+    interaction_logger.submit(user_id, job_id, "apply")
+    interaction_logger.flush()   # wait until everything queued is written
+"""
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import (
+    INTERACTION_LOG_BATCH,
+    INTERACTION_LOG_LINGER,
+    INTERACTION_LOG_QUEUE,
+    SERVED_FEATURES_CACHE_SIZE,
+)
+from app.core.logging import logger
+from database.connection import get_db_connection
+from database.queries import execute_many, fetch_one
+from ml import feature_store
+from ml.features import label_for
+
+Served = Tuple[Dict[str, float], Optional[float], Optional[int]]
+
+# Feature columns of the interactions table
+INTERACTION_FEATURES = ("semantic_sim", "skill_overlap", "exp_gap", "location_match")
+
+
+class ServedFeatures:
+    """Bounded LRU of (user_id, job_id) -> (features, score, model version) as served."""
+
+    def __init__(self, maxsize: int = SERVED_FEATURES_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, int], Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(
+        self,
+        user_id: Optional[int],
+        job_ids: Sequence[Optional[int]],
+        features: pd.DataFrame,
+        scores: Optional[np.ndarray],
+        model_version: Optional[int],
+    ) -> None:
+        """Record one served batch; `scores` is None when no model scored it."""
+        if user_id is None or self.maxsize <= 0 or not len(features):
+            return
+        names = tuple(features.columns)
+        rows = features.to_numpy(dtype=np.float64).tolist()
+        served = scores.tolist() if scores is not None else [None] * len(rows)
+        with self._lock:
+            for job_id, row, score in zip(job_ids, rows, served):
+                if job_id is None:
+                    continue
+                key = (user_id, job_id)
+                self._entries[key] = (names, row, score, model_version)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id: int, job_id: int) -> Optional[Served]:
+        with self._lock:
+            entry = self._entries.get((user_id, job_id))
+        if entry is None:
+            return None
+        names, row, score, version = entry
+        return dict(zip(names, row)), score, version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class Swipe:
+    user_id: int
+    job_id: int
+    action: str
+    user: Optional[Dict] = None  # rows, when the caller already has them
+    job: Optional[Dict] = None
+    interaction: bool = True  # also insert an interactions row
+
+
+_STOP = object()
+
+
+class InteractionLogger:
+    """One daemon thread writing queued swipes' features in batches."""
+
+    def __init__(
+        self,
+        served: ServedFeatures,
+        batch_size: int = INTERACTION_LOG_BATCH,
+        linger: float = INTERACTION_LOG_LINGER,
+        maxsize: int = INTERACTION_LOG_QUEUE,
+    ) -> None:
+        self.served = served
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(
+        self,
+        user_id: int,
+        job_id: int,
+        action: str,
+        user: Optional[Dict] = None,
+        job: Optional[Dict] = None,
+        interaction: bool = True,
+    ) -> None:
+        """Queue one swipe; never blocks."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(Swipe(user_id, job_id, action, user, job, interaction))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"[ML] Interaction log queue full, dropped swipe {user_id}/{job_id}")
+
+    def flush(self) -> None:
+        """Block until every swipe queued so far is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued and stop the worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="interaction-logger", daemon=True)
+                self._thread.start()
+
+    # -----------------------------------------------------
+    # Worker
+    # -----------------------------------------------------
+
+    def _next_batch(self) -> Tuple[List[Swipe], bool]:
+        item = self._queue.get()
+        if item is _STOP:
+            self._queue.task_done()
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.task_done()
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    logger.error(f"[ML] Interaction logging failed for {len(batch)} swipes: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            if stop:
+                return
+
+    def write(self, batch: List[Swipe]) -> None:
+        """Features for every swipe in `batch`, written to interactions and the feature store."""
+        examples: List[Tuple[Swipe, Served]] = []
+        misses: List[Swipe] = []
+        for swipe in batch:
+            served = self.served.get(swipe.user_id, swipe.job_id)
+            if served is not None:
+                examples.append((swipe, served))
+            else:
+                misses.append(swipe)
+        if misses:
+            examples.extend(self._compute(misses))
+
+        logged = [(swipe, features) for swipe, (features, _, _) in examples if swipe.interaction]
+        extra = self._interaction_features(logged)
+        rows = [
+            {
+                "user_id": swipe.user_id,
+                "job_id": swipe.job_id,
+                **{name: features.get(name, more.get(name)) for name in INTERACTION_FEATURES},
+                "label": label_for(swipe.action),
+            }
+            for (swipe, features), more in zip(logged, extra)
+        ]
+        if rows:
+            with get_db_connection() as conn:
+                execute_many(conn, "interactions.insert", rows)
+                conn.commit()
+
+        store = feature_store.feature_store
+        if store is not None:
+            for swipe, (features, score, version) in examples:
+                store.append(swipe.user_id, swipe.job_id, swipe.action, features, score=score, model_version=version)
+
+    @staticmethod
+    def _by_user(swipes: List[Swipe]) -> Dict[int, List[Swipe]]:
+        """Swipes grouped by user, with user and job rows loaded; swipes on unknown rows are dropped."""
+        missing = [s for s in swipes if s.user is None or s.job is None]
+        if missing:
+            with get_db_connection() as conn:
+                for s in missing:
+                    if s.user is None:
+                        row = fetch_one(conn, "users.by_id", id=s.user_id)
+                        s.user = dict(row) if row else None
+                    if s.job is None:
+                        row = fetch_one(conn, "jobs.by_id", id=s.job_id)
+                        s.job = dict(row) if row else None
+
+        by_user: Dict[int, List[Swipe]] = {}
+        for s in swipes:
+            if s.user is not None and s.job is not None:
+                by_user.setdefault(s.user_id, []).append(s)
+        return by_user
+
+    def _interaction_features(self, logged: List[Tuple[Swipe, Dict[str, float]]]) -> List[Dict[str, float]]:
+        """Per logged swipe, the INTERACTION_FEATURES its served features lack."""
+        from ml.ranking import compute_features
+
+        extra: List[Dict[str, float]] = [{} for _ in logged]
+        lacking = {
+            i: [name for name in INTERACTION_FEATURES if name not in features]
+            for i, (_, features) in enumerate(logged)
+        }
+        lacking = {i: names for i, names in lacking.items() if names}
+        if not lacking:
+            return extra
+        index = {id(logged[i][0]): i for i in lacking}
+        for group in self._by_user([logged[i][0] for i in lacking]).values():
+            names = sorted({name for s in group for name in lacking[index[id(s)]]})
+            computed = compute_features(group[0].user, [s.job for s in group], names).to_dict("records")
+            for s, values in zip(group, computed):
+                extra[index[id(s)]] = values
+        return extra
+
+    def _compute(self, swipes: List[Swipe]) -> List[Tuple[Swipe, Served]]:
+        """Features for swipes whose card was not served from this process: one batch per user."""
+        from ml.ranking import default_engine
+
+        by_user = self._by_user(swipes)
+
+        engine = default_engine()
+        out: List[Tuple[Swipe, Served]] = []
+        for group in by_user.values():
+            probs, feats, current = engine.score_served(group[0].user, [s.job for s in group], observe=False)
+            version = current.version if current is not None else None
+            for s, p, features in zip(group, probs, feats.to_dict("records")):
+                out.append((s, (features, float(p) if current is not None else None, version)))
+        return out
+
+
+served_features = ServedFeatures()
+interaction_logger = InteractionLogger(served_features)
+atexit.register(interaction_logger.close)
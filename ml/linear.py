@@ -0,0 +1,138 @@
+# ml/linear.py
+"""
+Pickle-free logistic model for serving.
+
+A fitted logistic regression is just coefficients, an intercept, the
+feature order and (optionally) the standardisation it was trained with.
+LinearModel holds those as NumPy arrays and scores with
+sigmoid(((X - mean) / scale) @ w + b), so the API process never imports
+sklearn or unpickles an estimator. The artifact is a few hundred bytes of
+JSON:
+
+    {"format": "linear/v1", "feature_order": [...], "coef": [...],
+     "intercept": -1.2, "mean": [...] | null, "scale": [...] | null}
+
+Export an existing pickled model into the match registry:
+    python -m ml.linear [ml/models/logreg_job_match.pkl]
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+FORMAT = "linear/v1"
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    # Split by sign so exp never overflows
+    out = np.empty_like(z)
+    pos = z >= 0
+    out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+    ez = np.exp(z[~pos])
+    out[~pos] = ez / (1.0 + ez)
+    return out
+
+
+class LinearModel:
+    """Logistic regression inference in pure NumPy; predict_proba matches sklearn's."""
+
+    def __init__(
+        self,
+        coef: Sequence[float],
+        intercept: float,
+        feature_order: Sequence[str],
+        mean: Optional[Sequence[float]] = None,
+        scale: Optional[Sequence[float]] = None,
+    ) -> None:
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.feature_order: List[str] = list(feature_order)
+        if len(self.coef) != len(self.feature_order):
+            raise ValueError(f"{len(self.coef)} coefficients for {len(self.feature_order)} features")
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float64)
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float64)
+
+        # Fold the standardisation into the weights once:
+        # ((x - m) / s) @ w + b == x @ (w / s) + (b - (m / s) @ w)
+        w, b = self.coef, self.intercept
+        if self.scale is not None:
+            w = w / np.where(self.scale == 0, 1.0, self.scale)
+        if self.mean is not None:
+            b = b - float(self.mean @ w)
+        self._w, self._b = w, b
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64).reshape(-1, len(self._w)) @ self._w + self._b
+
+    def score(self, X) -> np.ndarray:
+        """P(label = 1) for each row of X."""
+        return _sigmoid(self.decision_function(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.score(X)
+        return np.column_stack([1.0 - p, p])
+
+    # -----------------------------------------------------
+    # Serialisation
+    # -----------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": FORMAT,
+            "feature_order": self.feature_order,
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept,
+            "mean": None if self.mean is None else self.mean.tolist(),
+            "scale": None if self.scale is None else self.scale.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LinearModel":
+        if data.get("format") != FORMAT:
+            raise ValueError(f"Unsupported model format: {data.get('format')!r}")
+        return cls(data["coef"], data["intercept"], data["feature_order"], data.get("mean"), data.get("scale"))
+
+    def save(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearModel":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+    @classmethod
+    def from_estimator(cls, model: Any, feature_order: Sequence[str]) -> "LinearModel":
+        """
+        Export a fitted binary logistic model: sklearn LogisticRegression /
+        SGDClassifier, a Pipeline ending in one behind a StandardScaler, or
+        ml.online.OnlineLogisticModel. Read by attribute, so sklearn is not
+        imported here.
+        """
+        scaler = getattr(model, "scaler", None)
+        clf = getattr(model, "clf", model)
+        steps = getattr(model, "steps", None)
+        if steps:
+            scaler = steps[0][1] if len(steps) > 1 else None
+            clf = steps[-1][1]
+        coef = getattr(clf, "coef_", None)
+        if coef is None or np.asarray(coef).shape[0] != 1:
+            raise ValueError(f"Not a fitted binary linear model: {type(clf).__name__}")
+        mean = getattr(scaler, "mean_", None) if scaler is not None else None
+        scale = getattr(scaler, "scale_", None) if scaler is not None else None
+        return cls(np.asarray(coef)[0], float(np.asarray(clf.intercept_).ravel()[0]), feature_order, mean, scale)
+
+
+if __name__ == "__main__":
+    import pickle
+    import sys
+
+    from ml.registry import MATCH_REGISTRY
+
+    source = Path(sys.argv[1] if len(sys.argv) > 1 else "ml/models/logreg_job_match.pkl")
+    with source.open("rb") as f:
+        data = pickle.load(f)
+    linear = LinearModel.from_estimator(data["model"], data["feature_order"])
+    version = MATCH_REGISTRY.publish(linear.to_dict())
+    print(f"[ML] Exported {source} as {MATCH_REGISTRY.root.name} v{version}")
@@ -2,81 +2,193 @@
 from __future__ import annotations
 
 import pickle
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.core.config import ML_MODEL_POLL_SECONDS, ML_ONLINE_LEARNING
 from app.core.logging import logger
 
-from ml.features import extract_job_features, as_vector
+from ml import registry
+from ml.linear import LinearModel
 
+# Legacy pickled artifact, served only while the registries are empty.
+# Everything else is served as an ml.linear.LinearModel read from a JSON
+# registry, so scoring needs only NumPy (sklearn is imported just to
+# unpickle the legacy artifact).
 MODEL_PATH = Path("ml/models/logreg_job_match.pkl")
 
-_MODEL_CACHE = None
-_FEATURE_ORDER = None
+class Serving(NamedTuple):
+    """The served model, published as one tuple so a reader never pairs a
+    new model with an old feature order or version."""
+    model: object
+    feature_order: List[str]
+    version: Optional[int] = None   # registry version, None for the legacy MODEL_PATH file
+    registry: Optional[str] = None  # registry it is a version of ("match", "online")
+
+
+_SERVING: Optional[Serving] = None
+_POINTER_STAMPS = None    # registry pointer stamps when _SERVING was loaded
+_CHECKED_AT = 0.0
+# Serialises check-and-swap (_poll_registry, set_model, clear_cache);
+# readers only ever read _SERVING
+_SWAP_LOCK = threading.RLock()
 
 def clear_cache():
     """
     Clear the in-memory model cache.
-    Useful after retraining to force reload.
+    The next load_model() reads the current registry version again.
     """
-    global _MODEL_CACHE, _FEATURE_ORDER
-    _MODEL_CACHE = None
-    _FEATURE_ORDER = None
+    global _SERVING, _POINTER_STAMPS, _CHECKED_AT
+    with _SWAP_LOCK:
+        _SERVING = None
+        _POINTER_STAMPS = None
+        _CHECKED_AT = 0.0
     logger.info("[ML] Model cache cleared.")
 
 
-def load_model():
+def _servable(model, feature_order):
+    """Export linear estimators to LinearModel; anything else is served as is."""
+    if isinstance(model, LinearModel):
+        return model
+    try:
+        return LinearModel.from_estimator(model, feature_order)
+    except (AttributeError, ValueError):
+        return model
+
+
+def _load_payload(reg: "registry.ModelRegistry", version: Optional[int] = None):
+    """reg.load(), refusing pickled registries: serving never unpickles registry artifacts."""
+    if reg.fmt != "json":
+        raise ValueError(f"{reg.root.name} is a {reg.fmt} registry; only LinearModel JSON is served")
+    return reg.load(version)
+
+
+def _from_payload(payload):
+    """(model, feature_order) from a registry payload (LinearModel JSON)."""
+    if not isinstance(payload, dict) or "format" not in payload:
+        raise ValueError("Registry payload is not a LinearModel export")
+    model = LinearModel.from_dict(payload)
+    return model, model.feature_order
+
+
+def predict(model, X) -> np.ndarray:
+    """P(label = 1) for each row of X: NumPy for a LinearModel, predict_proba otherwise."""
+    if isinstance(model, LinearModel):
+        return model.score(X)
+    return np.asarray(model.predict_proba(X), dtype=np.float64)[:, 1]
+
+
+def load_version(reg: "registry.ModelRegistry", version: Optional[int] = None):
+    """(model, feature_order) of one registry version, ready to predict() with."""
+    version, payload = _load_payload(reg, version)
+    if payload is None:
+        raise ValueError(f"{reg.root.name} has no current version")
+    model, feature_order = _from_payload(payload)
+    return _servable(model, feature_order), list(feature_order)
+
+
+def set_model(model, feature_order, version: Optional[int] = None, registry_name: Optional[str] = None):
+    """Hot-swap the model used by score_job (e.g. after an online update)."""
+    global _SERVING
+    serving = Serving(_servable(model, feature_order), list(feature_order), version, registry_name)
+    with _SWAP_LOCK:
+        _SERVING = serving
+    logger.info(f"[ML] Serving model {'%s v%d' % (registry_name, version) if version is not None else 'from ' + str(MODEL_PATH)}")
+
+
+def _serving_registries():
+    """Registries to serve from, in order of preference."""
+    if ML_ONLINE_LEARNING:
+        return [registry.ONLINE_REGISTRY, registry.MATCH_REGISTRY]
+    return [registry.MATCH_REGISTRY]
+
+
+def _poll_registry(force: bool = False):
+    """
+    Every ML_MODEL_POLL_SECONDS, stat the registry pointers; if one changed
+    (another process published or rolled back), load the current version
+    and only then swap it in. The old model serves until the load is done,
+    and keeps serving if it fails. One thread polls at a time; the others
+    keep serving the current model rather than wait, unless there is none.
+    """
+    global _POINTER_STAMPS, _CHECKED_AT
+    if not force and _SERVING is not None and time.monotonic() - _CHECKED_AT < ML_MODEL_POLL_SECONDS:
+        return
+    if not _SWAP_LOCK.acquire(blocking=force or _SERVING is None):
+        return
+    try:
+        now = time.monotonic()
+        if not force and _SERVING is not None and now - _CHECKED_AT < ML_MODEL_POLL_SECONDS:
+            return  # another thread polled while this one waited
+        _CHECKED_AT = now
+        registries = _serving_registries()
+        stamps = [(r.root, r.pointer_stamp()) for r in registries]
+        if stamps == _POINTER_STAMPS and not force:
+            return
+        try:
+            for r in registries:
+                version, payload = _load_payload(r)
+                if payload is not None:
+                    set_model(*_from_payload(payload), version=version, registry_name=r.root.name)
+                    break
+            _POINTER_STAMPS = stamps
+        except Exception as e:
+            logger.error(f"[ML] Error loading model from registry: {e}")
+    finally:
+        _SWAP_LOCK.release()
+
+
+def reload_model():
+    """Load the current registry version now (e.g. right after publishing one)."""
+    _poll_registry(force=True)
+
+
+def current_model() -> Optional[Serving]:
     """
-    Load the trained model and feature order from disk.
-    Cached in memory.
+    The Serving for the current registry version, falling back to the
+    legacy MODEL_PATH file; None if there is no model. Cached in memory.
     """
-    global _MODEL_CACHE, _FEATURE_ORDER
-    if _MODEL_CACHE is not None:
-        return _MODEL_CACHE, _FEATURE_ORDER
+    _poll_registry()
+    serving = _SERVING
+    if serving is not None:
+        return serving
 
     if not MODEL_PATH.exists():
-        return None, None
+        return None
 
     try:
         with MODEL_PATH.open("rb") as f:
             data = pickle.load(f)
-            _MODEL_CACHE = data["model"]
-            _FEATURE_ORDER = data["feature_order"]
-            logger.info(f"[ML] Model loaded from {MODEL_PATH}")
-            return _MODEL_CACHE, _FEATURE_ORDER
+        set_model(data["model"], data["feature_order"])
+        return _SERVING
     except Exception as e:
         logger.error(f"[ML] Error loading model: {e}")
+        return None
+
+
+def load_model():
+    """Return (model, feature_order) of current_model(), or (None, None)."""
+    serving = current_model()
+    if serving is None:
         return None, None
+    return serving.model, serving.feature_order
 
 
 def score_job(user: Dict, job: Dict) -> float:
     """
     Predict match probability for a (user, job) pair.
-    Returns float 0.0 to 1.0.
+    Returns float 0.0 to 1.0 (0.5 if there is no model).
     """
-    clf, feature_order = load_model()
-    
-    # Extract features
-    feats = extract_job_features(user, job)
-    
-    # If no model, return heuristic fallback or 0.5
-    if clf is None:
-        # Fallback: normalize skill overlap to roughly 0.5-0.9 range?
-        # Or just return 0.5 neutral
-        return 0.5
-
-    # Align features with model's expected order
-    # (The model was trained with a specific column order)
-    # We must construct vector in that exact order
-    try:
-        # We need to ensure logic matches build_dataset.py
-        # extract_job_features returns dict. 
-        # But we need to order it by feature_order loaded from pkl
-        vector = [feats.get(k, 0.0) for k in feature_order]
-        
-        # Predict probability of class 1
-        # reshape(1, -1) because single sample
-        proba = clf.predict_proba([vector])[0][1]
-        return float(proba)
-    except Exception as e:
-        logger.error(f"[ML] scoring error: {e}")
-        return 0.5
\ No newline at end of file
+    return score_jobs(user, [job])[0]
+
+
+def score_jobs(user: Dict, jobs: List[Dict]) -> List[float]:
+    """score_job for many jobs in one batch, through the ranking engine (ml/ranking.py)."""
+    from ml.ranking import default_engine
+
+    probs, _ = default_engine().score(user, jobs)
+    return [float(p) for p in probs]
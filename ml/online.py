@@ -0,0 +1,189 @@
+# ml/online.py
+"""
+Online training of the match model from new swipes.
+
+Instead of rebuilding the whole dataset and refitting (ml/train_logistic.py),
+update() reads the labelled swipes recorded since the last checkpoint in
+mini-batches, folds each into an SGD logistic regression with partial_fit,
+and saves the training state (scaler, SGD model, cursor) as a pickled
+checkpoint in CHECKPOINT_DIR, read only by the trainer. What is served is
+its ml.linear.LinearModel export, published as JSON to the "online" model
+registry (ml/registry.py) and hot-swapped into ml.model; other processes
+pick it up within ML_MODEL_POLL_SECONDS, without sklearn or unpickling.
+
+Run one trainer: ML_ONLINE_TRAINER=1 on one API worker, or
+    python -m ml.online [--loop] [--interval SECONDS]
+"""
+from __future__ import annotations
+
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.core.config import ML_ONLINE_BATCH_SIZE, ML_ONLINE_INTERVAL
+from app.core.logging import logger
+from database.connection import get_db_connection
+from database.queries import fetch_all
+from ml.build_dataset import _label, featurize_frame
+from ml.features import FEATURE_KEYS
+from ml import registry
+from ml.linear import LinearModel
+from ml.registry import REGISTRY_DIR, ModelRegistry
+
+CHECKPOINT_DIR = REGISTRY_DIR / "online_state"
+KEEP_CHECKPOINTS = 5
+CLASSES = np.array([0, 1])
+
+# Cursor before any swipe: (created_at, user_swipes.id)
+START_CURSOR = ("1970-01-01 00:00:00", 0)
+
+class OnlineLogisticModel:
+    """
+    StandardScaler + SGD logistic regression, both updated with partial_fit.
+    Served as LinearModel.from_estimator(model, feature_order).
+    """
+
+    def __init__(self, alpha: float = 1e-4, random_state: int = 42) -> None:
+        self.scaler = StandardScaler()
+        self.clf = SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_state)
+        self.samples_seen = 0
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> None:
+        self.scaler.partial_fit(X)
+        self.clf.partial_fit(self.scaler.transform(X), y, classes=CLASSES)
+        self.samples_seen += len(y)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.clf.predict_proba(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+
+# ---------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------
+
+def new_state() -> Dict[str, Any]:
+    return {
+        "version": 0,
+        "model": OnlineLogisticModel(),
+        "feature_order": list(FEATURE_KEYS),
+        "cursor": START_CURSOR,
+        "created_at": time.time(),
+    }
+
+
+def list_checkpoints(directory: Path = CHECKPOINT_DIR) -> List[Tuple[int, Path]]:
+    registry = ModelRegistry(directory)
+    return [(version, registry.path_for(version)) for version in registry.versions()]
+
+
+def latest_checkpoint(directory: Path = CHECKPOINT_DIR) -> Optional[Tuple[int, Path]]:
+    """The checkpoint the registry's CURRENT pointer names."""
+    registry = ModelRegistry(directory)
+    version = registry.current_version()
+    return None if version is None else (version, registry.path_for(version))
+
+
+def load_checkpoint(path: Path) -> Dict[str, Any]:
+    with path.open("rb") as f:
+        return pickle.load(f)
+
+
+def save_checkpoint(state: Dict[str, Any], directory: Path = CHECKPOINT_DIR) -> Path:
+    """Publish checkpoint `state["version"]` (atomically) and prune all but the newest few."""
+    registry = ModelRegistry(directory, keep=KEEP_CHECKPOINTS)
+    return registry.path_for(registry.publish(state, version=state["version"]))
+
+
+# ---------------------------------------------------------
+# Training
+# ---------------------------------------------------------
+
+def fetch_batch(cursor: Tuple[Any, int], limit: int) -> List[Dict]:
+    after_at, after_id = cursor
+    with get_db_connection() as conn:
+        return [
+            dict(row)
+            for row in fetch_all(conn, "ml.swipes_since", after_at=after_at, after_id=after_id, limit=limit)
+        ]
+
+
+def update(
+    batch_size: int = ML_ONLINE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    directory: Path = CHECKPOINT_DIR,
+    swap: bool = True,
+    serving_registry: Optional[ModelRegistry] = None,
+) -> Dict[str, Any]:
+    """
+    Train on swipes recorded since the latest checkpoint. If there were
+    any, saves a new checkpoint and publishes its LinearModel export to
+    `serving_registry` (default: ONLINE_REGISTRY); with `swap`, also
+    serves it in this process.
+    """
+    found = latest_checkpoint(directory)
+    state = load_checkpoint(found[1]) if found else new_state()
+    model: OnlineLogisticModel = state["model"]
+
+    consumed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = fetch_batch(state["cursor"], batch_size)
+        if not rows:
+            break
+        frame = pd.DataFrame(rows)
+        X = featurize_frame(frame)[state["feature_order"]].to_numpy(dtype=np.float64)
+        model.partial_fit(X, _label(frame["action"]))
+        state["cursor"] = (rows[-1]["swiped_at"], rows[-1]["swipe_id"])
+        consumed += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    if not consumed:
+        return {"version": state["version"], "consumed": 0, "samples_seen": model.samples_seen}
+
+    state["version"] += 1
+    state["created_at"] = time.time()
+    path = save_checkpoint(state, directory)
+    linear = LinearModel.from_estimator(model, state["feature_order"])
+    serving = serving_registry or registry.ONLINE_REGISTRY
+    served_version = serving.publish(linear.to_dict())
+    logger.info(
+        f"[ML] Online update v{state['version']}: {consumed} swipes in {batches} batches -> {path}, "
+        f"served as {serving.root.name} v{served_version}"
+    )
+
+    if swap:
+        from ml.model import set_model
+        set_model(linear, linear.feature_order, version=served_version, registry_name=serving.root.name)
+
+    return {"version": state["version"], "consumed": consumed, "samples_seen": model.samples_seen}
+
+
+def run_forever(interval: float = ML_ONLINE_INTERVAL) -> None:
+    while True:
+        try:
+            update()
+        except Exception as e:
+            logger.error(f"[ML] Online update failed: {e}")
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold new swipes into the online model.")
+    parser.add_argument("--loop", action="store_true", help="keep updating every --interval seconds")
+    parser.add_argument("--interval", type=float, default=ML_ONLINE_INTERVAL)
+    args = parser.parse_args()
+
+    if args.loop:
+        run_forever(args.interval)
+    else:
+        print(update())
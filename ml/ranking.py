@@ -0,0 +1,259 @@
+# ml/ranking.py
+"""
+One ranking engine for every place that scores jobs for a user.
+
+Features come from registered providers. Each provider computes some
+named features for a whole batch of (user, job) pairs at once, from the
+same pair frame ml.build_dataset trains on:
+
+    skills     skill_overlap, skill_jaccard, title_keyword_match
+    location   location_match
+    seniority  seniority_match
+    text       description_length, title_length
+    experience exp_gap (logged with swipes, not a model feature)
+    embedding  semantic_sim (embedding API, off by default)
+
+RankingEngine computes the enabled providers (RANKING_PROVIDERS) once per
+request and scores them with the served model (ml.model.current_model), in
+that model's feature order. Features the model expects but no enabled
+provider produces are 0. With ML_SHADOW_VERSION set, a candidate model
+also scores every batch (ml/shadow.py). Served features are remembered
+per (user, job) so the swipe logger can reuse them (ml/interaction_logger.py).
+
+    probs, features = default_engine().score(user, jobs)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import RANKING_PROVIDERS
+from app.core.logging import logger
+from ml import interaction_logger, model as served, shadow
+from ml.build_dataset import length_features, location_features, seniority_features, skill_features
+from ml.features import _parse_skills
+
+
+@dataclass(frozen=True)
+class FeatureProvider:
+    """Computes `features` for every row of a pair frame."""
+    name: str
+    features: Tuple[str, ...]
+    compute: Callable[[pd.DataFrame], Dict[str, np.ndarray]]
+
+
+PROVIDERS: Dict[str, FeatureProvider] = {}
+
+
+def register_provider(provider: FeatureProvider) -> FeatureProvider:
+    if provider.name in PROVIDERS:
+        raise ValueError(f"Feature provider {provider.name!r} is already registered")
+    PROVIDERS[provider.name] = provider
+    return provider
+
+
+# ---------------------------------------------------------
+# Pair frame
+# ---------------------------------------------------------
+
+_USER_FIELDS = ("skills", "preferred_location", "preferred_seniority", "experience_years", "resume_text")
+_JOB_FIELDS = (
+    "title", "company", "location", "skills", "description",
+    # Stored at insert (ml.features.JOB_STATIC_COLUMNS), used when present
+    "title_norm", "location_norm", "description_length", "title_length",
+)
+
+
+def _as_text(value):
+    """Skills may arrive as lists (API dicts) or comma strings (DB rows)."""
+    return ",".join(str(v) for v in value) if isinstance(value, (list, tuple)) else value
+
+
+def pair_frame(user: Dict, jobs: Sequence[Dict]) -> pd.DataFrame:
+    """One row per job, with user_* / job_* columns as ml.build_dataset expects."""
+    columns = {f"user_{f}": [_as_text(user.get(f))] * len(jobs) for f in _USER_FIELDS}
+    for f in _JOB_FIELDS:
+        values = [_as_text(job.get(f)) for job in jobs]
+        if f in ("title", "location", "skills", "description") or any(v is not None for v in values):
+            columns[f"job_{f}"] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(jobs)))
+
+
+# ---------------------------------------------------------
+# Providers
+# ---------------------------------------------------------
+
+register_provider(FeatureProvider("skills", ("skill_overlap", "skill_jaccard", "title_keyword_match"), skill_features))
+register_provider(FeatureProvider("location", ("location_match",), location_features))
+register_provider(FeatureProvider("seniority", ("seniority_match",), seniority_features))
+register_provider(FeatureProvider("text", ("description_length", "title_length"), length_features))
+
+
+def experience_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Candidate years minus the job's minimum; jobs carry no minimum yet, so it is 0."""
+    years = pd.to_numeric(df["user_experience_years"], errors="coerce").fillna(0.0)
+    return {"exp_gap": years.to_numpy(dtype=np.float64)}
+
+
+register_provider(FeatureProvider("experience", ("exp_gap",), experience_features))
+
+
+@lru_cache(maxsize=10_000)
+def _embed(text: str) -> Tuple[float, ...]:
+    from core.llm_client import generate_embedding  # needs GEMINI_API_KEY
+    return tuple(generate_embedding(text))
+
+
+def _unit_rows(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Row -> distinct-text codes, and one L2-normalised embedding per distinct text."""
+    codes, uniques = pd.factorize(pd.Series(texts), sort=False)
+    vectors = [np.asarray(_embed(t), dtype=np.float64) for t in uniques]
+    dim = max((len(v) for v in vectors), default=0)
+    matrix = np.zeros((len(vectors), dim))
+    for i, v in enumerate(vectors):
+        if len(v) == dim and dim:
+            norm = np.linalg.norm(v)
+            matrix[i] = v / norm if norm else 0.0
+    return codes, matrix
+
+
+def embedding_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Cosine similarity of candidate and job embeddings (matching/embeddings.py texts)."""
+    from core.llm_client import CandidateProfile, JobPosting
+    from matching.embeddings import candidate_to_embedding_text, job_to_embedding_text
+
+    def text(value) -> str:
+        return "" if value is None or value != value else str(value)
+
+    candidates = [
+        candidate_to_embedding_text(CandidateProfile(
+            summary=text(resume), skills=sorted(_parse_skills(text(skills))),
+            experience=text(years), location=text(location),
+        ))
+        for resume, skills, years, location in zip(
+            df["user_resume_text"], df["user_skills"], df["user_experience_years"], df["user_preferred_location"],
+        )
+    ]
+    postings = [
+        job_to_embedding_text(JobPosting(
+            title=text(title), company=text(company), location=text(location),
+            skills=sorted(_parse_skills(text(skills))), description=text(description),
+        ))
+        for title, company, location, skills, description in zip(
+            df["job_title"], df.get("job_company", [None] * len(df)), df["job_location"],
+            df["job_skills"], df["job_description"],
+        )
+    ]
+    c_codes, c_matrix = _unit_rows(candidates)
+    j_codes, j_matrix = _unit_rows(postings)
+    if c_matrix.shape[1] != j_matrix.shape[1]:
+        return {"semantic_sim": np.zeros(len(df))}
+    return {"semantic_sim": np.einsum("ij,ij->i", c_matrix[c_codes], j_matrix[j_codes])}
+
+
+register_provider(FeatureProvider("embedding", ("semantic_sim",), embedding_features))
+
+
+def compute_features(user: Dict, jobs: Sequence[Dict], names: Sequence[str]) -> pd.DataFrame:
+    """
+    Just the features `names`, from whichever registered providers produce
+    them, enabled for ranking or not. A failing provider is logged and its
+    features are left out.
+    """
+    df = pair_frame(user, jobs)
+    columns: Dict[str, np.ndarray] = {}
+    for provider in PROVIDERS.values():
+        if not set(provider.features) & set(names):
+            continue
+        try:
+            columns.update(provider.compute(df))
+        except Exception as e:
+            logger.warning(f"[ML] Feature provider {provider.name} failed, {list(provider.features)} not computed: {e}")
+    return pd.DataFrame({n: columns[n] for n in names if n in columns}, index=df.index)
+
+
+# ---------------------------------------------------------
+# Engine
+# ---------------------------------------------------------
+
+class RankingEngine:
+    """Batch features + one served model for a user's candidate jobs."""
+
+    def __init__(self, providers: Optional[Sequence[str]] = None) -> None:
+        names = list(RANKING_PROVIDERS if providers is None else providers)
+        unknown = [n for n in names if n not in PROVIDERS]
+        if unknown:
+            raise ValueError(f"Unknown feature providers: {unknown} (known: {sorted(PROVIDERS)})")
+        self.providers = [PROVIDERS[n] for n in names]
+
+    def features(self, user: Dict, jobs: Sequence[Dict]) -> pd.DataFrame:
+        """All enabled features, one row per job."""
+        df = pair_frame(user, jobs)
+        columns: Dict[str, np.ndarray] = {}
+        for provider in self.providers:
+            columns.update(provider.compute(df))
+        return pd.DataFrame(columns, index=df.index)
+
+    def score(self, user: Dict, jobs: Sequence[Dict], observe: bool = True) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        Match probability per job, and the features it was computed from.
+        0.5 for every job if there is no model (or it fails). With `observe`
+        the batch also goes to the shadow scorer and the served-features
+        cache; off when re-scoring swipes.
+        """
+        probs, feats, _ = self.score_served(user, jobs, observe)
+        return probs, feats
+
+    def score_served(
+        self, user: Dict, jobs: Sequence[Dict], observe: bool = True
+    ) -> Tuple[np.ndarray, pd.DataFrame, Optional[served.Serving]]:
+        """score(), plus the Serving that produced the probabilities (None if the 0.5 default did)."""
+        feats = self.features(user, jobs)
+        current = served.current_model()
+        probs = None
+        if current is not None and len(jobs):
+            try:
+                X = feats.reindex(columns=current.feature_order, fill_value=0.0).to_numpy(dtype=np.float64)
+                probs = served.predict(current.model, X)
+            except Exception as e:
+                logger.error(f"[ML] ranking error: {e}")
+        if probs is None:
+            current = None
+        if not observe:
+            return (np.full(len(jobs), 0.5) if probs is None else probs), feats, current
+
+        job_ids = [job.get("id") for job in jobs]
+        interaction_logger.served_features.remember(
+            user.get("id"), job_ids, feats, probs, current.version if current is not None else None
+        )
+        if probs is None:
+            return np.full(len(jobs), 0.5), feats, None
+        scorer = shadow.shadow_scorer
+        if scorer is not None:
+            scorer.observe(user.get("id"), job_ids, feats, probs, X, current)
+        return probs, feats, current
+
+    def rank(self, user: Dict, jobs: Sequence[Dict]) -> List[Dict]:
+        """Copies of `jobs` with match_probability / match_features, best first."""
+        probs, feats = self.score(user, jobs)
+        ranked = [
+            {**job, "match_probability": float(p), "match_features": f}
+            for job, p, f in zip(jobs, probs, feats.to_dict("records"))
+        ]
+        ranked.sort(key=lambda j: j["match_probability"], reverse=True)
+        return ranked
+
+
+_DEFAULT_ENGINE: Optional[RankingEngine] = None
+
+
+def default_engine() -> RankingEngine:
+    """The engine for RANKING_PROVIDERS, built on first use."""
+    global _DEFAULT_ENGINE
+    if _DEFAULT_ENGINE is None:
+        _DEFAULT_ENGINE = RankingEngine()
+    return _DEFAULT_ENGINE
@@ -0,0 +1,165 @@
+# ml/registry.py
+"""
+Versioned model artifacts with an atomic "current" pointer.
+
+Each model name gets a directory of immutable versions and a CURRENT file
+naming the one to serve:
+
+    ml/models/registry/match/
+        v000001.json
+        v000002.json
+        CURRENT            -> "2"
+
+Payloads are stored as JSON (fmt="json", e.g. ml.linear.LinearModel.to_dict())
+or pickled (fmt="pkl", for training state such as online checkpoints).
+
+publish() writes the new version to a temp file and renames it into
+place, then flips CURRENT the same way, so readers only ever see complete
+artifacts and a complete pointer. Serving processes poll the pointer's
+file stamp (pointer_stamp(), one stat call) and load a new version before
+swapping it in, so the old model keeps serving until then.
+
+    version = MATCH_REGISTRY.publish(LinearModel.from_estimator(clf, FEATURE_KEYS).to_dict())
+    version, payload = MATCH_REGISTRY.load()
+"""
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from app.core.logging import logger
+
+REGISTRY_DIR = Path("ml/models/registry")
+KEEP_VERSIONS = 5
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ModelRegistry:
+    """Versions of one named model in `root`."""
+
+    def __init__(self, root: Path, keep: int = KEEP_VERSIONS, fmt: str = "pkl") -> None:
+        if fmt not in ("pkl", "json"):
+            raise ValueError(f"Unknown registry format: {fmt!r}")
+        self.root = Path(root)
+        self.keep = keep
+        self.fmt = fmt
+        self._version_re = re.compile(rf"^v(\d+)\.{fmt}$")
+
+    @property
+    def pointer(self) -> Path:
+        return self.root / "CURRENT"
+
+    def path_for(self, version: int) -> Path:
+        return self.root / f"v{version:06d}.{self.fmt}"
+
+    def versions(self) -> List[int]:
+        if not self.root.exists():
+            return []
+        found = []
+        for path in self.root.iterdir():
+            match = self._version_re.match(path.name)
+            if match and path.stat().st_size > 0:   # size 0: reserved, still being written
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def current_version(self) -> Optional[int]:
+        try:
+            return int(self.pointer.read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def pointer_stamp(self) -> Optional[Tuple[int, int]]:
+        """Changes whenever CURRENT is replaced; cheap enough to check per request."""
+        try:
+            st = os.stat(self.pointer)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _reserve(self, version: Optional[int]) -> int:
+        """Claim a version number (O_EXCL, so concurrent publishers never share one)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        candidate = version if version is not None else max(self._all_numbers(), default=0) + 1
+        while True:
+            try:
+                os.close(os.open(self.path_for(candidate), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return candidate
+            except FileExistsError:
+                if version is not None:
+                    raise ValueError(f"{self.root.name} v{version} already exists") from None
+                candidate += 1
+
+    def _all_numbers(self) -> List[int]:
+        if not self.root.exists():
+            return []
+        return [int(m.group(1)) for m in (self._version_re.match(p.name) for p in self.root.iterdir()) if m]
+
+    def publish(self, payload: Any, version: Optional[int] = None, make_current: bool = True) -> int:
+        """Store `payload` as a new version (the next free number unless given) and point CURRENT at it."""
+        version = self._reserve(version)
+        try:
+            _atomic_write(self.path_for(version), self._dumps(payload))
+        except BaseException:
+            self.path_for(version).unlink(missing_ok=True)
+            raise
+        if make_current:
+            self.set_current(version)
+        self.prune()
+        logger.info(f"[ML] Published {self.root.name} v{version}")
+        return version
+
+    def set_current(self, version: int) -> None:
+        """Serve `version` (also used to roll back)."""
+        if version not in self.versions():
+            raise ValueError(f"{self.root.name} v{version} does not exist")
+        _atomic_write(self.pointer, str(version).encode())
+
+    def load(self, version: Optional[int] = None) -> Tuple[Optional[int], Any]:
+        """Load `version` (default: CURRENT). Returns (None, None) if there is nothing to load."""
+        if version is None:
+            version = self.current_version()
+            if version is None:
+                return None, None
+        return version, self._loads(self.path_for(version).read_bytes())
+
+    def _dumps(self, payload: Any) -> bytes:
+        if self.fmt == "json":
+            return json.dumps(payload).encode()
+        return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _loads(self, data: bytes) -> Any:
+        return json.loads(data) if self.fmt == "json" else pickle.loads(data)
+
+    def prune(self) -> None:
+        """Delete all but the newest `keep` versions, never the current one."""
+        current = self.current_version()
+        for version in self.versions()[:-self.keep]:
+            if version != current:
+                self.path_for(version).unlink(missing_ok=True)
+
+
+# Served models: the batch-trained match model (ml/train_logistic.py) and
+# the online learner's exports (ml/online.py). Its pickled training state
+# lives apart, in ml.online.CHECKPOINT_DIR, and is only read by the trainer.
+MATCH_REGISTRY = ModelRegistry(REGISTRY_DIR / "match", fmt="json")
+ONLINE_REGISTRY = ModelRegistry(REGISTRY_DIR / "online", fmt="json")
@@ -0,0 +1,180 @@
+# ml/replay_eval.py
+"""
+Offline replay of historical swipes against model versions.
+
+Every labelled swipe in user_swipes is featurized once, column-wise
+(ml.build_dataset, the ranking engine's providers), then scored by each
+requested model with the same vectorised predict the API uses. Reports:
+
+    auc           ROC AUC over all swipes (apply/save = 1, skip = 0)
+    ndcg@k        mean over users with at least one positive swipe of
+                  NDCG@k, ranking that user's swiped jobs by score
+    rows_per_sec  scoring throughput of predict() alone
+
+Features are computed from today's users/jobs rows, not their state at
+swipe time, unless --store replays the feature store (ml/feature_store.py),
+which kept them as they were when each swipe happened.
+
+Usage:
+    python -m ml.replay_eval                 # current match model
+    python -m ml.replay_eval -v 3 -v 4 -k 5  # compare registry versions
+    python -m ml.replay_eval --online        # current online checkpoint
+    python -m ml.replay_eval --store         # feature store instead of the database
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from app.core.config import FEATURE_STORE_DIR
+from database.connection import get_db_connection
+from database.queries import SQLITE, dialect_of
+from ml import registry
+from ml.build_dataset import CHUNK_SIZE, DATASET_QUERY, _label, featurize_frame
+from ml.feature_store import FeatureStore
+from ml.model import load_version, predict
+
+
+def load_replay_frame(since: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Features (FEATURE_KEYS) + user_id + label for every labelled swipe, optionally since a timestamp."""
+    parts = []
+    with get_db_connection() as conn:
+        query = DATASET_QUERY
+        if since:
+            query += " AND us.created_at >= " + ("?" if dialect_of(conn) == SQLITE else "%s")
+        for chunk in pd.read_sql_query(query, conn, params=(since,) if since else None, chunksize=chunk_size):
+            if chunk.empty:
+                continue
+            chunk = chunk.reset_index(drop=True)
+            feats = featurize_frame(chunk)
+            feats["user_id"] = chunk["user_id"].to_numpy()
+            feats["label"] = _label(chunk["action"])
+            parts.append(feats)
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+def load_store_frame(store: Optional[FeatureStore] = None) -> pd.DataFrame:
+    """load_replay_frame() from the feature store: latest example per (user, job)."""
+    store = store or FeatureStore(Path(FEATURE_STORE_DIR))
+    X, y, users = store.training_arrays()
+    if not len(y):
+        return pd.DataFrame()
+    frame = pd.DataFrame(X, columns=store.features)
+    frame["user_id"] = users
+    frame["label"] = y
+    return frame
+
+
+# ---------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------
+
+def auc(labels: np.ndarray, scores: np.ndarray) -> float:
+    """ROC AUC via the rank-sum statistic (ties count half). NaN with one class."""
+    labels = np.asarray(labels).astype(bool)
+    pos = int(labels.sum())
+    neg = len(labels) - pos
+    if pos == 0 or neg == 0:
+        return float("nan")
+    ranks = rankdata(scores)
+    return float((ranks[labels].sum() - pos * (pos + 1) / 2) / (pos * neg))
+
+
+def ndcg_at_k(user_ids: np.ndarray, labels: np.ndarray, scores: np.ndarray, k: int = 10) -> float:
+    """Mean NDCG@k over users with at least one positive. NaN if there are none."""
+    df = pd.DataFrame({"user": user_ids, "label": np.asarray(labels, dtype=np.float64), "score": scores})
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+
+    def dcg(order: pd.DataFrame) -> pd.Series:
+        pos = order.groupby("user").cumcount().to_numpy()
+        top = pos < k
+        gains = order["label"].to_numpy()[top] * discounts[pos[top]]
+        return pd.Series(gains).groupby(order["user"].to_numpy()[top]).sum()
+
+    # Stable tie-break on the original row order, the same for both sorts
+    df["row"] = np.arange(len(df))
+    actual = dcg(df.sort_values(["user", "score", "row"], ascending=[True, False, True]))
+    ideal = dcg(df.sort_values(["user", "label", "row"], ascending=[True, False, True]))
+    ideal = ideal[ideal > 0]
+    if ideal.empty:
+        return float("nan")
+    return float((actual.reindex(ideal.index, fill_value=0.0) / ideal).mean())
+
+
+def _throughput(model, X: np.ndarray, min_seconds: float = 0.2) -> Tuple[np.ndarray, float]:
+    """Scores for X, and rows per second over enough repeats to measure."""
+    scores = predict(model, X)
+    repeats, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_seconds:
+        predict(model, X)
+        repeats += 1
+        elapsed = time.perf_counter() - start
+    return scores, len(X) * repeats / elapsed
+
+
+def evaluate(frame: pd.DataFrame, model, feature_order: List[str], k: int = 10) -> Dict[str, float]:
+    """Metrics for one model over a load_replay_frame() result."""
+    if frame.empty:
+        return {"rows": 0, "users": 0, "auc": float("nan"), f"ndcg@{k}": float("nan"), "rows_per_sec": 0.0}
+    X = frame.reindex(columns=feature_order, fill_value=0.0).to_numpy(dtype=np.float64)
+    scores, rate = _throughput(model, X)
+    labels = frame["label"].to_numpy()
+    users = frame["user_id"].to_numpy()
+    return {
+        "rows": len(frame),
+        "users": int(pd.unique(users).size),
+        "auc": auc(labels, scores),
+        f"ndcg@{k}": ndcg_at_k(users, labels, scores, k),
+        "rows_per_sec": rate,
+    }
+
+
+def replay(
+    versions: Optional[List[Optional[int]]] = None,
+    model_registry: Optional[registry.ModelRegistry] = None,
+    k: int = 10,
+    since: Optional[str] = None,
+    store: Optional[FeatureStore] = None,
+) -> List[Dict]:
+    """
+    Evaluate each of `versions` (None = CURRENT) of `model_registry`
+    (default: the match registry) on the same replay frame: the database
+    join, or `store` if given.
+    """
+    reg = model_registry or registry.MATCH_REGISTRY
+    frame = load_store_frame(store) if store is not None else load_replay_frame(since)
+    results = []
+    for version in versions or [None]:
+        model, feature_order = load_version(reg, version)
+        label = version if version is not None else reg.current_version()
+        results.append({"version": label, **evaluate(frame, model, feature_order, k)})
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay historical swipes against model versions.")
+    parser.add_argument("-v", "--version", type=int, action="append", help="registry version (repeatable)")
+    parser.add_argument("--online", action="store_true", help="use the online checkpoint registry")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--since", help="only swipes at or after this timestamp")
+    parser.add_argument("--store", action="store_true", help="replay the feature store")
+    args = parser.parse_args()
+
+    reg = registry.ONLINE_REGISTRY if args.online else registry.MATCH_REGISTRY
+    store = FeatureStore(Path(FEATURE_STORE_DIR)) if args.store else None
+    for result in replay(args.version, reg, k=args.k, since=args.since, store=store):
+        print(
+            f"v{result['version']}: rows={result['rows']} users={result['users']} "
+            f"auc={result['auc']:.4f} ndcg@{args.k}={result[f'ndcg@{args.k}']:.4f} "
+            f"scoring={result['rows_per_sec']:,.0f} rows/s"
+        )
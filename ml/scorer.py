@@ -1,6 +1,6 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from app.core.interfaces import MatchScorer
-from ml.model import score_job
+from ml.model import score_job, score_jobs
 
 class LogisticMatchScorer:
     """
@@ -8,3 +8,6 @@ class LogisticMatchScorer:
     """
     def score(self, user_profile: Dict[str, Any], job_data: Dict[str, Any]) -> float:
         return score_job(user_profile, job_data)
+
+    def score_many(self, user_profile: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[float]:
+        return score_jobs(user_profile, jobs)
@@ -0,0 +1,145 @@
+# ml/shadow.py
+"""
+Shadow scoring of a candidate model on live traffic.
+
+With ML_SHADOW_VERSION set, every batch the ranking engine scores is also
+scored by that match-registry version (usually one published with
+make_current=False). Both models see the same feature frame, so the
+shadow costs one extra vectorised predict. Users only ever see the live
+scores; the shadow's go to ML_SHADOW_LOG, one compact JSON line per
+batch, buffered and appended every `flush_every` batches:
+
+    {"ts":1760000000.1,"user":7,"live_reg":"match","live_v":3,"shadow_v":4,
+     "jobs":[12,9],"live":[0.8123,0.2],"shadow":[0.7561,0.31]}
+
+live_v is a version of the live_reg registry: with ML_ONLINE_LEARNING the
+live model can come from the online registry, whose version numbers are
+unrelated to the match registry's shadow_v (live_reg is null for the
+legacy MODEL_PATH artifact).
+
+read_shadow_log() loads it back for comparison.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import ML_SHADOW_LOG, ML_SHADOW_VERSION
+from app.core.logging import logger
+from ml import model as served, registry
+
+
+class ShadowScorer:
+    """Scores feed batches with one registry version and logs the result."""
+
+    def __init__(self, version: int, log_path: Path, model_registry=None, flush_every: int = 64) -> None:
+        self.version = version
+        self.log_path = Path(log_path)
+        self.model_registry = model_registry  # default: registry.MATCH_REGISTRY
+        self.flush_every = flush_every
+        self._model = None
+        self._failed = False
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None and not self._failed:
+            try:
+                self._model = served.load_version(self.model_registry or registry.MATCH_REGISTRY, self.version)
+                logger.info(f"[ML] Shadow scoring with v{self.version}")
+            except Exception as e:
+                # Never retried: a broken candidate must not cost every request a load attempt
+                self._failed = True
+                logger.error(f"[ML] Shadow model v{self.version} unavailable: {e}")
+        return self._model
+
+    def observe(
+        self,
+        user_id: Optional[int],
+        job_ids: Sequence[Optional[int]],
+        features: pd.DataFrame,
+        live: np.ndarray,
+        live_X: Optional[np.ndarray] = None,
+        live_model: Optional[served.Serving] = None,
+    ) -> None:
+        """
+        Score `features` with the shadow model and log it next to the live
+        scores, which `live_model` produced from `live_X`. The live matrix is
+        reused when the feature orders match.
+        """
+        loaded = self._load()
+        if loaded is None or not len(features):
+            return
+        clf, feature_order = loaded
+        try:
+            if live_X is not None and live_model is not None and feature_order == live_model.feature_order:
+                X = live_X
+            else:
+                X = features.reindex(columns=feature_order, fill_value=0.0).to_numpy(dtype=np.float64)
+            scores = served.predict(clf, X)
+        except Exception as e:
+            logger.error(f"[ML] Shadow scoring error: {e}")
+            return
+
+        line = json.dumps({
+            "ts": round(time.time(), 3),
+            "user": user_id,
+            "live_reg": live_model.registry if live_model is not None else None,
+            "live_v": live_model.version if live_model is not None else None,
+            "shadow_v": self.version,
+            "jobs": list(job_ids),
+            "live": np.round(live, 4).tolist(),
+            "shadow": np.round(scores, 4).tolist(),
+        }, separators=(",", ":"))
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) < self.flush_every:
+                return
+            lines, self._buffer = self._buffer, []
+        self._write(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        self._write(lines)
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        try:
+            with self._write_lock:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.log_path.open("a") as f:
+                    f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.error(f"[ML] Could not write shadow log: {e}")
+
+
+def read_shadow_log(path: Path = Path(ML_SHADOW_LOG)) -> pd.DataFrame:
+    """One row per scored job: ts, user, job, live_reg, live_v, shadow_v, live, shadow."""
+    rows: List[Dict] = []
+    with Path(path).open() as f:
+        for line in f:
+            entry = json.loads(line)
+            for job, live, shadow in zip(entry["jobs"], entry["live"], entry["shadow"]):
+                rows.append({
+                    "ts": entry["ts"], "user": entry["user"], "job": job,
+                    "live_reg": entry.get("live_reg"), "live_v": entry["live_v"], "shadow_v": entry["shadow_v"],
+                    "live": live, "shadow": shadow,
+                })
+    return pd.DataFrame(rows, columns=["ts", "user", "job", "live_reg", "live_v", "shadow_v", "live", "shadow"])
+
+
+shadow_scorer: Optional[ShadowScorer] = (
+    ShadowScorer(ML_SHADOW_VERSION, Path(ML_SHADOW_LOG)) if ML_SHADOW_VERSION is not None else None
+)
+if shadow_scorer is not None:
+    atexit.register(shadow_scorer.flush)
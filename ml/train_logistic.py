@@ -1,35 +1,98 @@
 # ml/train_logistic.py
+"""
+Train the match model and publish it to the match registry.
+
+Regularisation strength and class weighting are chosen by a
+cross-validated grid search (ROC AUC) run in parallel across cores; the
+best pipeline is refitted on the training split, reported on a held-out
+20%, and published pickle-free (ml/linear.py).
+
+    python -m ml.train_logistic [--jobs N] [--folds K] [--no-cache] [--refresh-cache]
+    python -m ml.train_logistic --source store
+
+From the command line the featurized dataset is cached as memory-mapped
+.npy files (ml.build_dataset.cached_dataset), so repeated runs skip the
+database until it changes. --source store trains on the feature store
+written at swipe time (ml/feature_store.py) instead of the database.
+"""
 from __future__ import annotations
 
 from pathlib import Path
-import pickle
+from typing import Optional, Tuple
 
+import numpy as np
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
 
-from ml.build_dataset import build_dataset
+from app.core.config import FEATURE_STORE_DIR
+from ml.build_dataset import build_dataset, cached_dataset
+from ml.feature_store import FeatureStore
 from ml.features import FEATURE_KEYS
+from ml.linear import LinearModel
+from ml.registry import MATCH_REGISTRY
+
+# Features are standardised first, so one C applies evenly to all of them
+PARAM_GRID = {
+    "logisticregression__C": [0.01, 0.1, 1.0, 10.0, 100.0],
+    "logisticregression__class_weight": [None, "balanced"],
+}
+CV_FOLDS = 5
+
+
+def _pipeline() -> Pipeline:
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
 
-MODEL_PATH = Path("ml/models/logreg_job_match.pkl")
+def search(X, y, folds: int = CV_FOLDS, n_jobs: int = -1) -> Tuple[Pipeline, Optional[GridSearchCV]]:
+    """
+    Best PARAM_GRID pipeline by cross-validated ROC AUC, refitted on all of
+    (X, y). With fewer than two samples of a class per fold, fits the
+    default settings instead and returns no search.
+    """
+    folds = min(folds, int(np.bincount(np.asarray(y, dtype=np.int64), minlength=2).min()))
+    if folds < 2:
+        return _pipeline().fit(X, y), None
+    grid = GridSearchCV(
+        _pipeline(),
+        PARAM_GRID,
+        scoring="roc_auc",
+        cv=StratifiedKFold(folds, shuffle=True, random_state=42),
+        n_jobs=n_jobs,
+        refit=True,
+    )
+    grid.fit(X, y)
+    return grid.best_estimator_, grid
 
 
-def main():
+def _load(use_cache: bool, refresh_cache: bool, source: str = "db"):
+    if source == "store":
+        X, y, _ = FeatureStore(Path(FEATURE_STORE_DIR)).training_arrays()
+        return (X, y) if len(y) else (None, None)
+    if use_cache:
+        return cached_dataset(refresh=refresh_cache)
     df = build_dataset()
     if df.empty:
-        print("[ML] No training data available. Aborting training.")
-        return
+        return None, None
+    return df.reindex(columns=FEATURE_KEYS, fill_value=0.0).to_numpy(dtype=np.float64), df["label"].to_numpy()
 
-    # Ensure all feature columns exist
-    for key in FEATURE_KEYS:
-        if key not in df.columns:
-            df[key] = 0.0
 
-    X = df[FEATURE_KEYS].values
-    y = df["label"].values
+def main(
+    n_jobs: int = -1,
+    folds: int = CV_FOLDS,
+    use_cache: bool = False,
+    refresh_cache: bool = False,
+    source: str = "db",
+):
+    X, y = _load(use_cache, refresh_cache, source)
+    if X is None:
+        print("[ML] No training data available. Aborting training.")
+        return
 
-    if len(df) < 10:
-        print(f"[ML] Only {len(df)} samples. Too small for meaningful model, training anyway.")
+    if len(X) < 10:
+        print(f"[ML] Only {len(X)} samples. Too small for meaningful model, training anyway.")
     try:
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
@@ -38,8 +101,12 @@ def main():
         # Not enough class variety
         X_train, X_test, y_train, y_test = X, X, y, y
 
-    clf = LogisticRegression(max_iter=1000)
-    clf.fit(X_train, y_train)
+    clf, grid = search(X_train, y_train, folds=folds, n_jobs=n_jobs)
+    if grid is not None:
+        best = {k.split("__", 1)[1]: v for k, v in grid.best_params_.items()}
+        print(f"[ML] Best of {len(grid.cv_results_['params'])} settings: {best} (CV ROC AUC {grid.best_score_:.4f})")
+    else:
+        print("[ML] Too few samples per class to cross-validate; using default settings.")
 
     y_pred = clf.predict(X_test)
     try:
@@ -56,17 +123,27 @@ def main():
         except ValueError:
             print("[ML] ROC AUC not defined (single-class test set).")
 
-    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with MODEL_PATH.open("wb") as f:
-        pickle.dump(
-            {
-                "model": clf,
-                "feature_order": FEATURE_KEYS,
-            },
-            f,
-        )
-    print(f"[ML] Saved logistic model to {MODEL_PATH}")
+    # Served pickle-free: coefficients only (ml/linear.py)
+    version = MATCH_REGISTRY.publish(LinearModel.from_estimator(clf, FEATURE_KEYS).to_dict())
+    print(f"[ML] Published logistic model v{version} to {MATCH_REGISTRY.root}")
+    return version
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train and publish the match model.")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1: all cores)")
+    parser.add_argument("--folds", type=int, default=CV_FOLDS)
+    parser.add_argument("--no-cache", action="store_true", help="featurize from the database, skip the .npy cache")
+    parser.add_argument("--refresh-cache", action="store_true", help="rebuild the .npy cache")
+    parser.add_argument("--source", choices=("db", "store"), default="db", help="database join or feature store")
+    args = parser.parse_args()
+
+    main(
+        n_jobs=args.jobs,
+        folds=args.folds,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh_cache,
+        source=args.source,
+    )
@@ -0,0 +1,151 @@
+"""
+Pluggable HTML -> plain text extraction.
+
+Backends, fastest first:
+    - "lxml":   lxml.html C parser (used when lxml is installed)
+    - "stream": stdlib tokenizing stripper, never builds a tree
+    - "bs4":    BeautifulSoup + html.parser (the original behaviour)
+
+Every backend drops <script>/<style> contents, joins text nodes with a
+single space and collapses whitespace, so they are interchangeable.
+"""
+from __future__ import annotations
+
+import html
+import os
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+    etree = None
+
+from app.core.logging import logger
+
+_WS_RE = re.compile(r"\s+")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SKIP_TAGS = ("script", "style")
+
+# Override with HTML_TEXT_BACKEND=lxml|stream|bs4
+DEFAULT_BACKEND = os.getenv("HTML_TEXT_BACKEND", "")
+
+
+def _collapse(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+
+def _lxml_text(markup: str) -> str:
+    root = lxml.html.fromstring(markup)
+    etree.strip_elements(root, *_SKIP_TAGS, with_tail=False)
+    return _collapse(" ".join(root.itertext()))
+
+
+class _TextStripper(HTMLParser):
+    """Collects text nodes while tokenizing; no DOM is built."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def _stream_text(markup: str) -> str:
+    stripper = _TextStripper()
+    stripper.feed(markup)
+    stripper.close()
+    return _collapse(" ".join(stripper.parts))
+
+
+def _bs4_text(markup: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(markup, "html.parser")
+    for el in soup(list(_SKIP_TAGS)):
+        el.decompose()
+    return _collapse(soup.get_text(separator=" "))
+
+
+BACKENDS: Dict[str, Callable[[str], str]] = {
+    "lxml": _lxml_text,
+    "stream": _stream_text,
+    "bs4": _bs4_text,
+}
+
+
+def available_backends() -> List[str]:
+    """Backends usable in this environment, fastest first."""
+    names = ["stream", "bs4"]
+    if lxml is not None:
+        names.insert(0, "lxml")
+    return names
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    name = backend or DEFAULT_BACKEND
+    if name in available_backends():
+        return name
+    return available_backends()[0]
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def html_to_text(markup: Optional[str], backend: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+    """
+    Strip tags from an HTML fragment and return whitespace-collapsed text.
+
+    Plain text (no '<') skips parsing entirely. If the chosen backend fails
+    on malformed markup we fall back to BeautifulSoup, then to a regex strip.
+    """
+    if not markup:
+        return ""
+
+    if "<" not in markup:
+        text = _collapse(html.unescape(markup) if "&" in markup else markup)
+    else:
+        name = _resolve_backend(backend)
+        try:
+            text = BACKENDS[name](markup)
+        except Exception as e:
+            logger.warning(f"[html_text] {name} backend failed ({e}), falling back to bs4")
+            try:
+                text = _bs4_text(markup)
+            except Exception:
+                text = _collapse(html.unescape(_TAG_RE.sub(" ", markup)))
+
+    if max_chars is not None:
+        text = text[:max_chars]
+    return text
+
+
+def soup_parser() -> str:
+    """Fastest BeautifulSoup tree builder available ("lxml" or "html.parser")."""
+    return "lxml" if lxml is not None else "html.parser"
+
+
+def get_soup(markup: str):
+    """BeautifulSoup document for pages that need CSS selectors (e.g. TimesJobs)."""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markup, soup_parser())
@@ -0,0 +1,134 @@
+"""
+Incremental JSON array parsing for large source payloads.
+
+RemoteOK returns a top-level array, Remotive/Arbeitnow wrap theirs in an
+object ({"jobs": [...]}, {"data": [...]}). Instead of resp.json() we read
+the body in chunks and decode one array element at a time, so peak memory
+is roughly one chunk plus one job, and callers can stop reading as soon as
+they have enough matches.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional, Union
+
+CHUNK_SIZE = 64 * 1024
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Text buffer over an iterable of byte/str chunks with JSON value decoding."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")("replace")
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next non-empty chunk. Returns False once the stream is exhausted."""
+        if self.eof:
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._utf8.decode(chunk)
+            if chunk:
+                self.buf += chunk
+                return True
+        self.eof = True
+        tail = self._utf8.decode(b"", final=True)
+        self.buf += tail
+        return bool(tail)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of stream)."""
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_array(reader: _ChunkReader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        sep = reader.peek()
+        if sep == ",":
+            reader.pos += 1
+        elif sep == "]":
+            return
+        else:
+            raise ValueError(f"Malformed JSON array (found {sep!r})")
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], key: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array from a chunked body.
+
+    key=None streams a top-level array; otherwise the array stored under
+    that top-level object key is streamed and preceding keys are skipped.
+    """
+    reader = _ChunkReader(chunks)
+    if key is None:
+        yield from _iter_array(reader)
+        return
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            yield from _iter_array(reader)
+            return
+        reader.value()  # skip unrelated top-level values (legal notice, counts)
+        sep = reader.peek()
+        if sep == ",":
+            reader.pos += 1
+        elif sep == "}":
+            return
+        else:
+            raise ValueError(f"Malformed JSON object (found {sep!r})")
+
+
+def iter_response_items(resp, key: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Stream array elements from a requests.Response opened with stream=True.
+    The caller is responsible for resp.close() (early exit leaves the body unread).
+    """
+    return iter_json_array(resp.iter_content(chunk_size=chunk_size), key=key)
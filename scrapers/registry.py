@@ -0,0 +1,203 @@
+"""
+Job source registry and concurrent fan-out.
+
+Every scraper is registered once with its capabilities and exposed through
+the app.core.interfaces.JobSource protocol (fetch_jobs -> List[JobResult]),
+regardless of which scraper stack it comes from. fan_out() queries sources
+concurrently, each on its own worker, under one global deadline: a slow or
+hanging source is dropped from the result instead of delaying the others.
+
+Sources registered with default=False are only used when asked for by
+name; they are alternative fetchers of a feed another source already
+covers, so fetching both would ingest that feed twice.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import SCRAPE_DEADLINE_SECONDS
+from app.core.interfaces import JobResult, SourceCapabilities
+from app.core.logging import logger
+
+
+class FunctionSource:
+    """Adapts a scraper function to the JobSource protocol."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[str, int], List[Any]],
+        capabilities: SourceCapabilities = SourceCapabilities(),
+        label: Optional[str] = None,
+        convert: Optional[Callable[[str, Any], JobResult]] = None,
+        default: bool = True,
+    ) -> None:
+        self.name = name
+        self.label = label or name
+        self.capabilities = capabilities
+        self.default = default
+        self._fetch = fetch
+        self._convert = convert
+
+    def fetch_jobs(self, query: str, limit: int = 10) -> List[JobResult]:
+        items = self._fetch(query, limit)
+        if self._convert is None:
+            return list(items)
+        return [self._convert(self.name, item) for item in items]
+
+    def __repr__(self) -> str:
+        return f"FunctionSource({self.name!r}, {self.capabilities})"
+
+
+def from_unified_dict(source: str, item: Dict[str, Any]) -> JobResult:
+    """Convert a unified_scraper dict into a JobResult (original dict kept in raw_data)."""
+    skills = item.get("skills") or ""
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",")]
+    summary = item.get("summary") or ""
+    return JobResult(
+        title=item.get("title") or "",
+        company=item.get("company") or "",
+        location=item.get("location") or "Remote",
+        description=summary,
+        url=item.get("source_url") or "",
+        source=source,
+        skills=[s for s in skills if s],
+        raw_text=summary,
+        raw_data=item,
+    )
+
+
+# ---------------------------------------------------------
+# Registry
+# ---------------------------------------------------------
+
+_REGISTRY: Dict[str, FunctionSource] = {}
+
+
+def register_source(source: FunctionSource, replace: bool = False) -> FunctionSource:
+    if source.name in _REGISTRY and not replace:
+        raise ValueError(f"Job source '{source.name}' is already registered")
+    _REGISTRY[source.name] = source
+    return source
+
+
+def unregister_source(name: str) -> None:
+    _REGISTRY.pop(name, None)
+
+
+def get_source(name: str) -> FunctionSource:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown job source '{name}'. Registered: {', '.join(_REGISTRY)}") from None
+
+
+def list_sources() -> List[FunctionSource]:
+    return list(_REGISTRY.values())
+
+
+def default_sources() -> List[FunctionSource]:
+    """The sources used when none are named: one per feed."""
+    return [s for s in _REGISTRY.values() if s.default]
+
+
+# ---------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------
+
+@dataclass
+class FanOutResult:
+    jobs: Dict[str, List[JobResult]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    def all_jobs(self) -> List[JobResult]:
+        return [job for jobs in self.jobs.values() for job in jobs]
+
+
+def fan_out(
+    query: str,
+    limit: int = 10,
+    names: Optional[Iterable[str]] = None,
+    deadline: Optional[float] = None,
+) -> FanOutResult:
+    """
+    Fetch from the given sources (default: default_sources()) concurrently.
+    Sources still running when the deadline expires are reported in
+    timed_out and their results discarded; the call itself never waits longer.
+    """
+    sources = [get_source(n) for n in names] if names is not None else default_sources()
+    deadline = SCRAPE_DEADLINE_SECONDS if deadline is None else deadline
+    result = FanOutResult()
+    if not sources:
+        return result
+
+    # Each worker returns its own (jobs, error, seconds); workers abandoned at
+    # the deadline keep running but never touch `result`
+    def timed_fetch(source: FunctionSource):
+        start = time.perf_counter()
+        try:
+            return source.fetch_jobs(query, limit), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    # One worker per source so no source queues behind another
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="job-source")
+    try:
+        futures = {executor.submit(timed_fetch, s): s for s in sources}
+        done, _ = wait(futures, timeout=deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for future, source in futures.items():
+        if future not in done:
+            result.timed_out.append(source.name)
+            logger.warning(f"[Sources] {source.name} missed the {deadline:.1f}s deadline")
+            continue
+        jobs, error, seconds = future.result()
+        result.durations[source.name] = seconds
+        if error is not None:
+            result.errors[source.name] = str(error)
+            logger.error(f"[Sources] {source.name} failed: {error}")
+        else:
+            result.jobs[source.name] = jobs
+
+    return result
+
+
+# ---------------------------------------------------------
+# Built-in sources
+# ---------------------------------------------------------
+
+def _register_builtin_sources() -> None:
+    from scrapers.timesjobs_scraper import fetch_timesjobs
+    from scrapers.remoteok_scraper import fetch_remoteok
+    from scrapers.remotive_scraper import fetch_remotive
+    from scrapers import unified_scraper
+
+    # remotive/remoteok are the RawJob feed scrapers (whole feed, filtered by
+    # title here); the *_api sources are unified_scraper's fetchers of the same
+    # feeds, which filter server-side (Remotive `search`, RemoteOK `tag`) and
+    # retry, so they are the default source of each pair.
+    builtin = [
+        FunctionSource("timesjobs", fetch_timesjobs, SourceCapabilities(server_side_search=True), label="TimesJobs"),
+        FunctionSource("remoteok", fetch_remoteok, SourceCapabilities(incremental=True), label="RemoteOK", default=False),
+        FunctionSource("remotive", fetch_remotive, SourceCapabilities(), label="Remotive", default=False),
+        FunctionSource("remoteok_api", unified_scraper.fetch_remoteok, SourceCapabilities(server_side_search=True, incremental=True),
+                       label="RemoteOK", convert=from_unified_dict),
+        FunctionSource("remotive_api", unified_scraper.fetch_remotive, SourceCapabilities(server_side_search=True),
+                       label="Remotive", convert=from_unified_dict),
+        FunctionSource("arbeitnow", unified_scraper.fetch_arbeitnow, SourceCapabilities(pagination=True), label="Arbeitnow", convert=from_unified_dict),
+        FunctionSource("weworkremotely", unified_scraper.fetch_weworkremotely, SourceCapabilities(incremental=True), label="WeWorkRemotely", convert=from_unified_dict),
+        FunctionSource("jobicy", unified_scraper.fetch_jobicy, SourceCapabilities(incremental=True), label="Jobicy", convert=from_unified_dict),
+    ]
+    for source in builtin:
+        register_source(source)
+
+
+_register_builtin_sources()
@@ -1,7 +1,8 @@
-from typing import List
+from typing import Iterator, List
 import requests
 
 from scrapers.base import RawJob, clean_text
+from scrapers.json_stream import iter_response_items
 
 
 from app.core.logging import logger
@@ -9,35 +10,37 @@ from app.core.logging import logger
 API_URL = "https://remoteok.com/api"
 
 
-def fetch_remoteok(query: str, max_jobs: int = 20) -> List[RawJob]:
+def iter_remoteok(query: str, max_jobs: int = 20) -> Iterator[RawJob]:
+    """
+    Stream matching jobs from the RemoteOK feed.
+    The payload is parsed incrementally and the download stops after max_jobs matches.
+    """
     try:
-        resp = requests.get(API_URL, timeout=15, headers={"User-Agent": "JobSwap/1.0"}) # RemoteOK requires UA often
+        resp = requests.get(API_URL, timeout=15, headers={"User-Agent": "JobSwap/1.0"}, stream=True) # RemoteOK requires UA often
         resp.raise_for_status()
-        data = resp.json()
     except Exception as e:
         logger.error(f"Error fetching RemoteOK: {e}")
-        return []
-
-    if not isinstance(data, list):
-        return []
+        return
 
-    jobs: List[RawJob] = []
+    found = 0
+    try:
+        for idx, item in enumerate(iter_response_items(resp)):
+            if idx == 0 or not isinstance(item, dict):  # first item is metadata
+                continue
 
-    for item in data[1:]:  # first item is metadata
-        title = clean_text(item.get("position") or item.get("title"))
-        if query.lower() not in (title or "").lower():
-            continue
+            title = clean_text(item.get("position") or item.get("title"))
+            if query.lower() not in (title or "").lower():
+                continue
 
-        company = clean_text(item.get("company"))
-        url = item.get("url") or item.get("apply_url") or ""
-        location = clean_text(item.get("location") or "Remote")
+            company = clean_text(item.get("company"))
+            url = item.get("url") or item.get("apply_url") or ""
+            location = clean_text(item.get("location") or "Remote")
 
-        description = clean_text(item.get("description") or "")
-        tags = item.get("tags") or []
-        skills = [t for t in tags if isinstance(t, str)]
+            description = clean_text(item.get("description") or "")
+            tags = item.get("tags") or []
+            skills = [t for t in tags if isinstance(t, str)]
 
-        jobs.append(
-            RawJob(
+            yield RawJob(
                 title=title,
                 company=company or "Unknown",
                 location=location,
@@ -47,9 +50,15 @@ def fetch_remoteok(query: str, max_jobs: int = 20) -> List[RawJob]:
                 raw_text=description,
                 source="remoteok",
             )
-        )
 
-        if len(jobs) >= max_jobs:
-            break
+            found += 1
+            if found >= max_jobs:
+                break
+    except Exception as e:
+        logger.error(f"Error parsing RemoteOK payload: {e}")
+    finally:
+        resp.close()
+
 
-    return jobs
+def fetch_remoteok(query: str, max_jobs: int = 20) -> List[RawJob]:
+    return list(iter_remoteok(query, max_jobs=max_jobs))
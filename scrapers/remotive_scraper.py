@@ -1,7 +1,8 @@
-from typing import List
+from typing import Iterator, List
 import requests
 
 from scrapers.base import RawJob, clean_text
+from scrapers.json_stream import iter_response_items
 
 
 from app.core.logging import logger
@@ -9,33 +10,37 @@ from app.core.logging import logger
 API_URL = "https://remotive.com/api/remote-jobs"
 
 
-def fetch_remotive(query: str, max_jobs: int = 20) -> List[RawJob]:
+def iter_remotive(query: str, max_jobs: int = 20) -> Iterator[RawJob]:
+    """
+    Stream matching jobs from the Remotive feed.
+    The payload is parsed incrementally and the download stops after max_jobs matches.
+    """
     try:
-        resp = requests.get(API_URL, timeout=15)
+        resp = requests.get(API_URL, timeout=15, stream=True)
         resp.raise_for_status()
-        data = resp.json()
     except Exception as e:
         logger.error(f"Error fetching Remotive: {e}")
-        return []
+        return
 
-    jobs_raw = data.get("jobs", [])
-    jobs: List[RawJob] = []
+    found = 0
+    try:
+        for item in iter_response_items(resp, key="jobs"):
+            if not isinstance(item, dict):
+                continue
 
-    for item in jobs_raw:
-        title = clean_text(item.get("title"))
-        if query.lower() not in (title or "").lower():
-            continue
+            title = clean_text(item.get("title"))
+            if query.lower() not in (title or "").lower():
+                continue
 
-        company = clean_text(item.get("company_name"))
-        url = item.get("url") or ""
-        location = clean_text(item.get("candidate_required_location") or "Remote")
-        description = clean_text(item.get("description") or "")
+            company = clean_text(item.get("company_name"))
+            url = item.get("url") or ""
+            location = clean_text(item.get("candidate_required_location") or "Remote")
+            description = clean_text(item.get("description") or "")
 
-        tags = item.get("tags") or []
-        skills = [t for t in tags if isinstance(t, str)]
+            tags = item.get("tags") or []
+            skills = [t for t in tags if isinstance(t, str)]
 
-        jobs.append(
-            RawJob(
+            yield RawJob(
                 title=title,
                 company=company or "Unknown",
                 location=location,
@@ -45,9 +50,15 @@ def fetch_remotive(query: str, max_jobs: int = 20) -> List[RawJob]:
                 raw_text=description,
                 source="remotive",
             )
-        )
 
-        if len(jobs) >= max_jobs:
-            break
+            found += 1
+            if found >= max_jobs:
+                break
+    except Exception as e:
+        logger.error(f"Error parsing Remotive payload: {e}")
+    finally:
+        resp.close()
 
-    return jobs
+
+def fetch_remotive(query: str, max_jobs: int = 20) -> List[RawJob]:
+    return list(iter_remotive(query, max_jobs=max_jobs))
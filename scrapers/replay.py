@@ -0,0 +1,252 @@
+"""
+Record/replay harness for scraper HTTP traffic.
+
+Capture live responses once:
+
+    with recording("tests/fixtures/scrapers/python"):
+        fetch_all_sources("python")
+
+Replay them offline from a local stand-in server, optionally with
+injected latency and failures:
+
+    with replaying("tests/fixtures/scrapers/python", latency=0.05, error_rate=0.2):
+        fetch_all_sources("python")
+
+Both requests (scrapers/*) and feedparser (RSS sources in
+unified_scraper) are intercepted, so scrapers run unmodified.
+
+The checked-in tests/fixtures/scrapers/python set is synthetic: payloads
+written by hand in each source's response shape, stored in the same
+index.json + body-file layout recording() writes. They are not captured
+traffic and will drift from the live sites; re-record to compare.
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+import feedparser
+import requests
+
+from app.core.logging import logger
+
+INDEX_FILE = "index.json"
+
+_ORIGINAL_REQUEST = requests.Session.request
+_ORIGINAL_FEED_PARSE = feedparser.parse
+
+
+def request_key(method: str, url: str, params=None) -> str:
+    """Stable fixture key: METHOD + URL with query parameters sorted."""
+    if params:
+        url = requests.Request(method, url, params=params).prepare().url
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+
+
+class FixtureStore:
+    """Directory of responses (recorded or written by hand): index.json plus one body file per request."""
+
+    def __init__(self, root) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+        self.entries: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            self.entries = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self._lock = threading.Lock()
+
+    def save(self, key: str, status: int, content_type: str, body: bytes) -> None:
+        with self._lock:
+            entry = self.entries.get(key) or {"file": f"{len(self.entries) + 1:04d}.body"}
+            entry.update({"status": status, "content_type": content_type})
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / entry["file"]).write_bytes(body)
+            self.entries[key] = entry
+            self.index_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+
+    def load(self, key: str) -> Optional[Tuple[int, str, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry["status"], entry["content_type"], (self.root / entry["file"]).read_bytes()
+
+
+# ---------------------------------------------------------
+# Recording
+# ---------------------------------------------------------
+
+@contextmanager
+def recording(fixture_dir) -> Iterator[FixtureStore]:
+    """Let traffic through to the real sites and store every response."""
+    store = FixtureStore(fixture_dir)
+
+    def recording_request(session, method, url, params=None, **kwargs):
+        resp = _ORIGINAL_REQUEST(session, method, url, params=params, **kwargs)
+        store.save(
+            request_key(method, url, params),
+            resp.status_code,
+            resp.headers.get("Content-Type", "application/octet-stream"),
+            resp.content,  # reads the full body even for stream=True
+        )
+        return resp
+
+    def recording_parse(url_or_data, *args, **kwargs):
+        if isinstance(url_or_data, str) and url_or_data.startswith("http"):
+            resp = requests.get(url_or_data, timeout=15)
+            return _ORIGINAL_FEED_PARSE(resp.content, *args, **kwargs)
+        return _ORIGINAL_FEED_PARSE(url_or_data, *args, **kwargs)
+
+    requests.Session.request = recording_request
+    feedparser.parse = recording_parse
+    try:
+        yield store
+    finally:
+        requests.Session.request = _ORIGINAL_REQUEST
+        feedparser.parse = _ORIGINAL_FEED_PARSE
+        logger.info(f"[replay] Recorded {len(store.entries)} responses to {store.root}")
+
+
+# ---------------------------------------------------------
+# Replay server
+# ---------------------------------------------------------
+
+@dataclass
+class FaultProfile:
+    """Latency and failures injected by the stand-in server."""
+    latency: float = 0.0        # seconds added to every response
+    jitter: float = 0.0         # extra uniform random delay in [0, jitter]
+    error_rate: float = 0.0     # fraction of requests answered with error_status
+    error_status: int = 503
+    seed: Optional[int] = None
+
+
+class ReplayServer:
+    """Serves a FixtureStore over HTTP on 127.0.0.1 from a background thread."""
+
+    def __init__(self, store: FixtureStore, faults: Optional[FaultProfile] = None) -> None:
+        self.store = store
+        self.faults = faults or FaultProfile()
+        self._rng = random.Random(self.faults.seed)
+        self._rng_lock = threading.Lock()
+        self.requests_served = 0
+        self.errors_injected = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/replay?key={quote(key, safe='')}"
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._rng_lock:
+            delay = self.faults.latency + self._rng.uniform(0, self.faults.jitter)
+            fail = self._rng.random() < self.faults.error_rate
+            self.requests_served += 1
+            if fail:
+                self.errors_injected += 1
+        if delay:
+            time.sleep(delay)
+
+        key = unquote(urlsplit(handler.path).query.partition("key=")[2])
+        recorded = self.store.load(key)
+        if fail:
+            status, content_type, body = self.faults.error_status, "text/plain", b"injected failure"
+        elif recorded is None:
+            status, content_type, body = 404, "text/plain", f"no fixture for {key}".encode()
+        else:
+            status, content_type, body = recorded
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> "ReplayServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@contextmanager
+def replaying(
+    fixture_dir,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    seed: Optional[int] = None,
+) -> Iterator[ReplayServer]:
+    """Redirect scraper traffic to a local server serving recorded fixtures."""
+    store = FixtureStore(fixture_dir)
+    server = ReplayServer(store, FaultProfile(latency, jitter, error_rate, error_status, seed)).start()
+
+    def replay_request(session, method, url, params=None, **kwargs):
+        local_url = server.url_for(request_key(method, url, params))
+        kwargs.pop("headers", None)
+        return _ORIGINAL_REQUEST(session, method, local_url, **kwargs)
+
+    def replay_parse(url_or_data, *args, **kwargs):
+        if isinstance(url_or_data, str) and url_or_data.startswith("http"):
+            try:
+                with requests.Session() as session:
+                    resp = _ORIGINAL_REQUEST(session, "GET", server.url_for(request_key("GET", url_or_data)), timeout=15)
+                data = resp.content if resp.status_code == 200 else b""
+            except requests.RequestException:
+                data = b""
+            return _ORIGINAL_FEED_PARSE(data, *args, **kwargs)
+        return _ORIGINAL_FEED_PARSE(url_or_data, *args, **kwargs)
+
+    requests.Session.request = replay_request
+    feedparser.parse = replay_parse
+    try:
+        yield server
+    finally:
+        requests.Session.request = _ORIGINAL_REQUEST
+        feedparser.parse = _ORIGINAL_FEED_PARSE
+        server.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from scrapers.runner import fetch_all_sources
+    from scrapers.unified_scraper import fetch_all_jobs
+
+    parser = argparse.ArgumentParser(description="Record live scraper responses to a fixture directory.")
+    parser.add_argument("fixture_dir")
+    parser.add_argument("--query", default="python")
+    parser.add_argument("--max-jobs", type=int, default=20)
+    args = parser.parse_args()
+
+    with recording(args.fixture_dir) as store:
+        fetch_all_sources(args.query, max_jobs_per_source=args.max_jobs)
+        fetch_all_jobs(args.query, limit_per_source=args.max_jobs)
+    print(f"Recorded {len(store.entries)} responses to {store.root}")
@@ -1,33 +1,33 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional
 
-from scrapers.base import RawJob
 from scrapers.normalizer import normalize_raw_job
-from scrapers.timesjobs_scraper import fetch_timesjobs
-from scrapers.remoteok_scraper import fetch_remoteok
-from scrapers.remotive_scraper import fetch_remotive
+from scrapers.registry import fan_out
 
+DEFAULT_SOURCES = ["timesjobs", "remoteok", "remotive"]
 
-def fetch_all_sources(query: str, max_jobs_per_source: int = 20) -> List[Dict]:
-    raw_jobs: List[RawJob] = []
 
-    # Each source isolated so one failure doesn't kill all.
-    sources = [
-        ("timesjobs", fetch_timesjobs),
-        ("remoteok", fetch_remoteok),
-        ("remotive", fetch_remotive),
-    ]
+def fetch_all_sources(
+    query: str,
+    max_jobs_per_source: int = 20,
+    sources: Optional[Iterable[str]] = None,
+    deadline: Optional[float] = None,
+) -> List[Dict]:
+    # Sources run concurrently under one deadline; each is isolated so one
+    # failure (or a hanging site) doesn't kill or delay the others.
+    names = list(sources) if sources is not None else DEFAULT_SOURCES
+    print(f"Scraping {', '.join(names)}...")
+    result = fan_out(query, limit=max_jobs_per_source, names=names, deadline=deadline)
 
-    for name, func in sources:
-        try:
-            print(f"Scraping {name}...")
-            jobs = func(query=query, max_jobs=max_jobs_per_source)
-            print(f"  > Found {len(jobs)} jobs")
-            raw_jobs.extend(jobs)
-        except Exception as e:
-            print(f"[SCRAPER ERROR] {name}: {e}")
+    for name in names:
+        if name in result.jobs:
+            print(f"  > {name}: found {len(result.jobs[name])} jobs in {result.durations.get(name, 0):.2f}s")
+        elif name in result.errors:
+            print(f"[SCRAPER ERROR] {name}: {result.errors[name]}")
+        else:
+            print(f"[SCRAPER TIMEOUT] {name}")
 
     normalized: List[Dict] = []
-    for job in raw_jobs:
+    for job in result.all_jobs():
         try:
             normalized.append(normalize_raw_job(job))
         except Exception as e:
@@ -1,8 +1,8 @@
-from typing import List
+from typing import List, Optional
 import requests
-from bs4 import BeautifulSoup
 
 from scrapers.base import RawJob, clean_text
+from scrapers.html_text import get_soup, lxml
 
 
 from app.core.logging import logger
@@ -10,22 +10,61 @@ from app.core.logging import logger
 BASE_URL = "https://www.timesjobs.com/candidate/job-search.html"
 
 
-def fetch_timesjobs(query: str, max_jobs: int = 20) -> List[RawJob]:
-    params = {
-        "searchType": "personalizedSearch",
-        "from": "submit",
-        "txtKeywords": query,
-        "txtLocation": "India",
-    }
+def _xp_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
 
-    try:
-        resp = requests.get(BASE_URL, params=params, timeout=15)
-        resp.raise_for_status()
-    except Exception as e:
-        logger.error(f"Error fetching TimesJobs: {e}")
-        return []
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+# XPath equivalents of the CSS selectors below, for the lxml fast path
+_XP_CARDS = f"//*[{_xp_class('job-bx')}]"
+_XP_TITLE = ".//h2//a"
+_XP_COMPANY = f".//*[{_xp_class('joblist-comp-name')}]"
+_XP_LOCATION = f".//*[{_xp_class('sjw')} and {_xp_class('dp8')}]//span"
+_XP_DESC = f".//*[{_xp_class('list-job-dtl')}]"
+
+
+def _first(el, xpath: str):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+
+def _card_to_job(title: str, company: str, location: str, url: str, desc: str) -> RawJob:
+    return RawJob(
+        title=title,
+        company=company,
+        location=location,
+        skills=[],  # we let normalizer infer if needed
+        description=desc,
+        url=url,
+        raw_text=desc,
+        source="timesjobs",
+    )
+
+
+def _parse_cards_lxml(markup: str, max_jobs: int) -> List[RawJob]:
+    root = lxml.html.fromstring(markup)
+    jobs: List[RawJob] = []
+
+    for card in root.xpath(_XP_CARDS)[:max_jobs]:
+        title_el = _first(card, _XP_TITLE)
+        company_el = _first(card, _XP_COMPANY)
+        loc_el = _first(card, _XP_LOCATION)
+        desc_el = _first(card, _XP_DESC)
+
+        jobs.append(
+            _card_to_job(
+                title=clean_text(title_el.text_content()) if title_el is not None else "",
+                company=clean_text(company_el.text_content()) if company_el is not None else "",
+                location=clean_text(loc_el.text_content()) if loc_el is not None else "India",
+                url=title_el.get("href", "") if title_el is not None else "",
+                desc=clean_text(desc_el.text_content()) if desc_el is not None else "",
+            )
+        )
+
+    return jobs
+
+
+def _parse_cards_bs4(markup: str, max_jobs: int) -> List[RawJob]:
+    soup = get_soup(markup)
     cards = soup.select(".job-bx")  # you may tweak this
 
     jobs: List[RawJob] = []
@@ -34,26 +73,47 @@ def fetch_timesjobs(query: str, max_jobs: int = 20) -> List[RawJob]:
         title_el = card.select_one("h2 a")
         company_el = card.select_one(".joblist-comp-name")
         loc_el = card.select_one(".sjw.dp8 span")
-
-        title = clean_text(title_el.get_text()) if title_el else ""
-        company = clean_text(company_el.get_text()) if company_el else ""
-        location = clean_text(loc_el.get_text()) if loc_el else "India"
-        url = title_el["href"] if title_el and title_el.has_attr("href") else ""
-
         desc_el = card.select_one(".list-job-dtl")
-        desc = clean_text(desc_el.get_text()) if desc_el else ""
 
         jobs.append(
-            RawJob(
-                title=title,
-                company=company,
-                location=location,
-                skills=[],  # we let normalizer infer if needed
-                description=desc,
-                url=url,
-                raw_text=desc,
-                source="timesjobs",
+            _card_to_job(
+                title=clean_text(title_el.get_text()) if title_el else "",
+                company=clean_text(company_el.get_text()) if company_el else "",
+                location=clean_text(loc_el.get_text()) if loc_el else "India",
+                url=title_el["href"] if title_el and title_el.has_attr("href") else "",
+                desc=clean_text(desc_el.get_text()) if desc_el else "",
             )
         )
 
-    return jobs
\ No newline at end of file
+    return jobs
+
+
+def parse_search_page(markup: str, max_jobs: int = 20, backend: Optional[str] = None) -> List[RawJob]:
+    """
+    Parse job cards from a TimesJobs search page.
+    Uses lxml XPath when available, BeautifulSoup otherwise (or on failure).
+    """
+    if backend != "bs4" and lxml is not None:
+        try:
+            return _parse_cards_lxml(markup, max_jobs)
+        except Exception as e:
+            logger.warning(f"lxml parse of TimesJobs page failed ({e}), falling back to bs4")
+    return _parse_cards_bs4(markup, max_jobs)
+
+
+def fetch_timesjobs(query: str, max_jobs: int = 20) -> List[RawJob]:
+    params = {
+        "searchType": "personalizedSearch",
+        "from": "submit",
+        "txtKeywords": query,
+        "txtLocation": "India",
+    }
+
+    try:
+        resp = requests.get(BASE_URL, params=params, timeout=15)
+        resp.raise_for_status()
+    except Exception as e:
+        logger.error(f"Error fetching TimesJobs: {e}")
+        return []
+
+    return parse_search_page(resp.text, max_jobs=max_jobs)
@@ -2,10 +2,12 @@
 import requests
 import feedparser
 from typing import List, Dict, Any, Optional
+from itertools import islice
 import time
 import random
 
 from app.core.logging import logger
+from scrapers.json_stream import iter_response_items
 
 from app.core.resilience import retry_external_api
 
@@ -24,14 +26,15 @@ def fetch_remoteok(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     try:
         # User-Agent is often required
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            # First element is legal text, skip it
-            jobs = data[1:] if len(data) > 0 else []
+        response = requests.get(url, params=params, headers=headers, timeout=10, stream=True)
+        try:
+            if response.status_code != 200:
+                return []
+            # First element is legal text, skip it. Stop reading after `limit` jobs.
+            jobs = islice(iter_response_items(response), 1, limit + 1)
             
             normalized = []
-            for job in jobs[:limit]:
+            for job in jobs:
                 normalized.append({
                     "title": job.get("position", ""),
                     "company": job.get("company", ""),
@@ -42,6 +45,8 @@ def fetch_remoteok(query: str, limit: int = 10) -> List[Dict[str, Any]]:
                     "source": "RemoteOK"
                 })
             return normalized
+        finally:
+            response.close()
     except Exception as e:
         logger.error(f"Error fetching RemoteOK: {e}")
         # Re-raise for retry logic to catch it, unless we really want to just fail silently.
@@ -60,19 +65,20 @@ def fetch_arbeitnow(query: str, limit: int = 10) -> List[Dict[str, Any]]:
     url = "https://arbeitnow.com/api/job-board-api"
     
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = data.get("data", [])
+        response = requests.get(url, timeout=10, stream=True)
+        try:
+            if response.status_code != 200:
+                return []
+            jobs = iter_response_items(response, key="data")
             
             # Simple keyword filtering since API doesn't support search query params directly in free tier easily
-            filtered = []
-            for job in jobs:
-                if not query or query.lower() in job.get("title", "").lower() or query.lower() in job.get("tags", []):
-                    filtered.append(job)
+            filtered = (
+                job for job in jobs
+                if not query or query.lower() in job.get("title", "").lower() or query.lower() in job.get("tags", [])
+            )
             
             normalized = []
-            for job in filtered[:limit]:
+            for job in islice(filtered, limit):
                 normalized.append({
                     "title": job.get("title", ""),
                     "company": job.get("company_name", ""),
@@ -83,6 +89,8 @@ def fetch_arbeitnow(query: str, limit: int = 10) -> List[Dict[str, Any]]:
                     "source": "Arbeitnow"
                 })
             return normalized
+        finally:
+            response.close()
     except Exception as e:
         logger.error(f"Error fetching Arbeitnow: {e}")
         raise e
@@ -138,7 +146,7 @@ def fetch_jobicy(query: str, limit: int = 10) -> List[Dict[str, Any]]:
 
              normalized.append({
                 "title": entry.title,
-                "company": "See Link",
+                "company": entry.get("author") or "See Link",
                 "location": "Remote",
                 "skills": "Remote",
                 "summary": entry.summary[:500],
@@ -163,13 +171,14 @@ def fetch_remotive(query: str, limit: int = 10) -> List[Dict[str, Any]]:
         params["search"] = query
         
     try:
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = data.get("jobs", [])
+        response = requests.get(url, params=params, timeout=10, stream=True)
+        try:
+            if response.status_code != 200:
+                return []
+            jobs = islice(iter_response_items(response, key="jobs"), limit)
             
             normalized = []
-            for job in jobs[:limit]:
+            for job in jobs:
                 normalized.append({
                     "title": job.get("title", ""),
                     "company": job.get("company_name", ""),
@@ -180,29 +189,42 @@ def fetch_remotive(query: str, limit: int = 10) -> List[Dict[str, Any]]:
                     "source": "Remotive"
                 })
             return normalized
+        finally:
+            response.close()
     except Exception as e:
         logger.error(f"Error fetching Remotive: {e}")
         raise e
     return []
 
-def fetch_all_jobs(query: str, limit_per_source: int = 5) -> List[Dict[str, Any]]:
-    """Aggregate jobs from all sources."""
-    all_jobs = []
-    
-    # 1. Remotive (High Quality)
-    all_jobs.extend(fetch_remotive(query, limit_per_source))
-    
-    # 2. RemoteOK
-    all_jobs.extend(fetch_remoteok(query, limit_per_source))
-    
-    # 3. Arbeitnow
-    all_jobs.extend(fetch_arbeitnow(query, limit_per_source))
-    
-    # 4. WeWorkRemotely
-    all_jobs.extend(fetch_weworkremotely(query, limit_per_source))
-    
-    # 5. Jobicy
-    all_jobs.extend(fetch_jobicy(query, limit_per_source))
+UNIFIED_SOURCES = ["remotive_api", "remoteok_api", "arbeitnow", "weworkremotely", "jobicy"]
+
+
+def to_unified_dict(job, label: str) -> Dict[str, Any]:
+    """Convert a registry JobResult back into the unified dict shape."""
+    if isinstance(job.raw_data, dict) and "source_url" in job.raw_data:
+        return job.raw_data
+    return {
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "skills": ", ".join(job.skills),
+        "summary": (job.description or "")[:500],
+        "source_url": job.url,
+        "source": label,
+    }
+
+
+def fetch_all_jobs(query: str, limit_per_source: int = 5, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Aggregate jobs from all sources (fetched concurrently through the source registry)."""
+    from scrapers.registry import fan_out, get_source
+
+    result = fan_out(query, limit=limit_per_source, names=UNIFIED_SOURCES, deadline=deadline)
+
+    all_jobs = [
+        to_unified_dict(job, get_source(name).label)
+        for name, jobs in result.jobs.items()
+        for job in jobs
+    ]
     
     # Shuffle to mix sources
     random.shuffle(all_jobs)
@@ -1,5 +1,13 @@
 import sqlite3
 import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.migrations import apply_migrations
 
 DB_PATH = "jobswipe.db"
 
@@ -10,7 +18,7 @@ def apply_base_schema():
         with open("database/schema.sql", "r") as f:
             conn.executescript(f.read())
         conn.commit()
-        print("✅ Schema applied.")
+        print(f"✅ Schema applied (version {apply_migrations(conn)}).")
     except Exception as e:
         print(f"❌ Error applying schema: {e}")
     finally:
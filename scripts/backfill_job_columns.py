@@ -0,0 +1,42 @@
+"""
+Fill the precomputed scoring columns for jobs stored before they existed.
+
+New jobs get clean_description, title_norm, location_norm,
+description_length and title_length at insert; older rows fall back to
+computing them per request until this has been run. Safe to re-run or
+interrupt: only rows with title_norm NULL are touched, a batch at a time.
+
+Usage:
+    python scripts/backfill_job_columns.py [path/to/jobswipe.db] [--batch-size N]
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import DB_PATH
+from database.migrations import apply_migrations, backfill_job_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill precomputed job columns.")
+    parser.add_argument("db_path", nargs="?", default=DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db_path)
+    try:
+        apply_migrations(conn)
+        filled = backfill_job_columns(conn, batch_size=args.batch_size)
+        print(f"Backfilled {filled} jobs")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
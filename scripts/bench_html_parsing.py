@@ -0,0 +1,72 @@
+"""
+Benchmark HTML parsing backends on recorded pages.
+
+Usage:
+    python scripts/bench_html_parsing.py [fixtures_dir] [--iterations N]
+
+Reports, per recorded page:
+  - plain-text extraction time for every html_text backend
+  - full TimesJobs card parsing (BeautifulSoup vs lxml XPath) for search pages
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scrapers.html_text import BACKENDS, available_backends, lxml
+from scrapers.timesjobs_scraper import parse_search_page
+
+DEFAULT_FIXTURES = project_root / "tests" / "fixtures" / "html"
+
+
+def _time_per_call(func, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def bench_page(path: Path, iterations: int) -> None:
+    markup = path.read_text(encoding="utf-8")
+    print(f"\n{path.name} ({len(markup) / 1024:.1f} KiB, {iterations} iterations)")
+
+    baseline = None
+    for name in ["bs4"] + [b for b in available_backends() if b != "bs4"]:
+        ms = _time_per_call(BACKENDS[name], markup, iterations)
+        baseline = baseline or ms
+        print(f"  text/{name:<8} {ms:8.3f} ms/page   x{baseline / ms:5.1f}")
+
+    if "job-bx" not in markup:
+        return
+
+    backends = ["bs4"] + (["lxml"] if lxml is not None else [])
+    baseline = None
+    for name in backends:
+        ms = _time_per_call(lambda m: parse_search_page(m, max_jobs=100, backend=name), markup, iterations)
+        baseline = baseline or ms
+        print(f"  cards/{name:<7} {ms:8.3f} ms/page   x{baseline / ms:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures_dir", nargs="?", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    pages = sorted(Path(args.fixtures_dir).glob("*.html"))
+    if not pages:
+        print(f"No recorded pages found in {args.fixtures_dir}")
+        return
+
+    print(f"Backends available: {', '.join(available_backends())}")
+    for page in pages:
+        bench_page(page, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Offline throughput benchmark for the scraper pipeline.
+
+Replays a fixture directory (see scrapers/replay.py) through a local
+stand-in server and reports jobs/sec for each stage:
+
+    fetch      scrapers/* (RawJob stack), unified_scraper sources, and the
+               concurrent registry fan-out over every registered source
+    normalize  scrapers.normalizer.normalize_raw_job
+    insert     database.db_manager.insert_jobs_bulk into a scratch SQLite DB
+
+The default fixtures are synthetic, hand-written payloads rather than
+recorded traffic; pass --fixtures with a recording for numbers on real pages.
+
+Usage:
+    python scripts/bench_scrapers.py [--fixtures DIR] [--query python]
+        [--max-jobs 50] [--scale 20] [--latency 0.05] [--error-rate 0.1]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Insert into a scratch database, never the real one
+_SCRATCH_DIR = tempfile.mkdtemp(prefix="jobswap-bench-")
+os.environ["DB_PATH"] = os.path.join(_SCRATCH_DIR, "bench.db")
+
+from scrapers.replay import FixtureStore, replaying
+from scrapers.normalizer import normalize_raw_job
+from scrapers.timesjobs_scraper import fetch_timesjobs
+from scrapers.remoteok_scraper import fetch_remoteok
+from scrapers.remotive_scraper import fetch_remotive
+from scrapers import unified_scraper
+from scrapers.registry import fan_out
+from database.db_manager import insert_jobs_bulk
+from database.migrations import apply_migrations
+
+DEFAULT_FIXTURES = project_root / "tests" / "fixtures" / "scrapers" / "python"
+
+RAW_SOURCES = [
+    ("timesjobs", fetch_timesjobs),
+    ("remoteok", fetch_remoteok),
+    ("remotive", fetch_remotive),
+]
+
+UNIFIED_SOURCES = [
+    ("remotive", unified_scraper.fetch_remotive),
+    ("remoteok", unified_scraper.fetch_remoteok),
+    ("arbeitnow", unified_scraper.fetch_arbeitnow),
+    ("weworkremotely", unified_scraper.fetch_weworkremotely),
+    ("jobicy", unified_scraper.fetch_jobicy),
+]
+
+
+def scale_fixtures(src: Path, dst: Path, factor: int) -> None:
+    """Copy fixtures, replicating every JSON job array `factor` times with unique titles/urls."""
+    shutil.copytree(src, dst)
+    store = FixtureStore(dst)
+    for key, entry in store.entries.items():
+        if "json" not in entry["content_type"]:
+            continue
+        path = dst / entry["file"]
+        data = json.loads(path.read_bytes())
+        if isinstance(data, list):
+            head, items = data[:1], data[1:]
+        else:
+            array_key = next(k for k, v in data.items() if isinstance(v, list))
+            head, items = None, data[array_key]
+
+        copies = []
+        for n in range(factor):
+            for item in items:
+                item = dict(item)
+                for field in ("position", "title"):
+                    if field in item:
+                        item[field] = f"{item[field]} #{n}"
+                if "url" in item:
+                    item["url"] = f"{item['url']}?copy={n}"
+                copies.append(item)
+
+        if head is not None:
+            data = head + copies
+        else:
+            data[array_key] = copies
+        path.write_bytes(json.dumps(data).encode())
+
+
+def _report(stage: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"  {stage:<22} {count:7d} jobs  {elapsed * 1000:9.1f} ms  {rate:10.1f} jobs/sec")
+
+
+def run(fixtures: Path, query: str, max_jobs: int, latency: float, error_rate: float) -> None:
+    with replaying(fixtures, latency=latency, error_rate=error_rate, seed=42) as server:
+        print(f"Replaying {len(server.store.entries)} fixture responses from {fixtures}")
+        print(f"Injected latency={latency}s error_rate={error_rate}\n")
+
+        raw_jobs = []
+        start = time.perf_counter()
+        for name, func in RAW_SOURCES:
+            raw_jobs.extend(func(query=query, max_jobs=max_jobs))
+        _report("fetch (scrapers/*)", len(raw_jobs), time.perf_counter() - start)
+
+        unified_jobs = []
+        start = time.perf_counter()
+        for name, func in UNIFIED_SOURCES:
+            try:
+                unified_jobs.extend(func(query, max_jobs))
+            except Exception as e:
+                print(f"  [unified] {name} failed: {e}")
+        _report("fetch (unified)", len(unified_jobs), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = fan_out(query, limit=max_jobs)
+        _report("fetch (fan-out, all)", len(result.all_jobs()), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    normalized = [normalize_raw_job(job) for job in raw_jobs]
+    _report("normalize", len(normalized), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    inserted = len(insert_jobs_bulk(normalized))
+    _report(f"insert ({inserted} new)", len(normalized), time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--query", default="python")
+    parser.add_argument("--max-jobs", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=1, help="replicate JSON job arrays N times")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(os.environ["DB_PATH"])
+    with open(project_root / "database" / "schema.sql", "r") as f:
+        conn.executescript(f.read())
+    apply_migrations(conn)
+    conn.close()
+
+    fixtures = Path(args.fixtures)
+    try:
+        if args.scale > 1:
+            scaled = Path(_SCRATCH_DIR) / "fixtures"
+            scale_fixtures(fixtures, scaled, args.scale)
+            fixtures = scaled
+        run(fixtures, args.query, args.max_jobs, args.latency, args.error_rate)
+    finally:
+        shutil.rmtree(_SCRATCH_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
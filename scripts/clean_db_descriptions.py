@@ -1,7 +1,14 @@
 
 import sqlite3
-from bs4 import BeautifulSoup
-import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ml.features import JOB_STATIC_COLUMNS, job_static_columns
+from scrapers.html_text import html_to_text
 
 DB_PATH = "database/jobmatcher.db"
 
@@ -11,7 +18,7 @@ def clean_html():
     cursor = conn.cursor()
     
     try:
-        cursor.execute("SELECT id, description FROM jobs")
+        cursor.execute("SELECT id, title, location, description FROM jobs")
         rows = cursor.fetchall()
         
         count = 0
@@ -20,11 +27,15 @@ def clean_html():
             if not raw or "<" not in raw:
                 continue
                 
-            soup = BeautifulSoup(raw, "html.parser")
-            clean_text = soup.get_text(separator=" ")
-            clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-            
-            cursor.execute("UPDATE jobs SET description = ? WHERE id = ?", (clean_text[:2000], row["id"]))
+            clean_text = html_to_text(raw, max_chars=2000)
+            # Serving features stored with the job follow the new description;
+            # the near-duplicate signature is recomputed on the next index load
+            static = job_static_columns({**dict(row), "description": clean_text})
+            assignments = ", ".join(f"{c} = ?" for c in JOB_STATIC_COLUMNS)
+            cursor.execute(
+                f"UPDATE jobs SET description = ?, {assignments}, minhash = NULL WHERE id = ?",
+                (clean_text, *(static[c] for c in JOB_STATIC_COLUMNS), row["id"]),
+            )
             count += 1
             
         conn.commit()
@@ -0,0 +1,74 @@
+"""
+One-off compaction of legacy duplicate jobs.
+
+Jobs stored before dedup keys existed may have duplicates, kept with
+dedup_key NULL by the migration. This merges each into the job it
+duplicates, repointing swipes, messages, interactions and queued
+applications, then deletes it.
+
+On Postgres (after applying database/schema_postgres.sql) it first keys
+the jobs that have no dedup_key yet, the step SQLite's migration does.
+
+Usage:
+    python scripts/compact_jobs.py [path/to/jobswipe.db] [--vacuum]
+    DATABASE_URL=postgres://... python scripts/compact_jobs.py --postgres [--vacuum]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import DB_PATH
+from database.migrations import apply_migrations, backfill_dedup_keys, compact_duplicate_jobs
+
+
+def count_jobs(conn) -> int:
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM jobs")
+    return cur.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge legacy duplicate jobs.")
+    parser.add_argument("db_path", nargs="?", default=DB_PATH)
+    parser.add_argument("--postgres", action="store_true", help="compact the DATABASE_URL database instead")
+    parser.add_argument("--vacuum", action="store_true", help="reclaim space afterwards")
+    args = parser.parse_args()
+
+    if args.postgres:
+        import psycopg2
+
+        url = os.getenv("DATABASE_URL")
+        if not url:
+            parser.error("--postgres needs DATABASE_URL")
+        conn = psycopg2.connect(url)
+    else:
+        conn = sqlite3.connect(args.db_path)
+    try:
+        if args.postgres:
+            backfill_dedup_keys(conn)
+            conn.commit()
+        else:
+            apply_migrations(conn)
+        before = count_jobs(conn)
+        result = compact_duplicate_jobs(conn)
+        after = count_jobs(conn)
+        print(f"Jobs: {before} -> {after} ({result['merged']} merged, {result['rekeyed']} re-keyed)")
+        if args.vacuum:
+            if args.postgres:
+                conn.autocommit = True  # VACUUM cannot run inside a transaction
+                conn.cursor().execute("VACUUM ANALYZE jobs")
+            else:
+                conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
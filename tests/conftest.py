@@ -1,7 +1,12 @@
 import sys
 import asyncio
+import sqlite3
+from pathlib import Path
+
 import pytest
 from app.core.logging import logger
+from database.connection import close_all_pools
+from database.migrations import apply_migrations
 
 # Fix for Windows Asyncio Loop
 @pytest.fixture(scope="session", autouse=True)
@@ -24,3 +29,18 @@ def pytest_configure(config):
     """Configuration for pytest."""
     # Ensure our logger doesn't spam stdout during tests unless we want it
     logger.setLevel("WARNING") 
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Fresh SQLite database built from database/schema.sql, used by both connection helpers."""
+    db_path = tmp_path / "test.db"
+    schema = Path(__file__).resolve().parent.parent / "database" / "schema.sql"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(schema.read_text())
+    apply_migrations(conn)
+    conn.close()
+    monkeypatch.setattr("database.db_manager.DB_PATH", str(db_path))
+    monkeypatch.setattr("app.core.config.DB_PATH", str(db_path))
+    yield db_path
+    close_all_pools()
@@ -0,0 +1,78 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from app.core.security import create_access_token
+from app.main import app
+from database.async_db import run_db
+
+
+def test_run_db_keeps_event_loop_free():
+    def blocking_query(n):
+        time.sleep(0.2)
+        return n, threading.current_thread().name
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_db(blocking_query, n) for n in range(4)))
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(main())
+    assert [n for n, _ in results] == [0, 1, 2, 3]
+    assert all(name.startswith("db") for _, name in results)
+    assert elapsed < 0.6   # ran concurrently, not back to back
+    assert ticks >= 10     # the loop kept running while queries blocked
+
+
+def test_routes_use_async_db(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (1, 'a@example.com', 'x', 'python')")
+    conn.execute("INSERT INTO jobs (id, title, company, location) VALUES (7, 'Dev', 'Acme', 'Remote')")
+    conn.commit()
+    conn.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token(1, 'a@example.com')}"}
+    bad_token = {"Authorization": f"Bearer {create_access_token(99, 'nobody@example.com')}"}
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            swiped = await client.post("/api/swipe", json={"job_id": 7, "action": "save"}, headers=headers)
+            assert swiped.status_code == 200
+
+            saved, sent = await asyncio.gather(
+                client.get("/api/jobs/saved", headers=headers),
+                client.post("/api/chat/7", json={"message": "Hi"}, headers=headers),
+            )
+            assert [job["id"] for job in saved.json()["jobs"]] == [7]
+            assert sent.json()["message"] == "Message sent"
+
+            messages = (await client.get("/api/chat/7", headers=headers)).json()["messages"]
+            assert [m["sender_type"] for m in messages] == ["user", "employer"]
+
+            batch = await client.post(
+                "/api/swipe/batch",
+                json={"swipes": [{"job_id": 7, "action": "skip"}, {"job_id": 7, "action": "apply"}]},
+                headers=headers,
+            )
+            assert batch.json()["recorded"] == 1
+            applied = (await client.get("/api/jobs/applied", headers=headers)).json()["jobs"]
+            assert [job["id"] for job in applied] == [7]
+
+            assert (await client.get("/api/jobs/applied", headers=bad_token)).status_code == 401
+
+    asyncio.run(main())
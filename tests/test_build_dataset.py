@@ -0,0 +1,126 @@
+import random
+import sqlite3
+
+import pandas as pd
+
+from database.db_manager import insert_jobs_bulk
+from ml.build_dataset import build_dataset, featurize_frame
+from ml.features import FEATURE_KEYS, extract_job_features
+
+SKILLS = ["Python", " python", "SQL", "go", "c", "c++", "React", "", " ", "Java", "JavaScript"]
+LOCATIONS = [None, "", "Berlin", "berlin,  DE", "  Remote ", "New York", "york"]
+TITLES = [None, "", "Senior Python  Developer", "junior go engineer", "C Developer", "Lead React/JS dev", "Java\tSenior"]
+SENIORITY = [None, "", "senior", "Junior", "lead"]
+
+
+def _random_pairs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+
+    def skills():
+        if rng.random() < 0.1:
+            return None
+        return ",".join(rng.choice(SKILLS) for _ in range(rng.randint(0, 5)))
+
+    users = [
+        {"skills": skills(), "preferred_location": rng.choice(LOCATIONS), "preferred_seniority": rng.choice(SENIORITY)}
+        for _ in range(n)
+    ]
+    jobs = [
+        {
+            "title": rng.choice(TITLES),
+            "location": rng.choice(LOCATIONS),
+            "skills": skills(),
+            "description": rng.choice([None, "", "short", "<p>long</p>" * rng.randint(1, 800)]),
+        }
+        for _ in range(n)
+    ]
+    return users, jobs
+
+
+def test_featurize_frame_matches_extract_job_features():
+    users, jobs = _random_pairs(2000)
+    df = pd.DataFrame({
+        "user_skills": [u["skills"] for u in users],
+        "user_preferred_location": [u["preferred_location"] for u in users],
+        "user_preferred_seniority": [u["preferred_seniority"] for u in users],
+        "job_title": [j["title"] for j in jobs],
+        "job_location": [j["location"] for j in jobs],
+        "job_skills": [j["skills"] for j in jobs],
+        "job_description": [j["description"] for j in jobs],
+    })
+    expected = pd.DataFrame([extract_job_features(u, j) for u, j in zip(users, jobs)])[FEATURE_KEYS]
+
+    pd.testing.assert_frame_equal(featurize_frame(df), expected)
+
+
+def test_build_dataset_reads_stored_and_legacy_columns(temp_db):
+    users, jobs = _random_pairs(40, seed=1)
+    stored = [
+        {**job, "title": job["title"] or f"Job {i}", "company": f"Acme {i}", "location": job["location"] or "",
+         "skills": [s for s in (job["skills"] or "").split(",") if s.strip()], "url": f"https://x/{i}"}
+        for i, job in enumerate(jobs)
+    ]
+    ids = insert_jobs_bulk([dict(job) for job in stored])
+    assert len(ids) == len(stored)
+
+    conn = sqlite3.connect(temp_db)
+    conn.row_factory = sqlite3.Row
+    conn.execute("UPDATE jobs SET title_norm = NULL, description_length = NULL WHERE id % 3 = 0")  # not backfilled
+    for i, user in enumerate(users):
+        conn.execute(
+            "INSERT INTO users (id, email, password_hash, skills, preferred_location, preferred_seniority) "
+            "VALUES (?, ?, 'x', ?, ?, ?)",
+            (i + 1, f"u{i}@example.com", user["skills"], user["preferred_location"], user["preferred_seniority"]),
+        )
+        conn.execute(
+            "INSERT INTO user_swipes (user_id, job_id, action) VALUES (?, ?, ?)",
+            (i + 1, ids[i], ["apply", "save", "skip"][i % 3]),
+        )
+    conn.commit()
+    rows = [dict(r) for r in conn.execute("SELECT * FROM jobs ORDER BY id")]
+    conn.close()
+
+    expected = pd.DataFrame([
+        extract_job_features(user, {k: row[k] for k in ("title", "location", "skills", "description")})
+        for user, row in zip(users, rows)
+    ])[FEATURE_KEYS]
+    expected["label"] = [1 if i % 3 < 2 else 0 for i in range(len(users))]
+
+    dataset = build_dataset(chunk_size=7)
+    pd.testing.assert_frame_equal(dataset, expected, check_dtype=False)
+
+
+def test_cached_dataset_is_memory_mapped_and_invalidated(temp_db, tmp_path, monkeypatch):
+    import numpy as np
+
+    from ml import build_dataset as bd
+
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (1, 'a@x', 'x', 'python')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, skills, description) VALUES (?, 'Dev', ?, 'python', 'text')",
+        [(i, f"Co{i}") for i in range(1, 6)],
+    )
+    conn.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action) VALUES (1, ?, ?)",
+        [(i, "save" if i % 2 else "skip") for i in range(1, 5)],
+    )
+    conn.commit()
+
+    builds = []
+    real_build = bd.build_dataset
+    monkeypatch.setattr(bd, "build_dataset", lambda: builds.append(1) or real_build())
+
+    X, y = bd.cached_dataset(tmp_path)
+    assert isinstance(X, np.memmap) and X.shape == (4, len(FEATURE_KEYS))
+    assert y.tolist() == [1, 0, 1, 0]
+    X2, _ = bd.cached_dataset(tmp_path)
+    np.testing.assert_array_equal(X, X2)
+    assert len(builds) == 1
+
+    conn.execute("INSERT INTO user_swipes (user_id, job_id, action) VALUES (1, 5, 'apply')")
+    conn.commit()
+    conn.close()
+    assert bd.cached_dataset(tmp_path)[1].tolist() == [1, 0, 1, 0, 1]
+    bd.cached_dataset(tmp_path, refresh=True)
+    assert len(builds) == 3
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from database.connection import PoolTimeout, SQLitePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), size=2, timeout=1.0)
+    yield pool
+    pool.close()
+
+
+def test_connections_are_reused_with_pragmas_applied(pool):
+    first = pool.acquire()
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert first.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    pool.release(first)
+
+    second = pool.acquire()
+    assert second is first
+    pool.release(second)
+    assert pool.stats.created == 1
+    assert pool.stats.acquired == 2
+
+
+def test_release_rolls_back_open_transaction(pool):
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.release(conn)
+
+
+def test_closed_connection_is_discarded(pool):
+    conn = pool.acquire()
+    conn.close()
+    pool.release(conn)
+    assert pool.stats.discarded == 1
+
+    fresh = pool.acquire()
+    assert fresh is not conn
+    assert fresh.execute("SELECT 1").fetchone()[0] == 1
+    pool.release(fresh)
+
+
+def test_exhausted_pool_waits_then_times_out(pool):
+    held = [pool.acquire(), pool.acquire()]
+
+    def give_back():
+        time.sleep(0.2)
+        pool.release(held.pop())
+
+    threading.Thread(target=give_back).start()
+    conn = pool.acquire()  # blocks until give_back releases
+    assert pool.stats.waited == 1
+    assert pool.stats.max_wait_seconds >= 0.1
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats.timeouts == 1
+
+    pool.release(conn)
+    pool.release(held.pop())
+
+
+def test_pool_is_thread_safe(pool):
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE hits (n INTEGER)")
+    conn.commit()
+    pool.release(conn)
+
+    def worker():
+        for _ in range(20):
+            c = pool.acquire()
+            c.execute("INSERT INTO hits VALUES (1)")
+            c.commit()
+            pool.release(c)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = pool.acquire()
+    assert conn.execute("SELECT COUNT(*) FROM hits").fetchone()[0] == 120
+    pool.release(conn)
+    assert pool.stats.created <= 2
@@ -0,0 +1,187 @@
+import sqlite3
+
+from database.db_manager import insert_job_if_new, insert_jobs_bulk, job_dedup_key, job_exists
+from database.migrations import (
+    MIGRATIONS,
+    apply_migrations,
+    backfill_dedup_keys,
+    backfill_job_columns,
+    compact_duplicate_jobs,
+)
+from ml.features import extract_job_features
+
+
+def _job(i: int, **overrides) -> dict:
+    job = {
+        "title": f"Backend Engineer {i}",
+        "company": "Acme",
+        "location": "Remote",
+        "skills": ["python", "sql"],
+        "description": "Build APIs",
+        "url": f"https://example.com/jobs/{i}",
+        "source": "test",
+    }
+    job.update(overrides)
+    return job
+
+
+def test_bulk_insert_returns_ids_in_order(temp_db):
+    jobs = [_job(i) for i in range(5)]
+    ids = insert_jobs_bulk(jobs)
+
+    assert len(ids) == 5
+    assert ids == sorted(ids)
+    assert [job["id"] for job in jobs] == ids
+
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute("SELECT id, title, skills FROM jobs ORDER BY id").fetchall()
+    conn.close()
+    assert [r[0] for r in rows] == ids
+    assert rows[0][1:] == ("Backend Engineer 0", "python,sql")
+
+
+def test_bulk_insert_skips_duplicates(temp_db):
+    assert insert_job_if_new(_job(1))
+
+    jobs = [
+        _job(1, url="https://example.com/other"),       # same title/company/location as stored
+        _job(2, url="https://example.com/jobs/1"),      # same url as stored
+        _job(3),
+        _job(3, title="BACKEND ENGINEER 3 ", url=""),   # repeated within the batch
+        _job(4),
+    ]
+    ids = insert_jobs_bulk(jobs)
+
+    assert len(ids) == 2
+    assert [job.get("id") for job in jobs] == [None, None, ids[0], None, ids[1]]
+    assert insert_jobs_bulk([]) == []
+    assert not insert_job_if_new(_job(4))
+
+
+def test_dedup_key_is_canonical():
+    assert job_dedup_key("Senior  Engineer", "ACME", " Remote") == job_dedup_key("senior engineer", "Acme", "remote")
+    assert job_dedup_key("Engineer", "Acme", "Remote") != job_dedup_key("Engineer", "Acme", "Berlin")
+
+
+def test_job_exists_is_an_index_probe(temp_db):
+    insert_jobs_bulk([_job(1)])
+    conn = sqlite3.connect(temp_db)
+    plan = " ".join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM jobs WHERE dedup_key = ? LIMIT 1", ("x",)
+    ))
+    assert "idx_jobs_dedup_key" in plan
+    assert job_exists(conn, "BACKEND engineer 1", "acme", "Remote")
+    assert not job_exists(conn, "Backend Engineer 1", "Acme", "Berlin")
+    conn.close()
+
+
+def test_migration_backfills_legacy_rows(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, company TEXT NOT NULL, "
+        "location TEXT, description TEXT, skills TEXT, source_url TEXT, source TEXT, created_at DATETIME)"
+    )
+    conn.executemany(
+        "INSERT INTO jobs (title, company, location, source_url) VALUES (?, ?, ?, ?)",
+        [
+            ("Dev", "Acme", "Remote", "https://a"),
+            ("DEV ", "acme", "remote", ""),          # duplicate key
+            ("Ops", "Acme", "Remote", "https://a"),  # duplicate url
+            ("QA", "Acme", "Remote", ""),
+        ],
+    )
+    conn.commit()
+
+    assert apply_migrations(conn) == len(MIGRATIONS)
+    rows = conn.execute("SELECT title, source_url, dedup_key FROM jobs ORDER BY id").fetchall()
+    assert rows[0][2] == job_dedup_key("Dev", "Acme", "Remote")
+    assert rows[1][1] is None and rows[1][2] is None
+    assert rows[2][2] is None
+    assert rows[3][1] is None and rows[3][2] is not None
+
+    # Idempotent
+    assert apply_migrations(conn) == len(MIGRATIONS)
+    conn.close()
+
+
+def test_backfill_keys_only_unkeyed_rows(temp_db):
+    # As on Postgres: rows inserted with keys, then legacy rows left NULL
+    ids = insert_jobs_bulk([_job(1, url="https://a")])
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO jobs (title, company, location, source_url) VALUES (?, ?, ?, ?)",
+        [("backend engineer 1", "ACME", "remote", None), ("Other", "Acme", "Remote", "https://a"), ("QA", "Acme", "Remote", None)],
+    )
+    assert backfill_dedup_keys(conn) == {"keyed": 1, "legacy": 2}
+    conn.commit()
+    keys = conn.execute("SELECT title, dedup_key IS NOT NULL FROM jobs WHERE id > ? ORDER BY id", (ids[0],)).fetchall()
+    assert keys == [("backend engineer 1", 0), ("Other", 0), ("QA", 1)]
+    assert compact_duplicate_jobs(conn) == {"merged": 2, "rekeyed": 0}
+    conn.close()
+
+
+def test_schema_has_no_cleanup_trigger(temp_db):
+    conn = sqlite3.connect(temp_db)
+    triggers = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall()
+    conn.close()
+    assert triggers == []
+
+    # Same title/company in different locations are distinct postings
+    ids = insert_jobs_bulk([_job(1, url=""), _job(1, location="Berlin", url="")])
+    assert len(ids) == 2
+
+
+def test_compaction_merges_duplicates_and_repoints_swipes(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, company TEXT NOT NULL, "
+        "location TEXT, description TEXT, skills TEXT, source_url TEXT, source TEXT, created_at DATETIME);"
+        "CREATE TABLE user_swipes (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+        "job_id INTEGER NOT NULL, action TEXT NOT NULL, UNIQUE(user_id, job_id));"
+        "CREATE TRIGGER trg_cleanup_jobs AFTER INSERT ON jobs BEGIN SELECT 1; END;"
+    )
+    conn.executemany(
+        "INSERT INTO jobs (title, company, location, source_url) VALUES (?, ?, ?, ?)",
+        [("Dev", "Acme", "Remote", "https://a"), ("dev", "ACME", "Remote", None), ("Ops", "Acme", "Remote", "https://a")],
+    )
+    conn.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action) VALUES (?, ?, ?)",
+        [(1, 1, "save"), (1, 2, "apply"), (2, 3, "apply")],
+    )
+    conn.commit()
+    apply_migrations(conn)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] == 0
+
+    assert compact_duplicate_jobs(conn) == {"merged": 2, "rekeyed": 0}
+    assert conn.execute("SELECT id FROM jobs").fetchall() == [(1,)]
+    swipes = conn.execute("SELECT user_id, job_id, action FROM user_swipes ORDER BY user_id").fetchall()
+    assert swipes == [(1, 1, "save"), (2, 1, "apply")]
+    conn.close()
+
+
+def test_static_columns_stored_and_backfilled(temp_db):
+    raw = _job(1, title="  Senior  Python Dev ", location="Berlin,  DE",
+               description="<p>Build <b>APIs</b></p><script>x()</script>")
+    insert_jobs_bulk([dict(raw)])
+
+    conn = sqlite3.connect(temp_db)
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO jobs (title, company, location, description) VALUES ('QA', 'Acme', NULL, 'Test <i>it</i>')")
+    conn.commit()
+    assert backfill_job_columns(conn, batch_size=1) == 1
+    assert backfill_job_columns(conn) == 0
+
+    rows = [dict(r) for r in conn.execute("SELECT * FROM jobs ORDER BY id")]
+    conn.close()
+    assert rows[0]["clean_description"] == "Build APIs"
+    assert rows[0]["title_norm"] == "senior python dev"
+    assert rows[0]["location_norm"] == "berlin, de"
+    assert rows[1]["clean_description"] == "Test it"
+    assert rows[1]["location_norm"] == ""
+
+    # Reading the stored columns scores exactly like recomputing them
+    user = {"skills": "python", "preferred_location": "berlin", "preferred_seniority": "senior"}
+    assert extract_job_features(user, rows[0]) == extract_job_features(user, {**raw, "skills": "python,sql"})
+
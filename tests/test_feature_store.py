@@ -0,0 +1,130 @@
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+import ml.model
+from app.schemas.job import SwipeAction
+from app.services.swipe_service import SwipeService
+from ml import feature_store, interaction_logger
+from ml.feature_store import FeatureStore
+from ml.features import FEATURE_KEYS
+from ml.linear import LinearModel
+from ml.registry import ModelRegistry
+from ml.replay_eval import replay
+
+
+def feats(overlap):
+    return {"skill_overlap": overlap, "location_match": 1.0}
+
+
+def test_flush_writes_memory_mapped_segment(tmp_path):
+    store = FeatureStore(tmp_path, flush_rows=100, flush_seconds=3600)
+    store.append(1, 10, "apply", feats(0.5), score=0.7, model_version=3, ts=100.0)
+    store.append(1, 11, "skip", feats(0.0), ts=101.0)
+    assert store.segment_paths() == []  # buffered
+
+    store.flush()
+    (path,) = store.segment_paths()
+    assert path.parent.name.startswith("dt=")
+    assert json.loads((path / "schema.json").read_text()) == {"features": FEATURE_KEYS, "rows": 2}
+
+    (seg,) = store.segments()
+    assert isinstance(seg["X"], np.memmap)
+    assert seg["X"].shape == (2, len(FEATURE_KEYS))
+    assert seg["X"][0, FEATURE_KEYS.index("skill_overlap")] == 0.5
+    assert seg["label"].tolist() == [1, 0]
+    assert seg["model_version"].tolist() == [3, -1]
+    assert seg["score"][0] == 0.7 and np.isnan(seg["score"][1])
+
+
+def test_append_flushes_every_n_rows(tmp_path):
+    store = FeatureStore(tmp_path, flush_rows=2, flush_seconds=3600)
+    for job in range(5):
+        store.append(1, job, "skip", {})
+    assert len(store.segment_paths()) == 2
+    store.flush()
+    assert len(store.read()["job_id"]) == 5
+
+
+def test_training_arrays_keep_latest_label_per_pair(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.append(1, 10, "skip", feats(0.1), ts=1.0)
+    store.append(2, 10, "apply", feats(0.2), ts=2.0)
+    store.flush()
+    store.append(1, 10, "apply", feats(0.3), ts=3.0)  # re-swipe, later segment
+    store.flush()
+
+    X, y, users = store.training_arrays()
+    assert users.tolist() == [2, 1]
+    assert y.tolist() == [1, 1]
+    assert X[:, FEATURE_KEYS.index("skill_overlap")].tolist() == [0.2, 0.3]
+    assert store.read(since=2.5)["job_id"].tolist() == [10]
+
+
+def test_compact_merges_segments(tmp_path):
+    store = FeatureStore(tmp_path, flush_rows=1)
+    for job in range(3):
+        store.append(1, job, "save", feats(job))
+    before = store.read()
+
+    assert store.compact() == 3
+    assert len(store.segment_paths()) == 1
+    after = store.read()
+    for column in before:
+        np.testing.assert_array_equal(before[column], after[column])
+
+
+def test_reader_realigns_other_feature_sets(tmp_path):
+    FeatureStore(tmp_path, features=["location_match", "new_feature"], flush_rows=1).append(
+        1, 1, "apply", {"location_match": 1.0, "new_feature": 9.0}
+    )
+    X = FeatureStore(tmp_path).read()["X"]
+    assert X.shape == (1, len(FEATURE_KEYS))
+    assert X[0, FEATURE_KEYS.index("location_match")] == 1.0
+    assert X.sum() == 1.0
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = FeatureStore(tmp_path / "store")
+    monkeypatch.setattr(feature_store, "feature_store", s)
+    monkeypatch.setattr(interaction_logger, "served_features", interaction_logger.ServedFeatures())
+    return s
+
+
+def test_swipe_writes_features_and_served_score(temp_db, store, tmp_path, monkeypatch):
+    reg = ModelRegistry(tmp_path / "match", fmt="json")
+    coef = np.zeros(len(FEATURE_KEYS))
+    coef[FEATURE_KEYS.index("skill_overlap")] = 2.0
+    reg.publish(LinearModel(coef, 0.0, FEATURE_KEYS).to_dict())
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    ml.model.clear_cache()
+
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (1, 'a@x', 'x', 'python')")
+    conn.execute(
+        "INSERT INTO jobs (id, title, company, location, skills, description) "
+        "VALUES (5, 'Python dev', 'Co', 'Remote', 'python', 'text')"
+    )
+    conn.commit()
+    conn.close()
+
+    try:
+        SwipeService.record_swipe(1, SwipeAction(job_id=5, action="apply"))
+        interaction_logger.interaction_logger.flush()
+        store.flush()
+    finally:
+        ml.model.clear_cache()
+
+    columns = store.read()
+    assert columns["user_id"].tolist() == [1] and columns["job_id"].tolist() == [5]
+    assert columns["label"].tolist() == [1]
+    assert columns["model_version"].tolist() == [1]
+    assert columns["X"][0, FEATURE_KEYS.index("skill_overlap")] == 1.0
+    assert columns["score"][0] == pytest.approx(1 / (1 + np.exp(-2.0)))
+
+    (result,) = replay(model_registry=reg, store=store)
+    assert result["rows"] == 1 and result["users"] == 1
@@ -0,0 +1,55 @@
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from scrapers.html_text import html_to_text, available_backends
+from scrapers.timesjobs_scraper import fetch_timesjobs, parse_search_page
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_extract_same_text(backend):
+    """Every backend must be a drop-in replacement for BeautifulSoup."""
+    markup = (FIXTURES / "remotive_description.html").read_text(encoding="utf-8")
+
+    expected = html_to_text(markup, backend="bs4")
+    text = html_to_text(markup, backend=backend)
+
+    assert text == expected
+    assert "FastAPI services backed by PostgreSQL & Redis" in text
+    assert "dataLayer" not in text  # <script> contents are dropped
+    assert "  " not in text
+
+
+def test_plain_text_and_truncation():
+    assert html_to_text(None) == ""
+    assert html_to_text("  Python   &amp; SQL \n") == "Python & SQL"
+    assert html_to_text("<p>abcdef</p>", max_chars=3) == "abc"
+
+
+@patch("requests.get")
+def test_fetch_timesjobs_recorded_page(mock_get):
+    """TimesJobs cards parse from a recorded search page."""
+    mock_response = MagicMock()
+    mock_response.text = (FIXTURES / "timesjobs_search.html").read_text(encoding="utf-8")
+    mock_get.return_value = mock_response
+
+    jobs = fetch_timesjobs(query="python", max_jobs=10)
+
+    assert len(jobs) == 10
+    job = jobs[0]
+    assert job.title and job.company and job.location
+    assert job.url.startswith("https://www.timesjobs.com/job-detail/")
+    assert job.source == "timesjobs"
+
+
+def test_timesjobs_parsers_agree():
+    markup = (FIXTURES / "timesjobs_search.html").read_text(encoding="utf-8")
+
+    fast = parse_search_page(markup, max_jobs=100)
+    slow = parse_search_page(markup, max_jobs=100, backend="bs4")
+
+    assert len(fast) == 25
+    assert fast == slow
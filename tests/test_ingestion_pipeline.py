@@ -0,0 +1,183 @@
+import sqlite3
+
+import pytest
+
+from app.core.interfaces import JobResult
+from database.db_manager import insert_jobs_bulk
+from ingestion.cleaners.job_normalizer import clean_job, dedup_key
+from ingestion.cleaners.near_duplicates import signature_from_bytes
+from ingestion.pipeline import job_ingestion
+from ingestion.pipeline.job_ingestion import IngestionConfig, IngestionPipeline, Stage
+
+
+def _raw(i: int, company: str = "Acme") -> JobResult:
+    return JobResult(
+        title=f"Python Developer {i}",
+        company=company,
+        location="Remote",
+        description=f"<p>Build <b>Django</b> services</p><script>x()</script> #{i}",
+        url=f"https://example.com/jobs/{i}",
+        source="fake",
+        skills=[],
+    )
+
+
+def test_clean_job_strips_html_and_nul():
+    job = clean_job({"title": "Dev\x00", "description": "<div>Hello <i>world</i></div>"})
+    assert job["title"] == "Dev"
+    assert job["description"] == "Hello world"
+    assert dedup_key({"title": " Senior  Dev ", "company": "ACME", "location": None}) == \
+        dedup_key({"title": "senior dev", "company": "Acme", "location": ""})
+
+
+def test_pipeline_runs_all_stages(temp_db):
+    producers = [
+        lambda: (_raw(i) for i in range(30)),
+        lambda: (_raw(i) for i in range(20, 40)),  # 10 overlapping postings
+    ]
+    cfg = IngestionConfig(use_process_pool=False, queue_size=4, clean_batch_size=7, insert_batch_size=9)
+    report = IngestionPipeline(cfg).run(producers)
+
+    stats = {s.name: s for s in report.stages}
+    assert stats["fetch"].items_out == 50
+    assert stats["normalize"].items_out == 50
+    assert stats["dedup"].items_out == 40
+    assert len(report.inserted_ids) == 40
+
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute("SELECT description, skills FROM jobs").fetchall()
+    conn.close()
+    assert len(rows) == 40
+    assert all("<" not in desc and "x()" not in desc for desc, _ in rows)
+    assert all("django" in skills.lower() for _, skills in rows)
+
+
+def test_stage_errors_are_counted_not_fatal(temp_db):
+    def broken_producer():
+        yield _raw(1)
+        raise RuntimeError("source went away")
+
+    report = IngestionPipeline(IngestionConfig(use_process_pool=False)).run([broken_producer])
+    stats = {s.name: s for s in report.stages}
+    assert stats["fetch"].errors == 1
+    assert len(report.inserted_ids) == 1
+
+
+def test_stage_failure_drops_batch_and_finishes():
+    import queue
+
+    def boom(batch):
+        raise ValueError("bad batch")
+
+    stage = Stage("boom", boom, workers=3, batch_size=2)
+    stage.inbox, stage.outbox = queue.Queue(), queue.Queue()
+    for i in range(5):
+        stage.inbox.put(i)
+    stage.inbox.put(job_ingestion._DONE)
+    for t in stage.start(linger=0):
+        t.join(timeout=5)
+
+    assert stage.stats.items_in == 5
+    assert stage.stats.errors == 5
+    assert stage.outbox.get_nowait() is job_ingestion._DONE
+
+
+def test_pipeline_drops_near_duplicates(temp_db):
+    description = "Own our payments API in Python and Django; on-call one week in six. " * 3
+    wwr = JobResult(title="Initech: Payments Engineer", company="Unknown", location="Remote",
+                    description=description, url="https://wwr.example/1", source="weworkremotely", skills=[])
+    jobicy = JobResult(title="Payments Engineer", company="Initech", location="Remote (US)",
+                       description=description + " Apply today!", url="https://jobicy.example/9",
+                       source="jobicy", skills=[])
+
+    report = IngestionPipeline(IngestionConfig(use_process_pool=False)).run([lambda: [wwr], lambda: [jobicy]])
+    stats = {s.name: s for s in report.stages}
+    assert stats["dedup"].items_out == 2
+    assert stats["near-dup"].items_out == 1
+
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute("SELECT title, company, minhash IS NOT NULL FROM jobs").fetchall()
+    conn.close()
+    assert rows == [("Payments Engineer", "Initech", 1)]
+
+
+def test_near_dup_index_loaded_once_per_database(temp_db, monkeypatch):
+    loads = []
+    real = job_ingestion.load_near_dup_index
+    monkeypatch.setattr(job_ingestion, "load_near_dup_index", lambda *a: loads.append(a) or real(*a))
+
+    for i in range(2):
+        IngestionPipeline(IngestionConfig(use_process_pool=False)).run([lambda i=i: [_raw(i)]])
+    assert len(loads) == 1
+
+
+def test_scrape_endpoint_drops_near_duplicates(temp_db, monkeypatch):
+    from app.schemas.job import JobScrapeRequest
+    from app.services.job_service import JobService
+
+    description = "Own our payments API in Python and Django; on-call one week in six. " * 3
+    scraped = [
+        {"title": "Payments Engineer", "company": "Initech", "location": "Remote", "description": description,
+         "source_url": "https://wwr.example/1", "source": "weworkremotely", "skills": []},
+        {"title": "Payments Engineer", "company": "Initech", "location": "Remote (US)", "description": description + " Apply today!",
+         "source_url": "https://jobicy.example/9", "source": "jobicy", "skills": []},
+    ]
+    monkeypatch.setattr("scrapers.runner.fetch_all_sources", lambda **kwargs: [dict(j) for j in scraped])
+
+    assert JobService.scrape_jobs(JobScrapeRequest(keywords="payments"))["inserted"] == 1
+    conn = sqlite3.connect(temp_db)
+    rows = conn.execute("SELECT source, minhash IS NOT NULL FROM jobs").fetchall()
+    conn.close()
+    assert rows == [("weworkremotely", 1)]
+
+
+def test_near_dup_index_backfills_missing_signatures(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO jobs (id, title, company, description) VALUES (1, 'Payments Engineer', 'Initech', 'Python payments API')")
+    conn.commit()
+    conn.close()
+
+    index = job_ingestion.load_near_dup_index(0.6, 100)
+    assert len(index) == 1
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT minhash IS NOT NULL FROM jobs").fetchone() == (1,)
+    conn.close()
+
+
+PAYMENTS_JOB = {
+    "title": "Payments Engineer", "company": "Initech", "location": "Remote",
+    "description": "Own our payments API in Python and Django; on-call one week in six. " * 3,
+    "source_url": "https://wwr.example/1", "source": "weworkremotely", "skills": [],
+}
+
+
+def test_near_dup_index_keyed_by_inserted_row_id(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO jobs (title, company, description) VALUES ('Data Engineer', 'Hooli', 'Spark pipelines')")
+    conn.commit()
+    conn.close()
+
+    jobs = job_ingestion.insert_unique_jobs([dict(PAYMENTS_JOB)], 0.6, 100)
+    near_dups = job_ingestion.near_dup_filter(0.6, 100)
+    assert [key for key, _ in near_dups.index.query(signature_from_bytes(jobs[0]["minhash"]))] == [jobs[0]["id"]]
+    assert sorted(near_dups.index._signatures) == [1, jobs[0]["id"]]
+    assert len(near_dups.pending) == 0
+
+
+def test_failed_or_conflicting_insert_leaves_no_index_entry(temp_db, monkeypatch):
+    job = PAYMENTS_JOB
+    near_dups = job_ingestion.near_dup_filter(0.6, 100)
+
+    def boom(jobs):
+        raise RuntimeError("database is locked")
+
+    with monkeypatch.context() as m:
+        m.setattr("database.db_manager.insert_jobs_bulk", boom)
+        with pytest.raises(RuntimeError):
+            job_ingestion.insert_unique_jobs([dict(job)], 0.6, 100)
+    assert len(near_dups.index) == 0 and len(near_dups.pending) == 0
+
+    # Stored by another writer after the index loaded: the insert skips it, so nothing is indexed
+    insert_jobs_bulk([dict(job)])
+    assert job_ingestion.insert_unique_jobs([dict(job)], 0.6, 100) == []
+    assert len(near_dups.index) == 0 and len(near_dups.pending) == 0
@@ -0,0 +1,128 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ml.model
+from matching.api_layer import MatchingAPI
+from ml import interaction_logger, ranking
+from ml.features import FEATURE_KEYS
+from ml.interaction_logger import InteractionLogger, ServedFeatures, Swipe
+from ml.linear import LinearModel
+from ml.ranking import FeatureProvider, RankingEngine
+from ml.registry import ModelRegistry
+
+USER = {"id": 1, "skills": "python", "preferred_location": "remote"}
+
+
+@pytest.fixture
+def db(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (1, 'a@x', 'x', 'python')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, location, skills, description) VALUES (?, 'Python dev', ?, 'Remote', ?, 'text')",
+        [(1, "A", "python"), (2, "B", "java")],
+    )
+    conn.commit()
+    conn.close()
+    return temp_db
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    """A fresh served-features cache and logger, with a one-weight model live."""
+    cache = ServedFeatures(100)
+    log = InteractionLogger(cache, linger=0.0)
+    monkeypatch.setattr(interaction_logger, "served_features", cache)
+    monkeypatch.setattr(interaction_logger, "interaction_logger", log)
+
+    reg = ModelRegistry(tmp_path / "match", fmt="json")
+    coef = np.zeros(len(FEATURE_KEYS))
+    coef[FEATURE_KEYS.index("skill_overlap")] = 2.0
+    reg.publish(LinearModel(coef, 0.0, FEATURE_KEYS).to_dict())
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    ml.model.clear_cache()
+    yield cache
+    log.close()
+    ml.model.clear_cache()
+
+
+def interactions(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT user_id, job_id, skill_overlap, location_match, label FROM interactions ORDER BY job_id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_served_features_lru():
+    cache = ServedFeatures(2)
+    feats = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+    cache.remember(1, [10, 11, 12], feats, np.array([0.1, 0.2, 0.3]), 4)
+    assert len(cache) == 2
+    assert cache.get(1, 10) is None
+    assert cache.get(1, 12) == ({"a": 3.0}, 0.3, 4)
+    cache.remember(None, [13], feats.iloc[:1], None, None)  # anonymous: not cached
+    assert len(cache) == 2
+
+
+def test_engine_remembers_served_batches(served):
+    engine = RankingEngine(["skills", "location"])
+    probs, _ = engine.score(USER, [{"id": 5, "title": "Python", "skills": "python", "location": "Remote"}])
+    features, score, version = served.get(1, 5)
+    assert features["skill_overlap"] == 1.0 and features["location_match"] == 1.0
+    assert score == pytest.approx(probs[0]) and version == 1
+
+    engine.score(USER, [{"id": 6, "skills": "java"}], observe=False)
+    assert served.get(1, 6) is None
+
+
+def test_swipe_logs_served_features_in_background(db, served, monkeypatch):
+    api = MatchingAPI(db_path=str(db))
+    feed = api.get_job_feed_for_user(USER)
+    assert {job["id"] for job in feed} == {1, 2}
+
+    # Served features are reused: swipes never recompute them
+    def no_recompute(*args, **kwargs):
+        raise AssertionError("recomputed served features")
+    monkeypatch.setattr(RankingEngine, "features", no_recompute)
+
+    api.record_swipe_and_log_interaction(USER, 1, "apply")
+    api.record_swipe_and_log_interaction(USER, 2, "skip")
+    interaction_logger.interaction_logger.flush()
+    assert interactions(db) == [(1, 1, 1.0, 1.0, 1), (1, 2, 0.0, 1.0, 0)]
+
+    with pytest.raises(ValueError):
+        api.record_swipe_and_log_interaction(USER, 99, "apply")
+
+
+def test_unserved_swipes_are_computed_per_user(db, served):
+    log = interaction_logger.interaction_logger
+    log.write([Swipe(1, 1, "save"), Swipe(1, 2, "skip"), Swipe(1, 99, "apply")])  # job 99 does not exist
+    assert [(r[1], r[2], r[4]) for r in interactions(db)] == [(1, 1.0, 1), (2, 0.0, 0)]
+    assert len(served) == 0  # re-scoring does not fill the served cache
+
+
+def test_interactions_get_features_no_ranking_provider_served(db, served, monkeypatch):
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE users SET experience_years = 4 WHERE id = 1")
+    conn.commit()
+    conn.close()
+    embedding = FeatureProvider("embedding", ("semantic_sim",), lambda df: {"semantic_sim": np.full(len(df), 0.5)})
+    monkeypatch.setitem(ranking.PROVIDERS, "embedding", embedding)
+
+    log = interaction_logger.interaction_logger
+    log.write([Swipe(1, 1, "apply")])
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT semantic_sim, exp_gap, skill_overlap FROM interactions").fetchall() == [(0.5, 4.0, 1.0)]
+    conn.close()
+
+    # A failing provider leaves its column NULL instead of failing the batch
+    def unavailable(df):
+        raise RuntimeError("no embedding API key")
+    monkeypatch.setitem(ranking.PROVIDERS, "embedding", FeatureProvider("embedding", ("semantic_sim",), unavailable))
+    log.write([Swipe(1, 2, "skip")])
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT semantic_sim, exp_gap FROM interactions WHERE job_id = 2").fetchall() == [(None, 4.0)]
+    conn.close()
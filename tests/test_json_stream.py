@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from scrapers.json_stream import iter_json_array
+
+
+def _chunks(payload: str, size: int):
+    data = payload.encode("utf-8")
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+JOBS = [
+    {"id": i, "position": f"Python Dev {i}", "salary": 1000 * i, "tags": ["python", "sql"],
+     "description": "<p>Café — résumé \"quoted\" [brackets] {braces}</p>"}
+    for i in range(50)
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_top_level_array_matches_json_loads(chunk_size):
+    payload = json.dumps([{"legal": "text"}] + JOBS, indent=1)
+    assert list(iter_json_array(_chunks(payload, chunk_size))) == json.loads(payload)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 4096])
+def test_keyed_array_skips_preceding_values(chunk_size):
+    payload = json.dumps({"0-legal-notice": "x" * 300, "job-count": 12345, "jobs": JOBS, "tail": [1, 2]})
+    assert list(iter_json_array(_chunks(payload, chunk_size), key="jobs")) == JOBS
+    assert list(iter_json_array(_chunks(payload, chunk_size), key="missing")) == []
+
+
+def test_early_termination_stops_reading():
+    payload = json.dumps(JOBS)
+    consumed = []
+
+    def tracking(chunks):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    items = iter_json_array(tracking(_chunks(payload, 256)))
+    first = [next(items) for _ in range(3)]
+
+    assert first == JOBS[:3]
+    assert sum(len(c) for c in consumed) < len(payload) // 4
+
+
+def test_malformed_payload_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"jobs": []}']))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[{"a": 1}, {"b": ']))
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+import ml.model
+from ml.features import FEATURE_KEYS
+from ml.linear import LinearModel
+from ml.online import OnlineLogisticModel
+from ml.registry import ModelRegistry
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, len(FEATURE_KEYS))) * [1, 0.3, 1, 1, 1, 800, 40] + [1, 0, 0, 0, 0, 2000, 40]
+    y = (X[:, 0] + X[:, 2] + rng.normal(size=200) > 1).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("make", [
+    lambda: LogisticRegression(max_iter=1000),
+    lambda: make_pipeline(StandardScaler(), LogisticRegression()),
+    OnlineLogisticModel,
+])
+def test_matches_estimator_probabilities(data, make):
+    X, y = data
+    est = make()
+    if isinstance(est, OnlineLogisticModel):
+        est.partial_fit(X, y)
+    else:
+        est.fit(X, y)
+
+    linear = LinearModel.from_estimator(est, FEATURE_KEYS)
+    np.testing.assert_allclose(linear.predict_proba(X), est.predict_proba(X), rtol=1e-9, atol=1e-12)
+
+    restored = LinearModel.from_dict(json.loads(json.dumps(linear.to_dict())))
+    np.testing.assert_allclose(restored.score(X), linear.score(X))
+
+
+def test_rejects_unfitted_and_foreign_formats():
+    with pytest.raises(ValueError):
+        LinearModel.from_estimator(LogisticRegression(), FEATURE_KEYS)
+    with pytest.raises(ValueError):
+        LinearModel.from_dict({"format": "pickle"})
+    with pytest.raises(ValueError):
+        LinearModel([1.0], 0.0, FEATURE_KEYS)
+
+
+def test_sigmoid_is_stable_for_large_margins():
+    model = LinearModel([1.0], 0.0, ["x"])
+    p = model.score([[-1000.0], [0.0], [1000.0]])
+    assert p.tolist() == [0.0, 0.5, 1.0]
+
+
+def test_serves_json_artifact_and_scores_in_batches(data, tmp_path, monkeypatch):
+    X, y = data
+    clf = LogisticRegression(max_iter=1000).fit(X, y)
+    reg = ModelRegistry(tmp_path, fmt="json")
+    reg.publish(LinearModel.from_estimator(clf, FEATURE_KEYS).to_dict())
+    assert reg.path_for(1).suffix == ".json"
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    ml.model.clear_cache()
+    try:
+        user = {"skills": "python, sql", "preferred_location": "remote"}
+        jobs = [
+            {"title": "Python dev", "location": "Remote", "skills": "python", "description": "x" * 300},
+            {"title": "Chef", "location": "Paris", "skills": "cooking", "description": ""},
+        ]
+        batch = ml.model.score_jobs(user, jobs)
+        assert batch == pytest.approx([ml.model.score_job(user, job) for job in jobs])
+        assert ml.model.score_jobs(user, []) == []
+    finally:
+        ml.model.clear_cache()
+
+
+def test_serving_does_not_import_sklearn():
+    code = (
+        "import sys; import app.main; import ml.model; "
+        "assert not [m for m in sys.modules if m.startswith('sklearn')]"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
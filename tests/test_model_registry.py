@@ -0,0 +1,136 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import ml.model
+from ml.linear import LinearModel
+from ml.registry import ModelRegistry
+
+
+def payload(p):
+    """A model scoring every job p: no weights, intercept logit(p)."""
+    return LinearModel(np.zeros(1), float(np.log(p / (1 - p))), ["skill_overlap"]).to_dict()
+
+
+@pytest.fixture
+def serving(tmp_path, monkeypatch):
+    """ml.model serving from a temp registry, polling on every call."""
+    reg = ModelRegistry(tmp_path / "match", keep=3, fmt="json")
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    monkeypatch.setattr(ml.model, "ML_MODEL_POLL_SECONDS", 0)
+    monkeypatch.setattr(ml.model, "MODEL_PATH", tmp_path / "missing.pkl")
+    ml.model.clear_cache()
+    yield reg
+    ml.model.clear_cache()
+
+
+def test_publish_load_and_rollback(tmp_path):
+    reg = ModelRegistry(tmp_path)
+    assert reg.load() == (None, None)
+
+    assert reg.publish({"v": "a"}) == 1
+    assert reg.publish({"v": "b"}) == 2
+    assert reg.load() == (2, {"v": "b"})
+    assert reg.load(1) == (1, {"v": "a"})
+
+    reg.set_current(1)
+    assert reg.current_version() == 1
+    assert reg.load() == (1, {"v": "a"})
+    with pytest.raises(ValueError):
+        reg.set_current(9)
+    with pytest.raises(ValueError):
+        reg.publish({"v": "c"}, version=2)
+
+
+def test_publish_without_switching_and_prune_keeps_current(tmp_path):
+    reg = ModelRegistry(tmp_path, keep=2)
+    reg.publish({"v": 1})
+    for v in range(2, 5):
+        reg.publish({"v": v}, make_current=False)
+    assert reg.current_version() == 1
+    assert reg.versions() == [1, 3, 4]
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_concurrent_publishers_get_distinct_versions(tmp_path):
+    reg = ModelRegistry(tmp_path, keep=100)
+    versions = []
+    threads = [threading.Thread(target=lambda i=i: versions.append(reg.publish({"v": i}))) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(versions) == list(range(1, 9))
+    assert reg.versions() == list(range(1, 9))
+
+
+def test_worker_picks_up_published_version(serving):
+    assert ml.model.load_model() == (None, None)
+
+    serving.publish(payload(0.2))
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+
+    # Published by "another process": seen on the next poll, no clear_cache()
+    serving.publish(payload(0.7))
+    assert ml.model.score_job({}, {}) == pytest.approx(0.7)
+    assert ml.model._SERVING.version == 2
+
+    serving.set_current(1)
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+
+
+def test_old_model_serves_until_new_one_loads(serving):
+    serving.publish(payload(0.2))
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+
+    serving.publish(payload(0.9))
+    serving.path_for(2).write_bytes(b"truncated")   # unreadable artifact
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+
+    serving.set_current(2)   # still bad: keep serving v1, retry on the next poll
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+
+
+def test_poll_interval_limits_stat_calls(serving, monkeypatch):
+    serving.publish(payload(0.2))
+    ml.model.load_model()
+    monkeypatch.setattr(ml.model, "ML_MODEL_POLL_SECONDS", 3600)
+    serving.publish(payload(0.7))
+    assert ml.model.score_job({}, {}) == pytest.approx(0.2)
+    ml.model.reload_model()
+    assert ml.model.score_job({}, {}) == pytest.approx(0.7)
+
+
+def test_concurrent_polls_load_once_and_serve_whole_tuples(serving, monkeypatch):
+    serving.publish(payload(0.2))
+    assert ml.model.current_model().version == 1
+
+    loads = []
+    release = threading.Event()
+    real = ml.model._load_payload
+
+    def slow_load(reg, version=None):
+        loads.append(reg)
+        release.wait(5)
+        return real(reg, version)
+
+    monkeypatch.setattr(ml.model, "_load_payload", slow_load)
+    serving.publish(payload(0.7))
+
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(ml.model.current_model())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    # Each reader got v1 or v2 whole: never the v2 model with v1's version
+    for current in seen:
+        expected = {1: 0.2, 2: 0.7}[current.version]
+        assert ml.model.predict(current.model, np.zeros((1, 1)))[0] == pytest.approx(expected)
+    assert ml.model.current_model().version == 2
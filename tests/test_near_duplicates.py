@@ -0,0 +1,58 @@
+from ingestion.cleaners.near_duplicates import (
+    LSHIndex,
+    estimate_similarity,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+    split_company_title,
+)
+
+DESCRIPTION = (
+    "We are hiring a python backend engineer to build APIs with Django and Postgres. "
+    "You will own services end to end, work with product on new features and keep our "
+    "deploys boring. Remote friendly, great benefits and a small senior team."
+)
+
+
+def _job(title, company, description=DESCRIPTION):
+    return {"title": title, "company": company, "description": description}
+
+
+def test_split_company_title():
+    assert split_company_title("Globex: Staff Engineer", "Globex") == ("Staff Engineer", "Globex")
+    assert split_company_title("Globex: Staff Engineer", "See Link") == ("Staff Engineer", "Globex")
+    assert split_company_title("Staff Engineer", "Unknown") == ("Staff Engineer", "Unknown")
+    assert split_company_title("Re: Engineer", "Acme") == ("Re: Engineer", "Acme")
+
+
+def test_cross_board_copies_are_near_duplicates():
+    wwr = minhash_signature(_job("Vandelay Industries: Python Backend Engineer", "Vandelay Industries"))
+    jobicy = minhash_signature(_job(
+        "Python Backend Engineer", "See Link",
+        DESCRIPTION.replace("Remote friendly, great benefits and", "Remote-friendly, great benefits,"),
+    ))
+    other = minhash_signature(_job(
+        "Python Backend Engineer", "Globex",
+        "Globex is hiring a python backend engineer to build APIs with Flask and MySQL. Great team.",
+    ))
+
+    assert estimate_similarity(wwr, jobicy) >= 0.6
+    assert estimate_similarity(wwr, other) < 0.6
+    assert (signature_from_bytes(signature_to_bytes(wwr)) == wwr).all()
+
+    index = LSHIndex()
+    assert index.add_if_new("wwr", wwr) is None
+    assert index.add_if_new("jobicy", jobicy) == "wwr"
+    assert index.add_if_new("other", other) is None
+    assert len(index) == 2
+    assert [key for key, _ in index.query(jobicy)] == ["wwr"]
+
+
+def test_lsh_finds_match_among_many():
+    index = LSHIndex(threshold=0.9)
+    for i in range(500):
+        index.add(i, minhash_signature(_job(f"Engineer {i}", f"Company {i}", f"Unique posting number {i} " * 5)))
+
+    probe = minhash_signature(_job("Engineer 42", "Company 42", "Unique posting number 42 " * 5))
+    assert index.query(probe)[0][0] == 42
+    assert index.bands * index.rows == 128
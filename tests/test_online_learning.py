@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+import ml.model
+from ml import online
+from ml.linear import FORMAT, LinearModel
+from ml.registry import ModelRegistry
+
+
+@pytest.fixture
+def swipes_db(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills, preferred_location) VALUES (1, 'a@x', 'x', 'python', 'remote')")
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (2, 'b@x', 'x', 'java')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, location, skills, description) VALUES (?, ?, 'Acme', ?, ?, 'text')",
+        [(i, f"Python dev {i}" if i % 2 else f"Java dev {i}", "Remote" if i % 2 else "Berlin",
+          "python" if i % 2 else "java") for i in range(1, 11)],
+    )
+    conn.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action, created_at) VALUES (?, ?, ?, DATETIME('now', '-1 hour'))",
+        [(1, i, "save" if i % 2 else "skip") for i in range(1, 11)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+    ml.model.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def serving(tmp_path, monkeypatch):
+    """The JSON registry the trainer publishes to; checkpoints go to tmp_path."""
+    reg = ModelRegistry(tmp_path / "online", fmt="json")
+    monkeypatch.setattr("ml.registry.ONLINE_REGISTRY", reg)
+    return reg
+
+
+def test_update_consumes_new_swipes_in_batches(swipes_db, tmp_path):
+    first = online.update(batch_size=4, directory=tmp_path)
+    assert first == {"version": 1, "consumed": 10, "samples_seen": 10}
+    assert online.update(batch_size=4, directory=tmp_path)["consumed"] == 0
+    assert [v for v, _ in online.list_checkpoints(tmp_path)] == [1]
+
+    swipes_db.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action, created_at) VALUES (2, ?, ?, DATETIME('now', '-1 minute'))",
+        [(i, "apply" if i % 2 == 0 else "skip") for i in range(1, 6)],
+    )
+    # Re-labelled swipe: the upsert bumps created_at, so it is consumed again
+    swipes_db.execute("UPDATE user_swipes SET action = 'apply', created_at = DATETIME('now', '-1 minute') WHERE user_id = 1 AND job_id = 2")
+    # Too recent to be settled yet
+    swipes_db.execute("INSERT INTO user_swipes (user_id, job_id, action) VALUES (2, 9, 'save')")
+    swipes_db.commit()
+
+    second = online.update(batch_size=4, directory=tmp_path)
+    assert second == {"version": 2, "consumed": 6, "samples_seen": 16}
+    state = online.load_checkpoint(online.latest_checkpoint(tmp_path)[1])
+    assert state["cursor"][1] == 15  # last swipe in (created_at, id) order; the fresh one (16) waits
+
+
+def test_checkpoints_are_pruned(swipes_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(online, "KEEP_CHECKPOINTS", 2)
+    for version in range(1, 5):
+        state = online.new_state()
+        state["version"] = version
+        online.save_checkpoint(state, tmp_path)
+    assert [v for v, _ in online.list_checkpoints(tmp_path)] == [3, 4]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_update_hot_swaps_model(swipes_db, tmp_path):
+    user = {"skills": "python", "preferred_location": "remote"}
+    job = {"title": "Python dev", "location": "Remote", "skills": "python", "description": "text"}
+
+    online.update(directory=tmp_path)
+    model, order = ml.model.load_model()
+    assert isinstance(model, LinearModel)  # served as coefficients, see ml/linear.py
+    assert order == online.FEATURE_KEYS
+    liked = ml.model.score_job(user, job)
+    disliked = ml.model.score_job(user, {**job, "title": "Java dev", "location": "Berlin", "skills": "java"})
+    assert liked > disliked
+
+
+def test_serving_process_polls_for_new_checkpoint(swipes_db, tmp_path, monkeypatch, serving):
+    online.update(directory=tmp_path, swap=False)
+    ml.model.clear_cache()
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", True)
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", ModelRegistry(tmp_path / "match", fmt="json"))
+
+    # Serving reads the JSON export, never the pickled training state
+    assert serving.load()[1]["format"] == FORMAT
+    monkeypatch.setattr(online.pickle, "loads", lambda *a, **k: pytest.fail("serving unpickled"))
+    model, _ = ml.model.load_model()
+    assert isinstance(model, LinearModel)
+    assert ml.model._SERVING.version == 1
+    assert ml.model._SERVING.registry == "online"
+
+
+def test_pickled_registry_is_not_served(tmp_path):
+    reg = ModelRegistry(tmp_path / "pkl")
+    reg.publish({"model": object, "feature_order": []})
+    with pytest.raises(ValueError):
+        ml.model.load_version(reg)
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from database.queries import (
+    POSTGRES,
+    QUERIES,
+    SQLITE,
+    _prepare_statement,
+    compile_query,
+    execute,
+    fetch_all,
+    fetch_one,
+    insert_returning_id,
+)
+
+
+def test_sqlite_keeps_named_params():
+    sql, order = compile_query("messages.for_job", SQLITE)
+    assert "user_id = :user_id AND job_id = :job_id" in sql
+    assert order == ("user_id", "job_id")
+
+
+def test_postgres_renders_pyformat_and_macros():
+    sql, order = compile_query("auto_apply.sent_last_hour", POSTGRES)
+    assert "user_id = %(user_id)s" in sql
+    assert "NOW() - INTERVAL '1 hour'" in sql
+    assert order == ("user_id",)
+
+    sql, _ = compile_query("users.insert", POSTGRES)
+    assert sql.endswith("RETURNING id")
+    assert "RETURNING" not in compile_query("users.insert", SQLITE)[0]
+
+
+def test_postgres_escapes_percent_and_skips_casts(monkeypatch):
+    monkeypatch.setitem(QUERIES, "test.like", "SELECT id::text FROM jobs WHERE title LIKE '%dev%' AND id = :id")
+    compile_query.cache_clear()
+    _prepare_statement.cache_clear()
+    try:
+        sql, order = compile_query("test.like", POSTGRES)
+        assert sql == "SELECT id::text FROM jobs WHERE title LIKE '%%dev%%' AND id = %(id)s"
+        assert order == ("id",)
+
+        prepare, statement, order = _prepare_statement("test.like")
+        assert statement == "q_test_like"
+        assert prepare == "PREPARE q_test_like AS SELECT id::text FROM jobs WHERE title LIKE '%dev%' AND id = $1"
+    finally:
+        compile_query.cache_clear()
+        _prepare_statement.cache_clear()
+
+
+def test_prepare_numbers_repeated_params_once():
+    prepare, _, order = _prepare_statement("users.update_profile")
+    assert order[-1] == "id"
+    assert prepare.count("$1") == 1 and f"${len(order)}" in prepare
+    assert "%" not in prepare
+
+
+def test_every_query_compiles():
+    for name in QUERIES:
+        for dialect in (SQLITE, POSTGRES):
+            compile_query(name, dialect)
+    with pytest.raises(KeyError):
+        compile_query("nope", SQLITE)
+
+
+def test_sqlite_execution(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.row_factory = sqlite3.Row
+    user_id = insert_returning_id(conn, "users.insert", email="a@example.com", password_hash="x", name="A")
+    conn.execute("INSERT INTO jobs (id, title, company) VALUES (3, 'Dev', 'Acme')")
+
+    execute(conn, "swipes.upsert", {"user_id": user_id, "job_id": 3, "action": "save", "created_at": "2026-01-01 10:00:00.000000"})
+    execute(conn, "swipes.upsert", {"user_id": user_id, "job_id": 3, "action": "apply", "created_at": "2026-01-01 10:00:01.000000"})
+    # A late write of an older swipe changes nothing
+    execute(conn, "swipes.upsert", {"user_id": user_id, "job_id": 3, "action": "skip", "created_at": "2026-01-01 09:59:59.000000"})
+    conn.commit()
+
+    assert fetch_one(conn, "users.by_email", email="a@example.com")["id"] == user_id
+    assert fetch_all(conn, "jobs.swiped_with_action", user_id=user_id, action="save") == []
+    assert [r["id"] for r in fetch_all(conn, "jobs.swiped_with_action", user_id=user_id, action="apply")] == [3]
+    assert fetch_all(conn, "jobs.unswiped_for_user", user_id=user_id, limit=10) == []
+    assert conn.execute("SELECT created_at FROM user_swipes").fetchone()[0] == "2026-01-01 10:00:01.000000"
+    conn.close()
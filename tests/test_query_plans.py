@@ -0,0 +1,50 @@
+"""
+Query-plan regression suite: every named service query must be answered
+from an index. Fails on full table scans and on sorts that spill to a
+temporary b-tree, so a dropped or mismatched index is caught here.
+"""
+import sqlite3
+
+import pytest
+
+from database.migrations import HOT_QUERY_INDEXES
+from database.queries import QUERIES, SQLITE, compile_query
+
+# Queries that legitimately walk a whole table, and the index they must walk it by
+ORDERED_SCANS = {
+    "jobs.unswiped_for_user": "idx_jobs_created_at",  # newest jobs, skipping swiped ones, up to the feed size
+    "jobs.recent": "idx_jobs_created_at",             # feed candidates when swipes come from the bitmap
+}
+
+
+def _plan(conn, name):
+    sql, order = compile_query(name, SQLITE)
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, {p: None for p in order}).fetchall()
+    return [row[3] for row in rows]
+
+
+@pytest.fixture
+def conn(temp_db):
+    conn = sqlite3.connect(temp_db)
+    yield conn
+    conn.close()
+
+
+def test_hot_query_indexes_exist(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(HOT_QUERY_INDEXES) <= names
+
+
+def test_swipe_cursor_index_covers_cursor(conn):
+    columns = [row[2] for row in conn.execute("PRAGMA index_info(idx_user_swipes_created_at)")]
+    assert columns == ["created_at", "id"]
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_query_uses_index(conn, name):
+    plan = _plan(conn, name)
+    for step in plan:
+        assert "TEMP B-TREE" not in step, f"{name} sorts without an index: {plan}"
+        if step.startswith("SCAN"):
+            allowed = ORDERED_SCANS.get(name)
+            assert allowed and f"INDEX {allowed}" in step, f"{name} does a full scan: {plan}"
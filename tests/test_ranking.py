@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+import ml.model
+from ml.features import FEATURE_KEYS, extract_job_features
+from ml.linear import LinearModel
+from ml.ranking import PROVIDERS, FeatureProvider, RankingEngine, register_provider
+from ml.registry import ModelRegistry
+
+USER = {"skills": "Python, SQL", "preferred_location": "remote", "preferred_seniority": "senior"}
+JOBS = [
+    {"title": "Senior Python Developer", "location": "Remote", "skills": ["python", "django"], "description": "<p>x</p>"},
+    {"title": "Chef", "location": "Paris", "skills": "cooking", "description": None},
+    # Stored columns from the jobs table take precedence, like in ml.features
+    {"title": "SQL analyst", "location": "Remote (EU)", "skills": "sql", "description": "abc",
+     "title_norm": "sql analyst", "location_norm": "remote (eu)", "description_length": 3, "title_length": 11},
+]
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    """Serve a fixed LinearModel from a temp registry."""
+    reg = ModelRegistry(tmp_path, fmt="json")
+    weights = np.linspace(-1, 1, len(FEATURE_KEYS))
+    reg.publish(LinearModel(weights, 0.1, FEATURE_KEYS).to_dict())
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    ml.model.clear_cache()
+    yield LinearModel(weights, 0.1, FEATURE_KEYS)
+    ml.model.clear_cache()
+
+
+def test_features_match_per_job_extraction():
+    feats = RankingEngine(["skills", "location", "seniority", "text"]).features(USER, JOBS)
+    for i, job in enumerate(JOBS):
+        assert feats.iloc[i][FEATURE_KEYS].to_dict() == pytest.approx(extract_job_features(USER, job))
+
+
+def test_scores_with_served_model_and_ranks(served):
+    engine = RankingEngine(["skills", "location", "seniority", "text"])
+    probs, feats = engine.score(USER, JOBS)
+    expected = served.score(feats[FEATURE_KEYS].to_numpy())
+    np.testing.assert_allclose(probs, expected)
+    assert ml.model.score_jobs(USER, JOBS) == pytest.approx(list(expected))
+    assert ml.model.score_job(USER, JOBS[0]) == pytest.approx(expected[0])
+
+    ranked = engine.rank(USER, JOBS)
+    assert [j["match_probability"] for j in ranked] == sorted(expected, reverse=True)
+    assert set(ranked[0]["match_features"]) == set(FEATURE_KEYS)
+
+
+def test_disabled_providers_score_as_zero(served):
+    probs, feats = RankingEngine(["location"]).score(USER, JOBS)
+    assert list(feats.columns) == ["location_match"]
+    X = np.zeros((len(JOBS), len(FEATURE_KEYS)))
+    X[:, FEATURE_KEYS.index("location_match")] = feats["location_match"]
+    np.testing.assert_allclose(probs, served.score(X))
+
+
+def test_no_model_scores_neutral(tmp_path, monkeypatch):
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", ModelRegistry(tmp_path, fmt="json"))
+    monkeypatch.setattr(ml.model, "MODEL_PATH", tmp_path / "missing.pkl")
+    ml.model.clear_cache()
+    probs, _ = RankingEngine(["skills"]).score(USER, JOBS)
+    assert probs.tolist() == [0.5, 0.5, 0.5]
+    assert RankingEngine(["skills"]).score(USER, [])[0].tolist() == []
+    ml.model.clear_cache()
+
+
+def test_provider_registry():
+    with pytest.raises(ValueError):
+        RankingEngine(["skills", "nope"])
+    with pytest.raises(ValueError):
+        register_provider(FeatureProvider("skills", (), lambda df: {}))
+
+    provider = register_provider(FeatureProvider("const", ("bias",), lambda df: {"bias": np.ones(len(df))}))
+    try:
+        feats = RankingEngine(["const", "location"]).features(USER, JOBS)
+        assert feats["bias"].tolist() == [1.0, 1.0, 1.0]
+    finally:
+        del PROVIDERS[provider.name]
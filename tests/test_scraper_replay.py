@@ -0,0 +1,37 @@
+import time
+from pathlib import Path
+
+from scrapers.replay import replaying, request_key
+from scrapers.runner import fetch_all_sources
+from scrapers.unified_scraper import fetch_all_jobs
+
+# Synthetic payloads in the recorded-fixture layout, not captured traffic
+FIXTURES = Path(__file__).parent / "fixtures" / "scrapers" / "python"
+
+
+def test_request_key_is_order_independent():
+    a = request_key("get", "https://example.com/api", {"b": "2", "a": "1"})
+    b = request_key("GET", "https://example.com/api?a=1&b=2")
+    assert a == b == "GET https://example.com/api?a=1&b=2"
+
+
+def test_replay_all_sources_offline():
+    with replaying(FIXTURES) as server:
+        raw_stack = fetch_all_sources("python", max_jobs_per_source=5)
+        unified = fetch_all_jobs("python", limit_per_source=3)
+
+    assert {job["source"] for job in raw_stack} == {"timesjobs", "remoteok", "remotive"}
+    assert {job["source"] for job in unified} == {"Remotive", "RemoteOK", "Arbeitnow", "WeWorkRemotely", "Jobicy"}
+    assert server.requests_served == 8
+
+
+def test_injected_errors_and_latency():
+    with replaying(FIXTURES, error_rate=1.0) as server:
+        assert fetch_all_sources("python", max_jobs_per_source=5) == []
+    assert server.errors_injected == 3
+
+    with replaying(FIXTURES, latency=0.05):
+        start = time.perf_counter()
+        fetch_all_sources("python", max_jobs_per_source=5)
+        # sources are fetched concurrently, so latency is paid once, not per source
+        assert time.perf_counter() - start >= 0.05
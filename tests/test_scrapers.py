@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from scrapers.unified_scraper import fetch_remoteok
@@ -26,6 +27,7 @@ def test_fetch_remoteok(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = MOCK_REMOTEOK_RESPONSE
+    mock_response.iter_content.return_value = [json.dumps(MOCK_REMOTEOK_RESPONSE).encode()]
     mock_get.return_value = mock_response
 
     # Run scraper
@@ -28,3 +28,35 @@ def test_logistic_scorer():
 def test_ml_service_structure():
     """Verify MLService has required methods."""
     assert hasattr(MLService, 'run_retraining')
+
+def test_get_explanation(temp_db, monkeypatch):
+    """The on-demand explanation scores the job for the user and passes both to the generator."""
+    import asyncio
+    import sqlite3
+
+    from app.services.job_service import JobService
+    from matching.explanations import explanation_generator
+
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO jobs (id, title, company, location, skills, description) VALUES (3, 'Python Dev', 'Acme', 'Remote', 'python', '<p>Build APIs</p>')")
+    conn.commit()
+    conn.close()
+
+    seen = {}
+
+    def fake_generate(profile, job):
+        seen.update(profile=profile, job=job)
+        return {"match_reason": "Skills match", "match_type": "high"}
+
+    monkeypatch.setattr(explanation_generator, "generate_explanation", fake_generate)
+    user = {
+        "id": 1, "skills": "python", "experience_years": 3, "preferred_location": "Remote",
+        "preferred_seniority": None, "resume_text": None,
+    }
+
+    assert asyncio.run(JobService.get_explanation(3, user)) == {"match_reason": "Skills match", "match_type": "high"}
+    assert seen["profile"]["id"] == 1 and seen["profile"]["skills"] == ["python"]
+    assert seen["job"]["title"] == "Python Dev" and "<p>" not in seen["job"]["description"]
+    assert 0 <= seen["job"]["ml_score"] <= 100
+
+    assert asyncio.run(JobService.get_explanation(99, user)) == {"error": "Job not found"}
@@ -0,0 +1,110 @@
+import sqlite3
+
+import numpy as np
+import pytest
+from sklearn.metrics import ndcg_score, roc_auc_score
+
+import ml.model
+from ml import shadow
+from ml.features import FEATURE_KEYS
+from ml.linear import LinearModel
+from ml.ranking import RankingEngine
+from ml.registry import ModelRegistry
+from ml.replay_eval import auc, ndcg_at_k, replay
+
+USER = {"id": 7, "skills": "python", "preferred_location": "remote"}
+JOBS = [
+    {"id": 1, "title": "Python dev", "location": "Remote", "skills": "python", "description": "x" * 100},
+    {"id": 2, "title": "Chef", "location": "Paris", "skills": "cooking", "description": ""},
+]
+
+
+def linear(weight):
+    coef = np.zeros(len(FEATURE_KEYS))
+    coef[FEATURE_KEYS.index("skill_overlap")] = weight
+    return LinearModel(coef, 0.0, FEATURE_KEYS).to_dict()
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Live v1 and an unpublished candidate v2 in a temp match registry."""
+    reg = ModelRegistry(tmp_path / "match", fmt="json")
+    reg.publish(linear(2.0))
+    reg.publish(linear(-2.0), make_current=False)
+    monkeypatch.setattr("ml.registry.MATCH_REGISTRY", reg)
+    monkeypatch.setattr(ml.model, "ML_ONLINE_LEARNING", False)
+    ml.model.clear_cache()
+    yield reg
+    ml.model.clear_cache()
+
+
+def test_shadow_scores_same_batch_without_touching_live(registry, tmp_path, monkeypatch):
+    log = tmp_path / "shadow.jsonl"
+    scorer = shadow.ShadowScorer(2, log, model_registry=registry, flush_every=2)
+    monkeypatch.setattr(shadow, "shadow_scorer", scorer)
+    engine = RankingEngine(["skills", "location"])
+
+    live, _ = engine.score(USER, JOBS)
+    assert not log.exists()  # buffered
+    engine.score(USER, JOBS[:1])
+
+    np.testing.assert_allclose(live, [1 / (1 + np.exp(-2.0)), 0.5])
+    rows = shadow.read_shadow_log(log)
+    assert rows["job"].tolist() == [1, 2, 1]
+    assert rows["user"].unique().tolist() == [7]
+    assert rows["live_reg"].unique().tolist() == ["match"]
+    assert rows["live_v"].unique().tolist() == [1]
+    assert rows["shadow_v"].unique().tolist() == [2]
+    assert rows["live"].tolist() == pytest.approx([0.8808, 0.5, 0.8808])
+    assert rows["shadow"].tolist() == pytest.approx([0.1192, 0.5, 0.1192])
+
+
+def test_missing_shadow_version_is_ignored(registry, tmp_path, monkeypatch):
+    log = tmp_path / "shadow.jsonl"
+    scorer = shadow.ShadowScorer(99, log, model_registry=registry, flush_every=1)
+    monkeypatch.setattr(shadow, "shadow_scorer", scorer)
+    live, _ = RankingEngine(["skills"]).score(USER, JOBS)
+    assert live[0] > 0.5
+    scorer.flush()
+    assert not log.exists()
+
+
+def test_metrics_match_sklearn():
+    rng = np.random.default_rng(1)
+    labels = rng.integers(0, 2, 300)
+    scores = np.round(rng.random(300), 1)  # plenty of ties
+    assert auc(labels, scores) == pytest.approx(roc_auc_score(labels, scores))
+    assert np.isnan(auc(np.ones(3), np.arange(3)))
+
+    # sklearn averages NDCG over tied orderings; compare on tie-free scores
+    users = rng.integers(0, 8, 300)
+    scores = rng.random(300)
+    expected = [
+        ndcg_score([labels[users == u]], [scores[users == u]], k=5)
+        for u in np.unique(users) if labels[users == u].any()
+    ]
+    assert ndcg_at_k(users, labels, scores, k=5) == pytest.approx(np.mean(expected))
+
+
+def test_replay_compares_versions(temp_db, registry):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash, skills) VALUES (1, 'a@x', 'x', 'python')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, location, skills, description) VALUES (?, 'Dev', ?, 'Remote', ?, 'text')",
+        [(i, f"Co{i}", "python" if i % 2 else "java") for i in range(1, 9)],
+    )
+    conn.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action, created_at) VALUES (1, ?, ?, ?)",
+        [(i, "save" if i % 2 else "skip", f"2024-01-0{i}") for i in range(1, 9)],
+    )
+    conn.commit()
+    conn.close()
+
+    live, candidate = replay([1, 2], registry, k=3)
+    assert live["rows"] == 8 and live["users"] == 1
+    assert live["auc"] == 1.0 and live["ndcg@3"] == pytest.approx(1.0)
+    assert candidate["auc"] == 0.0
+    assert live["rows_per_sec"] > 0
+
+    (recent,) = replay(None, registry, since="2024-01-05")
+    assert recent["version"] == 1 and recent["rows"] == 4
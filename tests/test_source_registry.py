@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from app.core.interfaces import JobResult
+from app.core.interfaces import SourceCapabilities
+from scrapers.registry import (
+    FunctionSource,
+    default_sources,
+    fan_out,
+    get_source,
+    list_sources,
+    register_source,
+    unregister_source,
+)
+
+
+def _job(source: str) -> JobResult:
+    return JobResult(title="Python Dev", company="Acme", location="Remote", description="",
+                     url="", source=source, skills=["python"])
+
+
+@pytest.fixture
+def fake_sources():
+    def fast(query, limit):
+        return [_job("fake_fast")] * limit
+
+    def slow(query, limit):
+        time.sleep(2)
+        return [_job("fake_slow")]
+
+    def broken(query, limit):
+        raise RuntimeError("boom")
+
+    names = []
+    for name, func in [("fake_fast", fast), ("fake_slow", slow), ("fake_broken", broken)]:
+        register_source(FunctionSource(name, func))
+        names.append(name)
+    yield names
+    for name in names:
+        unregister_source(name)
+
+
+def test_builtin_sources_registered():
+    names = {s.name for s in list_sources()}
+    assert {"timesjobs", "remoteok", "remotive", "arbeitnow", "weworkremotely", "jobicy"} <= names
+    with pytest.raises(ValueError):
+        register_source(FunctionSource("remoteok", lambda q, n: []))
+
+
+def test_capabilities_and_one_default_per_feed():
+    assert get_source("remotive_api").capabilities.server_side_search
+    assert not get_source("timesjobs").capabilities.pagination
+    assert get_source("remoteok").capabilities == SourceCapabilities(incremental=True)
+
+    labels = [s.label for s in default_sources()]
+    assert sorted(labels) == sorted(set(labels))  # remoteok/remotive fetched once, not twice
+    assert {"remoteok_api", "remotive_api"} <= {s.name for s in default_sources()}
+
+
+def test_fan_out_isolates_slow_and_failing_sources(fake_sources):
+    start = time.perf_counter()
+    result = fan_out("python", limit=3, names=fake_sources, deadline=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert len(result.jobs["fake_fast"]) == 3
+    assert result.timed_out == ["fake_slow"]
+    assert "boom" in result.errors["fake_broken"]
+    assert [j.source for j in result.all_jobs()] == ["fake_fast"] * 3
+    assert set(result.durations) == {"fake_fast", "fake_broken"}  # the abandoned worker never reports
+
+    time.sleep(2)  # the slow worker finishes after the deadline
+    assert "fake_slow" not in result.durations and "fake_slow" not in result.jobs
+
+
+def test_unified_sources_use_unified_fetchers(monkeypatch):
+    """fetch_all_jobs goes through unified_scraper's fetchers (server-side search, retries)."""
+    from scrapers import unified_scraper
+
+    for name in unified_scraper.UNIFIED_SOURCES:
+        fetch = get_source(name)._fetch
+        assert fetch.__module__ == "scrapers.unified_scraper", name
+
+    calls = []
+    def fake(label):
+        def fetch(query, limit):
+            calls.append((label, query, limit))
+            return [{"title": "Python Dev", "company": "Acme", "source_url": f"https://{label}", "source": label}]
+        return fetch
+
+    for name in unified_scraper.UNIFIED_SOURCES:
+        monkeypatch.setattr(get_source(name), "_fetch", fake(get_source(name).label))
+    jobs = unified_scraper.fetch_all_jobs("python", limit_per_source=2, deadline=5)
+    assert sorted(j["source"] for j in jobs) == ["Arbeitnow", "Jobicy", "RemoteOK", "Remotive", "WeWorkRemotely"]
+    assert all(query == "python" and limit == 2 for _, query, limit in calls)
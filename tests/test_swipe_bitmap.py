@@ -0,0 +1,78 @@
+import sqlite3
+
+import numpy as np
+
+from app.schemas.job import SwipeAction
+from app.services.job_service import JobService
+from app.services.swipe_service import SwipeService
+from database.swipe_bitmap import SwipedJobCache
+
+
+def test_mask_and_mark_grow_bitmap():
+    cache = SwipedJobCache(loader=lambda user_id: [2, 5])
+    assert cache.unswiped_mask(1, [1, 2, 5, 500]).tolist() == [True, False, False, True]
+
+    cache.mark(1, 500)
+    cache.mark(1, 3)
+    assert cache.unswiped_mask(1, np.array([3, 500, 501])).tolist() == [False, False, True]
+    assert cache.loads == 1
+
+
+def test_swipe_during_load_is_kept():
+    cache = SwipedJobCache(loader=lambda user_id: (cache.mark(user_id, 9), [1])[1])
+    assert cache.unswiped_mask(4, [1, 9, 10]).tolist() == [False, False, True]
+
+
+def test_reload_after_ttl_and_lru_eviction():
+    swiped = {1: [1], 2: [2]}
+    cache = SwipedJobCache(loader=lambda user_id: list(swiped[user_id]), ttl=0, max_users=1)
+    cache.unswiped_mask(1, [1])
+    swiped[1].append(7)   # swiped in another worker
+    assert cache.unswiped_mask(1, [7]).tolist() == [False]
+    assert cache.loads == 2
+
+    cache.unswiped_mask(2, [2])
+    assert list(cache._entries) == [2]
+
+
+def test_feed_uses_bitmap(temp_db, monkeypatch):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash) VALUES (1, 'a@example.com', 'x')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company) VALUES (?, ?, ?)",
+        [(i, f"Job {i}", "Acme") for i in range(1, 6)],
+    )
+    conn.execute("INSERT INTO user_swipes (user_id, job_id, action) VALUES (1, 2, 'skip')")
+    conn.commit()
+    conn.close()
+
+    sql_feed = {job["id"] for job in JobService._fetch_unswiped_jobs(1)}
+    assert sql_feed == {1, 3, 4, 5}
+
+    cache = SwipedJobCache()
+    monkeypatch.setattr("database.swipe_bitmap.swipe_bitmap", cache)
+    assert {job["id"] for job in JobService._fetch_unswiped_jobs(1)} == sql_feed
+
+    SwipeService.record_swipe(1, SwipeAction(job_id=4, action="save"))
+    assert {job["id"] for job in JobService._fetch_unswiped_jobs(1)} == {1, 3, 5}
+    assert cache.loads == 1
+
+
+def test_bitmap_feed_pages_until_full(temp_db, monkeypatch):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash) VALUES (1, 'a@example.com', 'x')")
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, created_at) VALUES (?, ?, ?, '2026-01-01 00:00:00')",
+        [(i, f"Job {i}", "Acme") for i in range(1, 11)],
+    )
+    # The newest page (ids 10..7) is all swiped
+    conn.executemany("INSERT INTO user_swipes (user_id, job_id, action) VALUES (1, ?, 'skip')", [(i,) for i in range(7, 11)])
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr("app.services.job_service.FEED_SIZE", 4)
+    sql_feed = [job["id"] for job in JobService._fetch_unswiped_jobs(1)]
+    assert sql_feed == [6, 5, 4, 3]
+
+    monkeypatch.setattr("database.swipe_bitmap.swipe_bitmap", SwipedJobCache())
+    assert [job["id"] for job in JobService._fetch_unswiped_jobs(1)] == sql_feed
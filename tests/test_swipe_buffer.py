@@ -0,0 +1,179 @@
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from app.schemas.job import SwipeAction
+from app.services.job_service import JobService
+from app.services.swipe_service import SwipeService
+from database import swipe_buffer
+from database.swipe_buffer import SwipeBuffer, upsert_swipes
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.called = threading.Event()
+
+    def __call__(self, rows):
+        self.called.set()
+        if self.fail:
+            raise sqlite3.OperationalError("database is locked")
+        self.batches.append(sorted((r["user_id"], r["job_id"], r["action"]) for r in rows))
+        return len(rows)
+
+
+def dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_coalesces_last_action_and_journals(tmp_path):
+    writer = Recorder()
+    buffer = SwipeBuffer(tmp_path, flush_rows=100, flush_seconds=60, writer=writer)
+    buffer.add(1, [(10, "skip"), (11, "save")])
+    buffer.add(1, [(10, "apply")])
+    buffer.add(2, [(10, "skip")])
+
+    assert len(buffer) == 3
+    assert buffer.pending(1) == {10: "apply", 11: "save"}
+    lines = [line.split("\t", 1) for line in buffer.active_path.read_text().splitlines()]
+    assert [swipe for _, swipe in lines] == ["1\t10\tskip", "1\t11\tsave", "1\t10\tapply", "2\t10\tskip"]
+    assert all(float(ts) > 0 for ts, _ in lines)
+
+    assert buffer.flush() == 3
+    assert writer.batches == [[(1, 10, "apply"), (1, 11, "save"), (2, 10, "skip")]]
+    assert buffer.pending(1) == {} and list(tmp_path.iterdir()) == []
+    buffer.close()
+
+
+def test_background_flush_on_size(tmp_path):
+    writer = Recorder()
+    buffer = SwipeBuffer(tmp_path, flush_rows=2, flush_seconds=60, writer=writer)
+    buffer.add(1, [(1, "skip")])
+    assert not writer.called.wait(0.2)
+    buffer.add(1, [(2, "skip")])
+    assert writer.called.wait(5)
+    buffer.close()
+    assert writer.batches == [[(1, 1, "skip"), (1, 2, "skip")]]
+    assert buffer.stats.flushes == 1 and buffer.stats.rows_flushed == 2
+
+
+def test_failed_flush_keeps_swipes_and_journal(tmp_path):
+    writer = Recorder(fail=True)
+    buffer = SwipeBuffer(tmp_path, flush_rows=100, flush_seconds=60, writer=writer)
+    buffer.add(1, [(1, "skip"), (2, "save")])
+    assert buffer.flush() == 0
+    assert buffer.pending(1) == {1: "skip", 2: "save"}
+    buffer.add(1, [(1, "apply")])  # newer than the failed batch
+
+    writer.fail = False
+    assert buffer.flush() == 2
+    assert writer.batches == [[(1, 1, "apply"), (1, 2, "save")]]
+    assert list(tmp_path.iterdir()) == []
+    assert buffer.stats.failed_flushes == 1
+
+
+def test_recover_replays_journals_of_dead_processes(tmp_path):
+    pid = dead_pid()
+    (tmp_path / f"swipes-{pid}.000001.flushing").write_text("10.0\t1\t5\tskip\n10.0\t1\t6\tsave\n")
+    (tmp_path / f"swipes-{pid}.log").write_text("11.0\t1\t5\tapply\n12.0\t1\t7\tsa")  # torn last line
+    writer = Recorder()
+    buffer = SwipeBuffer(tmp_path, writer=writer)
+
+    assert buffer.recover() == 2
+    assert writer.batches == [[(1, 5, "apply"), (1, 6, "save")]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_recover_orders_processes_by_time_not_pid(tmp_path):
+    first, second = sorted([dead_pid(), dead_pid()])
+    # The higher pid swiped first; the lower pid's later swipe must win
+    (tmp_path / f"swipes-{second}.log").write_text("10.0\t1\t5\tskip\n10.0\t1\t6\tskip\n")
+    (tmp_path / f"swipes-{first}.log").write_text("20.0\t1\t5\tapply\n5.0\t1\t6\tsave\n")
+    writer = Recorder()
+
+    assert SwipeBuffer(tmp_path, writer=writer).recover() == 2
+    assert writer.batches == [[(1, 5, "apply"), (1, 6, "skip")]]
+
+
+def test_upsert_drops_rejected_rows(temp_db):
+    rows = [
+        {"user_id": 1, "job_id": 1, "action": "save", "swiped_at": 10.0},
+        {"user_id": None, "job_id": 2, "action": "skip", "swiped_at": 10.0},  # NOT NULL
+    ]
+    assert upsert_swipes(rows) == 1
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT user_id, job_id, action FROM user_swipes").fetchall() == [(1, 1, "save")]
+    conn.close()
+
+
+def test_late_flush_of_older_swipe_keeps_newer_row(temp_db, tmp_path):
+    # Worker B flushes the newer swipe first; worker A's older one arrives late
+    newer, older = SwipeBuffer(tmp_path / "b"), SwipeBuffer(tmp_path / "a")
+    older.add(1, [(1, "skip")])
+    newer.add(1, [(1, "apply")])
+    assert newer.flush() == 1
+    older.flush()
+
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT action FROM user_swipes WHERE user_id = 1 AND job_id = 1").fetchone() == ("apply",)
+    conn.close()
+    newer.close()
+    older.close()
+
+
+@pytest.fixture
+def buffered(tmp_path, monkeypatch):
+    buffer = SwipeBuffer(tmp_path / "journal", flush_rows=1000, flush_seconds=60)
+    monkeypatch.setattr(swipe_buffer, "swipe_buffer", buffer)
+    yield buffer
+    buffer.close()
+
+
+def test_batch_swipes_buffered_until_flush(temp_db, buffered):
+    conn = sqlite3.connect(temp_db)
+    conn.execute("INSERT INTO users (id, email, password_hash) VALUES (1, 'a@example.com', 'x')")
+    conn.executemany("INSERT INTO jobs (id, title, company) VALUES (?, ?, 'Acme')", [(i, f"Job {i}") for i in range(1, 5)])
+    conn.commit()
+    conn.close()
+
+    result = SwipeService.record_swipes(1, [
+        SwipeAction(job_id=1, action="skip"),
+        SwipeAction(job_id=2, action="save"),
+        SwipeAction(job_id=1, action="apply"),
+    ])
+    assert result["recorded"] == 2
+    SwipeService.record_swipe(1, SwipeAction(job_id=3, action="skip"))
+
+    # Not in the database yet, but already out of the feed
+    assert {job["id"] for job in JobService._fetch_unswiped_jobs(1)} == {4}
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT COUNT(*) FROM user_swipes").fetchone()[0] == 0
+    conn.close()
+
+    # Reading saved jobs flushes first
+    assert [job["id"] for job in JobService.get_saved_jobs(1)] == [2]
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT job_id, action FROM user_swipes ORDER BY job_id").fetchall() == [
+        (1, "apply"), (2, "save"), (3, "skip"),
+    ]
+    conn.close()
+    assert buffered.stats.flushes == 1
+
+
+def test_batch_rejects_invalid_action_and_oversize(temp_db, monkeypatch):
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException):
+        SwipeService.record_swipes(1, [SwipeAction(job_id=1, action="skip"), SwipeAction(job_id=2, action="like")])
+    monkeypatch.setattr("app.services.swipe_service.SWIPE_BATCH_MAX", 1)
+    with pytest.raises(HTTPException):
+        SwipeService.record_swipes(1, [SwipeAction(job_id=1, action="skip")] * 2)
+    conn = sqlite3.connect(temp_db)
+    assert conn.execute("SELECT COUNT(*) FROM user_swipes").fetchone()[0] == 0
+    conn.close()
@@ -0,0 +1,59 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from ml import build_dataset, train_logistic
+from ml.linear import LinearModel
+from ml.registry import ModelRegistry
+
+
+@pytest.fixture
+def swipes(temp_db):
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO users (id, email, password_hash, skills, preferred_location) VALUES (?, ?, 'x', 'python', 'remote')",
+        [(u, f"u{u}@x") for u in range(1, 5)],
+    )
+    conn.executemany(
+        "INSERT INTO jobs (id, title, company, location, skills, description) VALUES (?, ?, ?, ?, ?, 'text')",
+        [(i, f"Python dev {i}" if i % 2 else f"Chef {i}", f"Co{i}", "Remote" if i % 2 else "Paris",
+          "python" if i % 2 else "cooking") for i in range(1, 21)],
+    )
+    conn.executemany(
+        "INSERT INTO user_swipes (user_id, job_id, action) VALUES (?, ?, ?)",
+        [(u, i, "apply" if i % 2 else "skip") for u in range(1, 5) for i in range(1, 21)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_search_picks_from_grid_in_parallel():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 3))
+    y = (X[:, 0] + 0.3 * rng.normal(size=120) > 0).astype(int)
+    clf, grid = train_logistic.search(X, y, folds=3, n_jobs=2)
+    assert grid is not None
+    assert len(grid.cv_results_["params"]) == 10
+    assert grid.best_score_ > 0.9
+    assert grid.best_params_["logisticregression__C"] in train_logistic.PARAM_GRID["logisticregression__C"]
+
+    # One sample of a class: no CV, default settings
+    clf, grid = train_logistic.search(X[:5], np.array([0, 0, 0, 0, 1]))
+    assert grid is None
+
+
+def test_main_publishes_from_cached_dataset(swipes, tmp_path, monkeypatch):
+    reg = ModelRegistry(tmp_path / "match", fmt="json")
+    monkeypatch.setattr(train_logistic, "MATCH_REGISTRY", reg)
+    monkeypatch.setattr(build_dataset, "DATASET_CACHE_DIR", tmp_path / "cache")
+
+    assert train_logistic.main(n_jobs=2, folds=3, use_cache=True) == 1
+    assert (tmp_path / "cache" / "X.npy").exists()
+    _, payload = reg.load()
+    model = LinearModel.from_dict(payload)
+    X = np.load(tmp_path / "cache" / "X.npy")
+    y = np.load(tmp_path / "cache" / "y.npy")
+    assert ((model.score(X) > 0.5) == y).all()
+
+    assert train_logistic.main(n_jobs=1, folds=3) == 2  # straight from the database